@@ -1,6 +1,10 @@
 """Compatibility launcher for legacy build/launch scripts."""
 
+import multiprocessing
+
 from wavfix.ui.app_shell import main
 
 if __name__ == "__main__":
+    # Frozen builds re-run this entry point in spawned conversion workers.
+    multiprocessing.freeze_support()
     main()
@@ -3,20 +3,32 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import signal
+import sys
+import threading
+from collections.abc import Iterator
 from pathlib import Path
 from typing import cast
 
-from .core import InputFileSpec, ProcessRequest, process_request, scan_input_specs
+from .config import conversion_cache_dir, metadata_index_file
+from .core import CancellationToken, ProcessRequest, ProcessResult, process_request_iter
 from .core.models import (
     BitDepthPolicy,
+    ConversionEngine,
     ConverterBackend,
+    FsyncPolicy,
+    LinkMode,
     MetadataPolicy,
     MultiChannelPolicy,
     PerformanceMode,
     ProfileName,
     SampleRatePolicy,
 )
-from .core.planning import safe_common_parent
+from .core.processing import outcome_warning_lines
+
+# What shells report for a command stopped by SIGINT (128 + 2).
+_EXIT_CANCELLED = 130
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -71,9 +83,12 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "--performance-mode",
-        choices=["conservative", "balanced", "fast"],
+        choices=["conservative", "balanced", "fast", "auto"],
         default="balanced",
-        help="Processing speed profile balancing throughput and system impact",
+        help=(
+            "Processing speed profile balancing throughput and system impact; "
+            "auto tunes workers and conversion slots while the batch runs"
+        ),
     )
     parser.add_argument(
         "--converter-backend",
@@ -86,35 +101,176 @@ def build_parser() -> argparse.ArgumentParser:
         default="",
         help="Path to ffmpeg executable when --converter-backend=ffmpeg; empty uses PATH",
     )
+    parser.add_argument(
+        "--metadata-index",
+        default="",
+        help="SQLite WAV metadata index to reuse between runs; empty uses the shared app cache",
+    )
+    parser.add_argument(
+        "--no-metadata-index",
+        action="store_true",
+        help="Parse every file from scratch without consulting the metadata index",
+    )
+    parser.add_argument(
+        "--link-mode",
+        choices=["copy", "hardlink", "symlink", "reflink"],
+        default="copy",
+        help=(
+            "How to write files that need no changes; links fall back to a copy when the "
+            "filesystem refuses them (copy already clones via reflink where supported)"
+        ),
+    )
+    parser.add_argument(
+        "--conversion-engine",
+        choices=["thread", "process"],
+        default="thread",
+        help=(
+            "Run built-in conversions on worker threads or in separate processes "
+            "(process scales across cores and allows --conversion-timeout)"
+        ),
+    )
+    parser.add_argument(
+        "--conversion-timeout",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help=(
+            "Stop and reject a conversion that runs longer than this "
+            "(process engine or FFmpeg backend)"
+        ),
+    )
+    parser.add_argument(
+        "--conversion-cache",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="DIR",
+        help=(
+            "Reuse converted outputs of identical audio and settings from earlier exports; "
+            "without DIR uses the shared app cache"
+        ),
+    )
+    parser.add_argument(
+        "--conversion-cache-size",
+        type=int,
+        default=2048,
+        metavar="MB",
+        help="Disk space the conversion cache may use before evicting least recently used files",
+    )
+    parser.add_argument(
+        "--fsync",
+        choices=["off", "batch", "each"],
+        default="off",
+        help=(
+            "Flush outputs to disk: 'each' before every file is swapped into place, "
+            "'batch' in groups as files complete (default: off, leave it to the OS)"
+        ),
+    )
+    parser.add_argument(
+        "--journal",
+        action="store_true",
+        help=(
+            "Keep a journal in the output directory while exporting so an interrupted "
+            "run can be continued with --resume"
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Continue the interrupted export journaled in the output directory: skip files "
+            "it verifiably completed and redo the rest (implies --journal)"
+        ),
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help=(
+            "Mirror the inputs into an output directory synced before: keep a manifest there "
+            "and reprocess only files whose source, settings or output changed"
+        ),
+    )
+    parser.add_argument(
+        "--delete-orphans",
+        action="store_true",
+        help="With --sync, delete outputs whose source was removed from the selected inputs",
+    )
     return parser
 
 
 def _prompt_overwrite() -> bool:
+    # Runs inside the session, under _cancel_on_sigint; Ctrl+C at the prompt must still
+    # interrupt input() rather than only request a cancel nobody checks while it waits.
+    if threading.current_thread() is not threading.main_thread():
+        return _ask_overwrite()
+    previous = signal.signal(signal.SIGINT, signal.default_int_handler)
+    try:
+        return _ask_overwrite()
+    finally:
+        signal.signal(signal.SIGINT, previous)
+
+
+def _ask_overwrite() -> bool:
     answer = input("Overwrite existing files/folder? [y/N]: ").strip().lower()
     return answer in {"y", "yes"}
 
 
+@contextlib.contextmanager
+def _cancel_on_sigint(token: CancellationToken) -> Iterator[None]:
+    """Turn the first Ctrl+C into a clean cancel; a second one interrupts at once."""
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    previous = signal.getsignal(signal.SIGINT)
+
+    def handle(_signum: int, _frame: object) -> None:
+        print(
+            "Cancelling: stopping files in progress and removing partial outputs. "
+            "Press Ctrl+C again to stop immediately.",
+            file=sys.stderr,
+        )
+        token.cancel()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    signal.signal(signal.SIGINT, handle)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGINT, previous)
+
+
+def _print_deleted(result: ProcessResult | None) -> None:
+    if result is not None and result.deleted:
+        print(f"Sync: deleted {result.deleted} orphaned output(s)")
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    if args.delete_orphans and not args.sync:
+        parser.error("--delete-orphans requires --sync")
 
-    input_specs = scan_input_specs(args.inputs)
-    if not input_specs:
-        print("No supported files were found in the provided inputs.")
-        return 1
+    metadata_index_path: Path | None = None
+    if not args.no_metadata_index:
+        metadata_index_path = (
+            Path(args.metadata_index).expanduser() if args.metadata_index else metadata_index_file()
+        )
 
-    if args.batch:
-        common_root = safe_common_parent([spec.path for spec in input_specs])
-        input_specs = [
-            InputFileSpec(path=spec.path, source_root=common_root) for spec in input_specs
-        ]
+    conversion_cache_path: Path | None = None
+    if args.conversion_cache is not None:
+        conversion_cache_path = (
+            Path(args.conversion_cache).expanduser()
+            if args.conversion_cache
+            else conversion_cache_dir()
+        )
 
     request = ProcessRequest(
         output_dir=Path(args.output),
-        input_paths=[spec.path for spec in input_specs],
+        input_paths=[Path(path) for path in args.inputs],
         batch_mode=args.batch,
         overwrite_policy=args.overwrite,
-        input_specs=input_specs,
+        stream_inputs=True,
         profile=cast(ProfileName, args.profile),
         performance_mode=cast(PerformanceMode, args.performance_mode),
         allow_conversion=args.allow_conversion,
@@ -124,16 +280,68 @@ def main(argv: list[str] | None = None) -> int:
         bit_depth_policy=cast(BitDepthPolicy, args.bit_depth_policy),
         converter_backend=cast(ConverterBackend, args.converter_backend),
         ffmpeg_path=args.ffmpeg_path,
+        metadata_index_path=metadata_index_path,
+        conversion_cache_path=conversion_cache_path,
+        conversion_cache_max_bytes=args.conversion_cache_size * 1024 * 1024,
+        link_mode=cast(LinkMode, args.link_mode),
+        fsync_policy=cast(FsyncPolicy, args.fsync),
+        conversion_engine=cast(ConversionEngine, args.conversion_engine),
+        conversion_timeout=args.conversion_timeout,
+        journal=args.journal or args.resume,
+        resume=args.resume,
+        sync=args.sync,
+        delete_orphans=args.delete_orphans,
     )
 
+    # Byte-level progress redraws one status line on a terminal and is dropped otherwise,
+    # so redirected logs keep one line per event.
+    live_status = sys.stderr.isatty()
+    status_shown = False
+
     def progress(event) -> None:
+        nonlocal status_shown
+        if event.kind == "progress":
+            if live_status:
+                print(f"\r{event.message}\033[K", end="", file=sys.stderr, flush=True)
+                status_shown = True
+            return
+        if status_shown:
+            print("\r\033[K", end="", file=sys.stderr, flush=True)
+            status_shown = False
         print(event.message)
 
-    result = process_request(
+    cancel_token = CancellationToken()
+    session = process_request_iter(
         request,
         progress_callback=progress,
         overwrite_resolver=_prompt_overwrite if args.overwrite == "ask" else None,
+        cancel_token=cancel_token,
     )
+    warnings: list[str] = []
+    errors: list[str] = []
+    with _cancel_on_sigint(cancel_token):
+        for outcome in session:
+            if outcome.error is not None:
+                errors.append(f"{outcome.output_path}: {outcome.error}")
+                continue
+            warnings.extend(outcome_warning_lines(outcome))
+
+    if status_shown:
+        print(file=sys.stderr)
+
+    result = session.result
+    if result is not None and result.cancelled and result.total == 0:
+        print("Cancelled before any file finished.")
+        _print_deleted(result)
+        return _EXIT_CANCELLED
+    if result is not None and result.total == 0 and result.skipped:
+        print(f"Nothing left to do: all {result.skipped} file(s) were already complete.")
+        _print_deleted(result)
+        return 0
+    if result is None or result.total == 0:
+        print("No supported files were found in the provided inputs.")
+        _print_deleted(result)
+        return 1
 
     print(
         "Summary: "
@@ -142,20 +350,48 @@ def main(argv: list[str] | None = None) -> int:
         f"header_fixed={result.header_fixed}, "
         f"converted={result.converted}, "
         f"rejected={result.rejected}, "
-        f"errors={len(result.errors)}"
+        f"errors={result.error_count}"
     )
+    if result.skipped and args.sync:
+        print(f"Sync: skipped {result.skipped} unchanged file(s)")
+    elif result.skipped:
+        print(f"Resumed: skipped {result.skipped} file(s) completed by the interrupted run")
+    _print_deleted(result)
+    if result.conversion_cache_hits or result.conversion_cache_misses:
+        print(
+            f"Conversion cache: hits={result.conversion_cache_hits}, "
+            f"misses={result.conversion_cache_misses}"
+        )
+    if result.materializations:
+        materialized = ", ".join(
+            f"{method}={count}" for method, count in sorted(result.materializations.items())
+        )
+        print(f"Unchanged files written as: {materialized}")
+    if result.worker_seconds > 0:
+        predicted_mb = result.predicted_cost / 1_000_000
+        print(
+            f"Cost model: predicted {predicted_mb:.1f} MB-copy-equivalent, measured "
+            f"{result.worker_seconds:.2f}s of worker time "
+            f"({predicted_mb / result.worker_seconds:.1f} MB-eq/s)"
+        )
+
+    if result.thread_budget:
+        print(f"Thread budget: {result.thread_budget}")
 
-    if result.warnings:
+    if warnings:
         print("Warnings:")
-        for warning in result.warnings:
+        for warning in warnings:
             print(f"  - {warning}")
 
-    if result.errors:
+    if errors:
         print("Errors:")
-        for error in result.errors:
+        for error in errors:
             print(f"  - {error}")
 
-    if result.errors or result.rejected > 0:
+    if result.cancelled:
+        print("Cancelled: the summary covers only the files that finished.")
+        return _EXIT_CANCELLED
+    if result.error_count or result.rejected > 0:
         return 2
 
     return 0
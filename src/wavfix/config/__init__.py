@@ -1,5 +1,17 @@
 """Settings persistence API."""
 
-from .settings import UISettings, load_settings, save_settings
+from .settings import (
+    UISettings,
+    conversion_cache_dir,
+    load_settings,
+    metadata_index_file,
+    save_settings,
+)
 
-__all__ = ["UISettings", "load_settings", "save_settings"]
+__all__ = [
+    "UISettings",
+    "conversion_cache_dir",
+    "load_settings",
+    "metadata_index_file",
+    "save_settings",
+]
@@ -7,13 +7,13 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Literal, cast
 
-from appdirs import user_config_dir
+from appdirs import user_cache_dir, user_config_dir
 
 
 @dataclass(slots=True)
 class UISettings:
     dark_mode: bool = True
-    performance_mode: Literal["conservative", "balanced", "fast"] = "balanced"
+    performance_mode: Literal["conservative", "balanced", "fast", "auto"] = "balanced"
     profile: Literal["preserve_supported_rate", "universal_pioneer_safe"] = (
         "preserve_supported_rate"
     )
@@ -28,6 +28,8 @@ class UISettings:
     check_for_updates: bool = True
     skipped_update_version: str = ""
     last_update_check: int = 0
+    # Output folder of the most recent GUI export, checked at launch for a resumable journal.
+    last_export_dir: str = ""
 
 
 def _config_file() -> Path:
@@ -36,6 +38,16 @@ def _config_file() -> Path:
     return config_dir / "config.json"
 
 
+def metadata_index_file() -> Path:
+    """Location of the WAV metadata index shared by the CLI and GUI."""
+    return Path(user_cache_dir("WavFix", "Auragami")) / "metadata_index.sqlite3"
+
+
+def conversion_cache_dir() -> Path:
+    """Location of the conversion cache shared by the CLI and GUI."""
+    return Path(user_cache_dir("WavFix", "Auragami")) / "conversions"
+
+
 def save_settings(settings: UISettings) -> None:
     config_path = _config_file()
     payload = {
@@ -53,6 +65,7 @@ def save_settings(settings: UISettings) -> None:
         "CHECK_FOR_UPDATES": settings.check_for_updates,
         "SKIPPED_UPDATE_VERSION": settings.skipped_update_version,
         "LAST_UPDATE_CHECK": settings.last_update_check,
+        "LAST_EXPORT_DIR": settings.last_export_dir,
     }
     with config_path.open("w", encoding="utf-8") as handle:
         json.dump(payload, handle)
@@ -74,7 +87,7 @@ def load_settings() -> UISettings:
         return settings
 
     performance_mode = str(payload.get("PERFORMANCE_MODE", "balanced")).lower()
-    if performance_mode not in {"conservative", "balanced", "fast"}:
+    if performance_mode not in {"conservative", "balanced", "fast", "auto"}:
         performance_mode = "balanced"
     profile = str(payload.get("PROFILE", "preserve_supported_rate")).lower()
     if profile not in {"preserve_supported_rate", "universal_pioneer_safe"}:
@@ -101,7 +114,9 @@ def load_settings() -> UISettings:
 
     return UISettings(
         dark_mode=bool(payload.get("DARK_MODE", True)),
-        performance_mode=cast(Literal["conservative", "balanced", "fast"], performance_mode),
+        performance_mode=cast(
+            Literal["conservative", "balanced", "fast", "auto"], performance_mode
+        ),
         profile=cast(Literal["preserve_supported_rate", "universal_pioneer_safe"], profile),
         multichannel_policy=cast(Literal["reject", "downmix"], multichannel_policy),
         metadata_policy=cast(Literal["best_effort", "strict_preserve"], metadata_policy),
@@ -123,4 +138,5 @@ def load_settings() -> UISettings:
         check_for_updates=bool(payload.get("CHECK_FOR_UPDATES", True)),
         skipped_update_version=str(payload.get("SKIPPED_UPDATE_VERSION", "")),
         last_update_check=int(payload.get("LAST_UPDATE_CHECK", 0) or 0),
+        last_export_dir=str(payload.get("LAST_EXPORT_DIR", "")),
     )
@@ -1,9 +1,14 @@
 """Public core API for WavFix."""
 
-from .errors import OutputPlanningError, WavFixCoreError
+from .cancellation import CancellationToken
+from .errors import OutputPlanningError, ProcessingCancelledError, WavFixCoreError
 from .inspection import inspect_file
+from .journal import ExportJournal, load_journal_request
+from .metadata_index import WavMetadataIndex
 from .models import (
     FileInspection,
+    FileOutcome,
+    FileStat,
     InputFileSpec,
     ProcessRequest,
     ProcessResult,
@@ -12,25 +17,35 @@ from .models import (
     WavFormatKind,
 )
 from .planning import OutputPlanContext, plan_output_path
-from .processing import process_request
-from .scanner import scan_input_specs, scan_inputs
+from .processing import ProcessingSession, process_request, process_request_iter
+from .scanner import iter_input_specs, scan_input_specs, scan_inputs
 from .wav_parser import parse_wav_file
 
 __all__ = [
+    "CancellationToken",
+    "ExportJournal",
     "FileInspection",
+    "FileOutcome",
+    "FileStat",
     "InputFileSpec",
     "OutputPlanContext",
     "OutputPlanningError",
     "ProcessRequest",
     "ProcessResult",
+    "ProcessingCancelledError",
+    "ProcessingSession",
     "ProgressEvent",
     "RepairAction",
     "WavFixCoreError",
     "WavFormatKind",
+    "WavMetadataIndex",
     "inspect_file",
+    "iter_input_specs",
+    "load_journal_request",
     "parse_wav_file",
     "plan_output_path",
     "process_request",
+    "process_request_iter",
     "scan_input_specs",
     "scan_inputs",
 ]
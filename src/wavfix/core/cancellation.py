@@ -0,0 +1,30 @@
+"""Cooperative cancellation for processing runs."""
+
+from __future__ import annotations
+
+import threading
+
+from .errors import ProcessingCancelledError
+
+
+class CancellationToken:
+    """Thread-safe flag a caller sets to stop a run.
+
+    The session stops starting new files once the token is set, and running workers poll it
+    between copy chunks and conversion blocks, discarding their partial output.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+def raise_if_cancelled(token: CancellationToken | None) -> None:
+    if token is not None and token.cancelled:
+        raise ProcessingCancelledError("Processing was cancelled.")
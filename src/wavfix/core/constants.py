@@ -49,3 +49,11 @@ COMPATIBILITY_PROFILES: dict[str, CompatibilityProfile] = {
 }
 
 SUPPORTED_PCM_BIT_DEPTHS = frozenset({16, 24})
+
+# Resampler quality each performance mode converts with, so it shapes converted outputs.
+RESAMPLE_QUALITY_BY_MODE: dict[str, str] = {
+    "conservative": "HQ",
+    "balanced": "VHQ",
+    "fast": "HQ",
+    "auto": "VHQ",
+}
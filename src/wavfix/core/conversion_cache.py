@@ -0,0 +1,231 @@
+"""Content-addressed cache of converted outputs shared between exports."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from .cancellation import CancellationToken
+from .decisions import ConversionTarget
+from .file_copy import ChunkCallback, copy_file
+
+_SCHEMA_VERSION = 1
+_INDEX_FILE_NAME = "index.sqlite3"
+_BLOB_SUFFIX = ".wav"
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+
+def conversion_cache_key(
+    *,
+    audio_digest: bytes,
+    header_digest: bytes,
+    target: ConversionTarget,
+    resample_quality: str,
+    converter_backend: str,
+    metadata_policy: str,
+    dither: str,
+    revision: int = 1,
+) -> str:
+    """Return the cache key of one conversion.
+
+    ``audio_digest`` covers the input's data chunk and ``header_digest`` every other chunk
+    (the format and the metadata carried into the output); ``dither`` names the dither
+    scheme and seed, so outputs of a different scheme never alias. ``revision`` changes
+    whenever the converter writes different bytes for the same input.
+    """
+    payload = json.dumps(
+        [
+            audio_digest.hex(),
+            header_digest.hex(),
+            target.sample_rate,
+            target.channels,
+            target.bit_depth,
+            resample_quality,
+            converter_backend,
+            metadata_policy,
+            dither,
+            revision,
+        ],
+        separators=(",", ":"),
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+
+class ConversionCache:
+    """Converted WAV files stored by content key, bounded to ``max_bytes`` on disk.
+
+    Each entry is a finished output file under ``root``; hits are served into place by
+    reflink where the filesystem supports it and by copy otherwise. Least recently used
+    entries are evicted once the stored total exceeds ``max_bytes``.
+    """
+
+    def __init__(self, root: Path | str, *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = Path(root)
+        self.max_bytes = max(0, max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            str(self.root / _INDEX_FILE_NAME),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._initialize()
+
+    def _initialize(self) -> None:
+        connection = self._connection
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            connection.execute("DROP TABLE IF EXISTS conversions")
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS conversions (
+                key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                last_used INTEGER NOT NULL
+            )
+            """
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS conversions_last_used ON conversions (last_used)"
+        )
+        connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def __enter__(self) -> ConversionCache:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+    def _blob_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{_BLOB_SUFFIX}"
+
+    def fetch(
+        self,
+        key: str,
+        destination: Path,
+        *,
+        cancel_token: CancellationToken | None = None,
+        on_progress: ChunkCallback | None = None,
+    ) -> bool:
+        """Write the cached output for ``key`` to ``destination``; False on a miss.
+
+        The copy gets a fresh modification time, like a conversion written now.
+        """
+        blob = self._blob_path(key)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT size FROM conversions WHERE key = ?", (key,)
+            ).fetchone()
+        try:
+            usable = row is not None and blob.stat().st_size == row[0]
+            if usable:
+                copy_file(blob, destination, cancel_token=cancel_token, on_progress=on_progress)
+        except FileNotFoundError:
+            # Evicted by another worker between the lookup and the copy.
+            usable = False
+        if not usable:
+            with self._lock:
+                self.misses += 1
+                if row is not None:
+                    self._forget_locked([key])
+            return False
+
+        os.utime(destination)
+        with self._lock:
+            self.hits += 1
+            self._connection.execute(
+                "UPDATE conversions SET last_used = ? WHERE key = ?", (time.time_ns(), key)
+            )
+        return True
+
+    def store(self, key: str, source: Path) -> bool:
+        """Keep a copy of the finished output ``source``; False when it could not be stored.
+
+        A cache that cannot be written never fails the conversion that fed it.
+        """
+        blob = self._blob_path(key)
+        staging = blob.with_name(f".{key}.{uuid.uuid4().hex}.tmp")
+        try:
+            size = source.stat().st_size
+            if size > self.max_bytes:
+                return False
+            blob.parent.mkdir(exist_ok=True)
+            copy_file(source, staging)
+            os.replace(staging, blob)
+            with self._lock:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO conversions (key, size, last_used) VALUES (?, ?, ?)",
+                    (key, size, time.time_ns()),
+                )
+                self._evict_locked()
+        except (OSError, sqlite3.Error):
+            staging.unlink(missing_ok=True)
+            return False
+        return True
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes_locked()
+
+    def _total_bytes_locked(self) -> int:
+        row = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM conversions")
+        return int(row.fetchone()[0])
+
+    def _evict_locked(self) -> int:
+        excess = self._total_bytes_locked() - self.max_bytes
+        if excess <= 0:
+            return 0
+        evicted: list[str] = []
+        rows = self._connection.execute(
+            "SELECT key, size FROM conversions ORDER BY last_used ASC"
+        ).fetchall()
+        for key, size in rows:
+            if excess <= 0:
+                break
+            evicted.append(key)
+            excess -= size
+        self._forget_locked(evicted)
+        return len(evicted)
+
+    def _forget_locked(self, keys: list[str]) -> None:
+        if not keys:
+            return
+        self._connection.executemany(
+            "DELETE FROM conversions WHERE key = ?", [(key,) for key in keys]
+        )
+        for key in keys:
+            self._blob_path(key).unlink(missing_ok=True)
+
+    def prune(self) -> int:
+        """Evict least recently used entries until the cache fits ``max_bytes``."""
+        with self._lock:
+            return self._evict_locked()
+
+    def close(self) -> None:
+        try:
+            self.prune()
+        finally:
+            self._connection.close()
+
+
+def open_conversion_cache(
+    root: Path | str | None, *, max_bytes: int = DEFAULT_MAX_BYTES
+) -> ConversionCache | None:
+    """Open the cache at ``root``; returns ``None`` when disabled or unavailable."""
+    if root is None:
+        return None
+    try:
+        return ConversionCache(root, max_bytes=max_bytes)
+    except (OSError, sqlite3.Error):
+        return None
@@ -0,0 +1,111 @@
+"""Storage-device detection and per-device I/O admission for the processing scheduler."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+from pathlib import Path
+from typing import Generic, Literal, TypeVar
+
+DeviceKind = Literal["rotational", "solid_state", "unknown"]
+DevicePair = tuple[int, int]
+
+_T = TypeVar("_T")
+
+_SYS_DEV_BLOCK = Path("/sys/dev/block")
+# Concurrent files per spinning disk: one streams while the next seeks, more just thrash.
+_ROTATIONAL_CONCURRENCY = 2
+
+
+@lru_cache(maxsize=64)
+def device_kind(device: int, sys_dev_block: Path = _SYS_DEV_BLOCK) -> DeviceKind:
+    """Classify a ``st_dev`` from ``/sys/block/*/queue/rotational`` (Linux only).
+
+    Network shares, tmpfs and other virtual filesystems have no block device and come back
+    as ``"unknown"``, as does everything on platforms without sysfs.
+    """
+    major, minor = os.major(device), os.minor(device)
+    if major == 0:
+        return "unknown"
+    try:
+        block_dir = (sys_dev_block / f"{major}:{minor}").resolve(strict=True)
+    except OSError:
+        return "unknown"
+    # Partitions keep their queue settings on the parent disk.
+    for candidate in (block_dir, block_dir.parent):
+        try:
+            flag = (candidate / "queue" / "rotational").read_text(encoding="ascii").strip()
+        except OSError:
+            continue
+        return "rotational" if flag == "1" else "solid_state"
+    return "unknown"
+
+
+def device_concurrency_cap(device: int) -> int | None:
+    """Most files to work on at once on ``device``; None leaves it to the worker limit."""
+    if device_kind(device) == "rotational":
+        return _ROTATIONAL_CONCURRENCY
+    return None
+
+
+class DeviceQueue(Generic[_T]):
+    """Pending I/O tasks grouped by (source, destination) device, released within caps.
+
+    ``pop_ready`` hands out the next task whose devices are both under their concurrency
+    cap, rotating between device pairs so a fast SSD group cannot starve a slow disk.
+    Tasks reading from a rotational disk are released in inode order, which on most
+    filesystems tracks on-disk placement closely enough to cut seeks.
+    """
+
+    def __init__(self, cap_for: Callable[[int], int | None] | None = None) -> None:
+        self._cap_for = cap_for if cap_for is not None else device_concurrency_cap
+        self._groups: OrderedDict[DevicePair, list[tuple[int, int, _T]]] = OrderedDict()
+        self._active: dict[int, int] = {}
+        self._order = itertools.count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, task: _T, *, source_device: int, destination_device: int, inode: int) -> None:
+        sequence = next(self._order)
+        by_inode = self._cap_for(source_device) is not None
+        key = (source_device, destination_device)
+        heapq.heappush(
+            self._groups.setdefault(key, []), (inode if by_inode else sequence, sequence, task)
+        )
+        self._size += 1
+
+    def _has_room(self, device: int) -> bool:
+        cap = self._cap_for(device)
+        return cap is None or self._active.get(device, 0) < cap
+
+    def pop_ready(self) -> tuple[_T, DevicePair] | None:
+        for key, tasks in self._groups.items():
+            if not all(self._has_room(device) for device in set(key)):
+                continue
+            _, _, task = heapq.heappop(tasks)
+            if tasks:
+                self._groups.move_to_end(key)
+            else:
+                del self._groups[key]
+            for device in set(key):
+                self._active[device] = self._active.get(device, 0) + 1
+            self._size -= 1
+            return task, key
+        return None
+
+    def clear(self) -> list[_T]:
+        """Drop every pending task and return them."""
+        dropped = [task for tasks in self._groups.values() for _, _, task in tasks]
+        self._groups.clear()
+        self._size = 0
+        return dropped
+
+    def release(self, key: DevicePair) -> None:
+        for device in set(key):
+            self._active[device] -= 1
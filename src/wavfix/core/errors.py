@@ -7,3 +7,7 @@ class WavFixCoreError(Exception):
 
 class OutputPlanningError(WavFixCoreError):
     """Raised when output path planning cannot be completed."""
+
+
+class ProcessingCancelledError(WavFixCoreError):
+    """Raised inside a worker when the run's cancellation token has been set."""
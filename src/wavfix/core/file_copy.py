@@ -0,0 +1,268 @@
+"""Kernel-offloaded file copies for unchanged outputs."""
+
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import sys
+from collections.abc import Callable
+from io import BufferedReader
+from pathlib import Path
+from typing import Literal
+
+from .cancellation import CancellationToken, raise_if_cancelled
+from .models import LinkMode, Materialization
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+CopyMethod = Literal["reflink", "copy_file_range", "sendfile", "userspace"]
+# Called with the byte count after every chunk; may raise to abort the copy.
+ChunkCallback = Callable[[int], None]
+
+# FICLONE from linux/fs.h: share the source extents with the destination (btrfs, XFS, ...).
+_FICLONE = 0x40049409
+_ERROR_PRIVILEGE_NOT_HELD = 1314  # Windows symlinks without Developer Mode or admin rights.
+_CHUNK_SIZE = 8 * 1024 * 1024
+_BUFFER_SIZE = 1024 * 1024
+
+# Link failures that mean "use a copy instead": another device, no link support, link limits.
+_LINK_FALLBACK_ERRNOS = frozenset(
+    {errno.EXDEV, errno.EPERM, errno.EACCES, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP}
+)
+
+# Errors meaning "this mechanism is unavailable for these files", never a real I/O failure.
+_UNSUPPORTED_ERRNOS = frozenset(
+    {
+        errno.EXDEV,
+        errno.ENOSYS,
+        errno.EINVAL,
+        errno.EBADF,
+        errno.ENOTTY,
+        errno.EOPNOTSUPP,
+        errno.ENOTSUP,
+        errno.EPERM,
+        errno.ETXTBSY,
+    }
+)
+
+_IS_LINUX = sys.platform.startswith("linux")
+_copy_file_range = getattr(os, "copy_file_range", None)
+_sendfile = getattr(os, "sendfile", None)
+
+
+def _try_reflink(source_fd: int, destination_fd: int) -> bool:
+    if fcntl is None or not _IS_LINUX:
+        return False
+    try:
+        fcntl.ioctl(destination_fd, _FICLONE, source_fd)
+    except OSError as exc:
+        if exc.errno in _UNSUPPORTED_ERRNOS:
+            return False
+        raise
+    return True
+
+
+def _copy_with_copy_file_range(
+    source_fd: int,
+    destination_fd: int,
+    size: int,
+    on_chunk: ChunkCallback | None = None,
+) -> int:
+    """Copy with ``copy_file_range`` and return the number of bytes copied."""
+    if _copy_file_range is None:
+        return 0
+    offset = 0
+    while offset < size:
+        try:
+            copied = _copy_file_range(
+                source_fd,
+                destination_fd,
+                min(_CHUNK_SIZE, size - offset),
+                offset,
+                offset,
+            )
+        except OSError as exc:
+            if exc.errno in _UNSUPPORTED_ERRNOS:
+                return offset
+            raise
+        if copied == 0:
+            break
+        offset += copied
+        if on_chunk is not None:
+            on_chunk(copied)
+    return offset
+
+
+def _copy_with_sendfile(
+    source_fd: int,
+    destination_fd: int,
+    offset: int,
+    size: int,
+    on_chunk: ChunkCallback | None = None,
+) -> int:
+    """Copy from ``offset`` with ``sendfile`` and return the new offset."""
+    if _sendfile is None or not _IS_LINUX:
+        return offset
+    os.lseek(destination_fd, offset, os.SEEK_SET)
+    while offset < size:
+        try:
+            sent = _sendfile(destination_fd, source_fd, offset, min(_CHUNK_SIZE, size - offset))
+        except OSError as exc:
+            if exc.errno in _UNSUPPORTED_ERRNOS:
+                return offset
+            raise
+        if sent == 0:
+            break
+        offset += sent
+        if on_chunk is not None:
+            on_chunk(sent)
+    return offset
+
+
+def _copy_with_userspace(
+    source_file: BufferedReader,
+    destination_fd: int,
+    offset: int,
+    size: int,
+    on_chunk: ChunkCallback | None = None,
+) -> int:
+    source_file.seek(offset)
+    os.lseek(destination_fd, offset, os.SEEK_SET)
+    view = memoryview(bytearray(_BUFFER_SIZE))
+    while offset < size:
+        read = source_file.readinto(view[: min(_BUFFER_SIZE, size - offset)])
+        if not read:
+            break
+        written = 0
+        while written < read:
+            written += os.write(destination_fd, view[written:read])
+        offset += read
+        if on_chunk is not None:
+            on_chunk(read)
+    return offset
+
+
+def _refuse_same_file(source: Path | str, destination: Path | str) -> None:
+    """Raise ``shutil.SameFileError`` when ``destination`` is ``source`` or a link to it.
+
+    Opening the destination for writing truncates it, which would destroy the source.
+    """
+    try:
+        if os.path.samefile(source, destination):
+            raise shutil.SameFileError(f"{destination!s} and {source!s} are the same file.")
+    except FileNotFoundError:
+        return
+
+
+def copy_file(
+    source: Path | str,
+    destination: Path | str,
+    *,
+    cancel_token: CancellationToken | None = None,
+    on_progress: ChunkCallback | None = None,
+) -> CopyMethod:
+    """Copy ``source`` to ``destination`` like ``shutil.copy2``, offloading to the kernel.
+
+    Tries a FICLONE reflink first, then ``copy_file_range``, then ``sendfile`` and only then
+    a userspace copy; each fallback resumes from the bytes already copied. Returns the
+    method that completed the copy. ``on_progress`` receives the size of every copied
+    chunk. ``cancel_token`` is checked between chunks; a cancelled copy raises
+    ``ProcessingCancelledError`` and leaves a partial ``destination``. Like
+    ``shutil.copy2``, raises ``shutil.SameFileError`` rather than copy a file onto itself.
+    """
+    raise_if_cancelled(cancel_token)
+    _refuse_same_file(source, destination)
+
+    def on_chunk(byte_count: int) -> None:
+        if on_progress is not None:
+            on_progress(byte_count)
+        raise_if_cancelled(cancel_token)
+
+    with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+        source_fd = source_file.fileno()
+        destination_fd = destination_file.fileno()
+        size = os.fstat(source_fd).st_size
+
+        method: CopyMethod
+        if _try_reflink(source_fd, destination_fd):
+            method = "reflink"
+            offset = size
+            if on_progress is not None:
+                on_progress(size)
+        else:
+            method = "copy_file_range"
+            offset = _copy_with_copy_file_range(source_fd, destination_fd, size, on_chunk)
+            if offset < size:
+                method = "sendfile"
+                offset = _copy_with_sendfile(source_fd, destination_fd, offset, size, on_chunk)
+            if offset < size:
+                method = "userspace"
+                offset = _copy_with_userspace(source_file, destination_fd, offset, size, on_chunk)
+
+        if offset != size or os.fstat(destination_fd).st_size != size:
+            raise OSError(
+                errno.EIO,
+                f"Copy size mismatch: expected {size} bytes, copied {offset}.",
+                str(destination),
+            )
+
+    shutil.copystat(source, destination)
+    return method
+
+
+def _replace_with_link(source: Path, destination: Path, link_mode: LinkMode) -> bool:
+    try:
+        destination.unlink(missing_ok=True)
+        if link_mode == "hardlink":
+            os.link(source, destination)
+        else:
+            os.symlink(source.resolve(), destination)
+    except NotImplementedError:
+        return False
+    except OSError as exc:
+        if exc.errno in _LINK_FALLBACK_ERRNOS:
+            return False
+        if getattr(exc, "winerror", None) == _ERROR_PRIVILEGE_NOT_HELD:
+            return False
+        raise
+    return True
+
+
+def _try_reflink_file(source: Path, destination: Path) -> bool:
+    _refuse_same_file(source, destination)
+    with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+        cloned = _try_reflink(source_file.fileno(), destination_file.fileno())
+    if cloned:
+        shutil.copystat(source, destination)
+    return cloned
+
+
+def materialize_file(
+    source: Path | str,
+    destination: Path | str,
+    link_mode: LinkMode = "copy",
+    *,
+    cancel_token: CancellationToken | None = None,
+    on_progress: ChunkCallback | None = None,
+) -> Materialization:
+    """Place an unchanged ``source`` at ``destination`` according to ``link_mode``.
+
+    Links fall back to a copy when the filesystem refuses them (another device, no link
+    support, permission). Returns how the output was actually materialized.
+    """
+    source_path = Path(source)
+    destination_path = Path(destination)
+    if link_mode in {"hardlink", "symlink"}:
+        if _replace_with_link(source_path, destination_path, link_mode):
+            return link_mode
+    elif link_mode == "reflink" and _try_reflink_file(source_path, destination_path):
+        return "reflink"
+
+    method = copy_file(
+        source_path, destination_path, cancel_token=cancel_token, on_progress=on_progress
+    )
+    return "reflink" if method == "reflink" else "copy"
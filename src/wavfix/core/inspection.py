@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from .decisions import decide_repair_action
 from .metadata_chunks import unsupported_metadata_chunk_ids
 from .models import (
     BitDepthPolicy,
     FileInspection,
+    FileStat,
     MetadataPolicy,
     MultiChannelPolicy,
     RepairAction,
@@ -18,6 +20,9 @@ from .models import (
 )
 from .wav_parser import parse_wav_file
 
+if TYPE_CHECKING:
+    from .metadata_index import WavMetadataIndex
+
 
 def inspect_wav_metadata(
     path: Path | str,
@@ -101,6 +106,8 @@ def inspect_file(
     metadata_policy: MetadataPolicy = "best_effort",
     sample_rate_policy: SampleRatePolicy = "convert_nearest",
     bit_depth_policy: BitDepthPolicy = "convert",
+    metadata_index: WavMetadataIndex | None = None,
+    file_stat: FileStat | None = None,
 ) -> FileInspection:
     """Inspect a file and return color/tag metadata used by UI and processing."""
     file_path = Path(path)
@@ -116,7 +123,15 @@ def inspect_file(
             color_tag="neutral",
         )
 
-    metadata = parse_wav_file(file_path, include_chunks=metadata_policy == "strict_preserve")
+    include_chunks = metadata_policy == "strict_preserve"
+    if metadata_index is not None:
+        metadata = metadata_index.parse(
+            file_path,
+            include_chunks=include_chunks,
+            file_stat=file_stat,
+        )
+    else:
+        metadata = parse_wav_file(file_path, include_chunks=include_chunks)
     return inspect_wav_metadata(
         file_path,
         metadata,
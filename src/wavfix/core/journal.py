@@ -0,0 +1,489 @@
+"""Crash-safe export journal: resumes interrupted runs and doubles as the sync manifest."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from stat import S_ISLNK
+from typing import Any, cast
+
+from .constants import RESAMPLE_QUALITY_BY_MODE
+from .metadata_index import FileIdentity
+from .models import FileStat, InputFileSpec, OverwritePolicy, ProcessRequest, RepairAction
+
+JOURNAL_FILE_NAME = ".wavfix-journal.sqlite3"
+_SCHEMA_VERSION = 2
+_FLUSH_BATCH = 256
+# Bytes hashed from each end of an output: covers the header and a truncated tail.
+_STAMP_SAMPLE = 8 * 1024
+
+# Request fields that change what a file's output is; a resume must use the same values.
+_SETTING_FIELDS: tuple[str, ...] = (
+    "batch_mode",
+    "profile",
+    "allow_conversion",
+    "multichannel_policy",
+    "metadata_policy",
+    "sample_rate_policy",
+    "bit_depth_policy",
+    "converter_backend",
+    "link_mode",
+)
+# Request fields kept only to rebuild the request for "resume last export".
+_OPTION_FIELDS: tuple[str, ...] = (
+    "stream_inputs",
+    "performance_mode",
+    "ffmpeg_path",
+    "fsync_policy",
+    "conversion_engine",
+    "conversion_timeout",
+    "sync",
+    "delete_orphans",
+)
+
+OutputStamp = tuple[int, int, str]
+
+_ENTRY_COLUMNS = (
+    "input_path, output_path, size, mtime_ns, inode, settings_hash, action, "
+    "output_size, output_mtime_ns, output_digest"
+)
+
+
+def journal_path(output_dir: Path) -> Path:
+    return output_dir / JOURNAL_FILE_NAME
+
+
+def output_stamp(path: Path) -> OutputStamp | None:
+    """Size, mtime and a digest of both ends of a file: cheap proof an output is whole.
+
+    Hashing every output in full would double the reads of an export; a truncated or
+    replaced file changes its size, mtime or the sampled bytes.
+    """
+    try:
+        with path.open("rb") as handle:
+            stat_result = os.fstat(handle.fileno())
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(handle.read(_STAMP_SAMPLE))
+            if stat_result.st_size > _STAMP_SAMPLE:
+                handle.seek(max(_STAMP_SAMPLE, stat_result.st_size - _STAMP_SAMPLE))
+                digest.update(handle.read(_STAMP_SAMPLE))
+    except OSError:
+        return None
+    return stat_result.st_size, stat_result.st_mtime_ns, digest.hexdigest()
+
+
+def _request_settings(request: ProcessRequest) -> dict[str, Any]:
+    return {name: getattr(request, name) for name in _SETTING_FIELDS}
+
+
+def _output_settings(request: ProcessRequest) -> dict[str, Any]:
+    # The performance mode shapes outputs only through the resampler quality it picks.
+    return {
+        **_request_settings(request),
+        "resample_quality": RESAMPLE_QUALITY_BY_MODE[request.performance_mode],
+    }
+
+
+def settings_hash(request: ProcessRequest) -> str:
+    """Digest of the request settings that shape outputs; stored with every journaled file."""
+    encoded = json.dumps(_output_settings(request), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _encode_request(request: ProcessRequest, overwrite_policy: OverwritePolicy) -> str:
+    payload: dict[str, Any] = {
+        "settings": _request_settings(request),
+        "options": {name: getattr(request, name) for name in _OPTION_FIELDS},
+        "resample_quality": RESAMPLE_QUALITY_BY_MODE[request.performance_mode],
+        "overwrite_policy": overwrite_policy,
+        "input_paths": [str(path) for path in request.input_paths],
+        "input_specs": [
+            [str(spec.path), str(spec.source_root) if spec.source_root is not None else None]
+            for spec in request.input_specs
+        ],
+    }
+    return json.dumps(payload, separators=(",", ":"))
+
+
+@dataclass(frozen=True, slots=True)
+class JournalEntry:
+    """What the journal knows about one input: where it goes and whether it got there."""
+
+    input_path: Path
+    output_path: Path
+    input_identity: FileIdentity | None
+    settings_hash: str | None
+    # Set once the file finished; None while it was only planned.
+    action: RepairAction | None
+    stamp: OutputStamp | None
+
+    def is_complete(
+        self,
+        input_stat: FileStat | None,
+        settings: str,
+        *,
+        verify_content: bool = True,
+    ) -> bool:
+        """True when the file finished and neither its input, settings nor output changed.
+
+        Without ``verify_content`` the output is checked by ``stat`` alone, which is what
+        keeps a no-change sync as cheap as walking the tree.
+        """
+        if self.action is None or self.settings_hash != settings:
+            return False
+        in_place = self.input_identity is None
+        if not in_place:
+            if input_stat is None:
+                return False
+            if (input_stat.size, input_stat.mtime_ns, input_stat.inode) != self.input_identity:
+                return False
+        if self.action == RepairAction.REJECT:
+            return True
+        if self.stamp is None:
+            return False
+        if verify_content:
+            return output_stamp(self.output_path) == self.stamp
+        return self.output_unchanged()
+
+    def output_unchanged(self) -> bool:
+        """True while the output still has the size and mtime recorded when it was written.
+
+        A symlinked output is checked as the link itself: it is unchanged while it still
+        points at the input, even once that input is gone.
+        """
+        if self.stamp is None:
+            return False
+        try:
+            stat_result = self.output_path.lstat()
+            if S_ISLNK(stat_result.st_mode):
+                return Path(os.readlink(self.output_path)) == self.input_path.resolve()
+        except OSError:
+            return False
+        return (stat_result.st_size, stat_result.st_mtime_ns) == self.stamp[:2]
+
+
+def _entry_from_row(row: tuple[Any, ...], input_path: Path | None = None) -> JournalEntry:
+    stored_input, output_path, size, mtime_ns, inode, settings, action = row[:7]
+    out_size, out_mtime_ns, digest = row[7:]
+    return JournalEntry(
+        input_path=input_path if input_path is not None else Path(stored_input),
+        output_path=Path(output_path),
+        input_identity=(size, mtime_ns, inode) if size is not None else None,
+        settings_hash=settings,
+        action=RepairAction(action) if action is not None else None,
+        stamp=(out_size, out_mtime_ns, digest) if digest is not None else None,
+    )
+
+
+class ExportJournal:
+    """Per-export record of planned outputs and finished files, kept in the output folder.
+
+    Planned outputs are committed before their file is dispatched, so a resumed run writes
+    every file to the path the first run chose. Completions are batched: one lost to a
+    crash only means that file is redone.
+
+    Sync runs keep the journal as a manifest. Each run is a new generation, and files
+    seen by it are stamped with it, so files missing from a run can be found afterwards.
+    """
+
+    def __init__(self, db_path: Path | str) -> None:
+        self.db_path = Path(db_path)
+        self._pending: list[tuple[str, int | None, int | None, str | None, str]] = []
+        self._seen: list[tuple[int, str]] = []
+        self._known_roots: set[str] = set()
+        self.generation = 0
+        self._connection = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._initialize()
+
+    def _initialize(self) -> None:
+        connection = self._connection
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            connection.execute("DROP TABLE IF EXISTS export_run")
+            connection.execute("DROP TABLE IF EXISTS export_roots")
+            connection.execute("DROP TABLE IF EXISTS export_tasks")
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS export_run ("
+            "request TEXT NOT NULL, generation INTEGER NOT NULL, finished INTEGER NOT NULL)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS export_roots "
+            "(source_root TEXT PRIMARY KEY, alias TEXT NOT NULL)"
+        )
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS export_tasks (
+                input_path TEXT PRIMARY KEY,
+                output_path TEXT NOT NULL,
+                size INTEGER,
+                mtime_ns INTEGER,
+                inode INTEGER,
+                action TEXT,
+                output_size INTEGER,
+                output_mtime_ns INTEGER,
+                output_digest TEXT,
+                settings_hash TEXT,
+                seen INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        row = connection.execute("SELECT generation FROM export_run").fetchone()
+        self.generation = row[0] if row is not None else 0
+
+    def __enter__(self) -> ExportJournal:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+    def _stored_request(self) -> dict[str, Any] | None:
+        row = self._connection.execute("SELECT request FROM export_run").fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def has_run(self) -> bool:
+        return self._stored_request() is not None
+
+    def is_finished(self) -> bool:
+        row = self._connection.execute("SELECT finished FROM export_run").fetchone()
+        return row is not None and bool(row[0])
+
+    def matches(self, request: ProcessRequest) -> bool:
+        """True when the journal was written by a run with the same output-shaping settings."""
+        stored = self._stored_request()
+        if stored is None:
+            return False
+        settings = {**stored["settings"], "resample_quality": stored.get("resample_quality")}
+        return settings == _output_settings(request)
+
+    def overwrite_policy(self) -> OverwritePolicy | None:
+        stored = self._stored_request()
+        return cast(OverwritePolicy, stored["overwrite_policy"]) if stored is not None else None
+
+    def stored_request(self, output_dir: Path) -> ProcessRequest | None:
+        """Rebuild the journaled request, inputs included, for a resume from scratch."""
+        stored = self._stored_request()
+        if stored is None:
+            return None
+        return ProcessRequest(
+            output_dir=output_dir,
+            input_paths=[Path(path) for path in stored["input_paths"]],
+            input_specs=[
+                InputFileSpec(
+                    path=Path(path),
+                    source_root=Path(root) if root is not None else None,
+                )
+                for path, root in stored["input_specs"]
+            ],
+            overwrite_policy=stored["overwrite_policy"],
+            resume=True,
+            **stored["settings"],
+            **stored["options"],
+        )
+
+    def begin(
+        self,
+        request: ProcessRequest,
+        overwrite_policy: OverwritePolicy,
+        *,
+        keep_files: bool = False,
+    ) -> None:
+        """Start journaling this run as a new generation.
+
+        Without ``keep_files`` everything about previous runs is forgotten; a sync keeps
+        the file records so unchanged files can be skipped.
+        """
+        connection = self._connection
+        self._pending.clear()
+        self._seen.clear()
+        self.generation = self.generation + 1 if keep_files else 1
+        connection.execute("BEGIN")
+        try:
+            connection.execute("DELETE FROM export_run")
+            if not keep_files:
+                self._known_roots.clear()
+                connection.execute("DELETE FROM export_roots")
+                connection.execute("DELETE FROM export_tasks")
+            connection.execute(
+                "INSERT INTO export_run (request, generation, finished) VALUES (?, ?, 0)",
+                (_encode_request(request, overwrite_policy), self.generation),
+            )
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+
+    def root_aliases(self) -> dict[Path, str]:
+        rows = self._connection.execute("SELECT source_root, alias FROM export_roots").fetchall()
+        self._known_roots.update(root for root, _ in rows)
+        return {Path(root): alias for root, alias in rows}
+
+    def entry(self, input_path: Path) -> JournalEntry | None:
+        row = self._connection.execute(
+            f"SELECT {_ENTRY_COLUMNS} FROM export_tasks WHERE input_path = ?",
+            (str(input_path),),
+        ).fetchone()
+        return _entry_from_row(row, input_path) if row is not None else None
+
+    def unseen_entries(self) -> list[JournalEntry]:
+        """Files recorded by earlier runs that the current generation has not come across."""
+        self._flush_seen()
+        rows = self._connection.execute(
+            f"SELECT {_ENTRY_COLUMNS} FROM export_tasks WHERE seen != ?",
+            (self.generation,),
+        ).fetchall()
+        return [_entry_from_row(row) for row in rows]
+
+    def forget(self, input_paths: Iterable[Path]) -> None:
+        connection = self._connection
+        connection.execute("BEGIN")
+        try:
+            connection.executemany(
+                "DELETE FROM export_tasks WHERE input_path = ?",
+                [(str(path),) for path in input_paths],
+            )
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+
+    def mark_seen(self, input_path: Path) -> None:
+        """Note that this run came across a file it left alone."""
+        self._seen.append((self.generation, str(input_path)))
+        if len(self._seen) >= _FLUSH_BATCH:
+            self._flush_seen()
+
+    def record_planned(
+        self,
+        input_path: Path,
+        output_path: Path,
+        input_stat: FileStat | None,
+        settings: str,
+        *,
+        in_place: bool = False,
+        root: tuple[Path, str] | None = None,
+    ) -> None:
+        """Commit a file's planned output before any of it is written.
+
+        In-place outputs store no input identity: fixing the file changes it.
+        """
+        identity: tuple[int | None, int | None, int | None] = (None, None, None)
+        if input_stat is not None and not in_place:
+            identity = (input_stat.size, input_stat.mtime_ns, input_stat.inode)
+        connection = self._connection
+        connection.execute("BEGIN")
+        try:
+            if root is not None and str(root[0]) not in self._known_roots:
+                connection.execute(
+                    "INSERT OR REPLACE INTO export_roots (source_root, alias) VALUES (?, ?)",
+                    (str(root[0]), root[1]),
+                )
+                self._known_roots.add(str(root[0]))
+            connection.execute(
+                "INSERT OR REPLACE INTO export_tasks "
+                "(input_path, output_path, size, mtime_ns, inode, settings_hash, seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(input_path), str(output_path), *identity, settings, self.generation),
+            )
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+
+    def record_done(self, input_path: Path, action: RepairAction, output_path: Path) -> None:
+        stamp = output_stamp(output_path) if action != RepairAction.REJECT else None
+        if action != RepairAction.REJECT and stamp is None:
+            # An output that cannot be read back is not provably complete; redo it next time.
+            return
+        size, mtime_ns, digest = stamp if stamp is not None else (None, None, None)
+        self._pending.append((action.value, size, mtime_ns, digest, str(input_path)))
+        if len(self._pending) >= _FLUSH_BATCH:
+            self.flush()
+
+    def _flush_seen(self) -> None:
+        if not self._seen:
+            return
+        connection = self._connection
+        connection.execute("BEGIN")
+        try:
+            connection.executemany(
+                "UPDATE export_tasks SET seen = ? WHERE input_path = ?", self._seen
+            )
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            self._seen.clear()
+
+    def flush(self) -> None:
+        self._flush_seen()
+        if not self._pending:
+            return
+        connection = self._connection
+        connection.execute("BEGIN")
+        try:
+            connection.executemany(
+                "UPDATE export_tasks SET action = ?, output_size = ?, output_mtime_ns = ?, "
+                "output_digest = ? WHERE input_path = ?",
+                self._pending,
+            )
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+        finally:
+            self._pending.clear()
+
+    def finish(self) -> None:
+        """Mark the run complete while keeping its records, as the manifest for the next sync."""
+        self.flush()
+        self._connection.execute("UPDATE export_run SET finished = 1")
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._connection.close()
+
+    def discard(self) -> None:
+        """Close the journal and delete it: the export it describes is complete."""
+        self._pending.clear()
+        self._connection.close()
+        for suffix in ("", "-wal", "-shm"):
+            with contextlib.suppress(OSError):
+                Path(f"{self.db_path}{suffix}").unlink(missing_ok=True)
+
+
+def open_export_journal(output_dir: Path) -> ExportJournal | None:
+    """Open the journal in ``output_dir``; returns ``None`` when it cannot be written."""
+    try:
+        return ExportJournal(journal_path(output_dir))
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def load_journal_request(output_dir: Path) -> ProcessRequest | None:
+    """Request of the unfinished export journaled in ``output_dir``, or None if there is none."""
+    path = journal_path(output_dir)
+    if not path.is_file():
+        return None
+    try:
+        with ExportJournal(path) as journal:
+            if journal.is_finished():
+                return None
+            return journal.stored_request(output_dir)
+    except (sqlite3.Error, ValueError, KeyError, TypeError):
+        return None
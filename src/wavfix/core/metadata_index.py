@@ -0,0 +1,289 @@
+"""Persistent SQLite index of parsed WAV metadata shared by the CLI and GUI."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from .models import FileStat, WavChunk, WavFormatKind, WavMetadata
+from .wav_parser import parse_wav_file
+
+_SCHEMA_VERSION = 1
+_FLUSH_BATCH = 256
+_TOUCH_INTERVAL_S = 3600
+
+FileIdentity = tuple[int, int, int]
+
+_SCALAR_FIELDS: tuple[str, ...] = (
+    "riff_valid",
+    "wave_valid",
+    "riff_size",
+    "fmt_offset",
+    "fmt_size",
+    "data_offset",
+    "data_size",
+    "format_tag",
+    "channels",
+    "sample_rate",
+    "bits_per_sample",
+    "valid_bits_per_sample",
+    "block_align",
+    "channel_mask",
+    "byte_rate",
+    "parse_error",
+)
+
+
+def file_identity(stat_result: os.stat_result) -> FileIdentity:
+    """Return the (size, mtime_ns, inode) triple used to validate cached metadata."""
+    return stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino
+
+
+def _encode_metadata(metadata: WavMetadata) -> str:
+    payload: dict[str, Any] = {name: getattr(metadata, name) for name in _SCALAR_FIELDS}
+    payload["format_kind"] = metadata.format_kind.value
+    payload["subtype_guid"] = metadata.subtype_guid.hex() if metadata.subtype_guid else None
+    payload["chunks"] = [
+        [chunk.chunk_id, chunk.offset, chunk.size, chunk.data_offset, chunk.padded_size]
+        for chunk in metadata.chunks
+    ]
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def _decode_metadata(path: Path, encoded: str) -> WavMetadata:
+    payload = json.loads(encoded)
+    metadata = WavMetadata(path=path, riff_valid=False, wave_valid=False)
+    for name in _SCALAR_FIELDS:
+        setattr(metadata, name, payload.get(name))
+    metadata.format_kind = WavFormatKind(payload["format_kind"])
+    subtype = payload.get("subtype_guid")
+    metadata.subtype_guid = bytes.fromhex(subtype) if subtype else None
+    metadata.chunks = [
+        WavChunk(
+            chunk_id=chunk_id,
+            offset=offset,
+            size=size,
+            data_offset=data_offset,
+            padded_size=padded_size,
+        )
+        for chunk_id, offset, size, data_offset, padded_size in payload["chunks"]
+    ]
+    return metadata
+
+
+class WavMetadataIndex:
+    """Cache of ``parse_wav_file`` results keyed by resolved path and file identity.
+
+    Entries are invalidated automatically when a file's size, mtime or inode changes.
+    The index is bounded to ``max_entries`` rows; least recently used rows are evicted
+    and their pages reclaimed on ``close()``. It is best effort: when the database is
+    locked by another process or fails, lookups miss and writes are dropped.
+    """
+
+    def __init__(self, db_path: Path | str, *, max_entries: int = 250_000) -> None:
+        self.db_path = Path(db_path)
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending: list[tuple[str, int, int, int, int, str, int]] = []
+        self._touched: list[tuple[int, str]] = []
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        self._initialize()
+
+    def _initialize(self) -> None:
+        connection = self._connection
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != _SCHEMA_VERSION:
+            connection.execute("DROP TABLE IF EXISTS wav_metadata")
+            connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.execute("VACUUM")
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS wav_metadata (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                has_chunks INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                last_used INTEGER NOT NULL
+            )
+            """
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS wav_metadata_last_used ON wav_metadata (last_used)"
+        )
+        connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def __enter__(self) -> WavMetadataIndex:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+    def lookup(
+        self,
+        path: Path | str,
+        identity: FileIdentity,
+        *,
+        include_chunks: bool = True,
+    ) -> WavMetadata | None:
+        """Return cached metadata when the stored identity still matches the file."""
+        file_path = Path(path)
+        key = str(file_path.resolve())
+        with self._lock:
+            try:
+                row = self._connection.execute(
+                    "SELECT size, mtime_ns, inode, has_chunks, payload, last_used "
+                    "FROM wav_metadata WHERE path = ?",
+                    (key,),
+                ).fetchone()
+            except sqlite3.Error:
+                # Best effort: an index another process holds or broke is just a miss.
+                row = None
+            if row is None or tuple(row[:3]) != identity or (include_chunks and not row[3]):
+                self.misses += 1
+                return None
+            self.hits += 1
+            now = int(time.time())
+            if now - row[5] >= _TOUCH_INTERVAL_S:
+                self._touched.append((now, key))
+
+        metadata = _decode_metadata(file_path, row[4])
+        if not include_chunks:
+            metadata.chunks = []
+        return metadata
+
+    def store(
+        self,
+        metadata: WavMetadata,
+        identity: FileIdentity,
+        *,
+        include_chunks: bool = True,
+    ) -> None:
+        key = str(Path(metadata.path).resolve())
+        size, mtime_ns, inode = identity
+        row = (
+            key,
+            size,
+            mtime_ns,
+            inode,
+            int(include_chunks),
+            _encode_metadata(metadata),
+            int(time.time()),
+        )
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= _FLUSH_BATCH:
+                self._flush_locked()
+
+    def parse(
+        self,
+        path: Path | str,
+        *,
+        include_chunks: bool = True,
+        file_stat: FileStat | None = None,
+    ) -> WavMetadata:
+        """Drop-in replacement for ``parse_wav_file`` that consults the index first.
+
+        ``file_stat`` may carry the scanner's stat for the file to skip another ``stat()``.
+        """
+        file_path = Path(path)
+        if file_stat is not None:
+            identity = (file_stat.size, file_stat.mtime_ns, file_stat.inode)
+        else:
+            try:
+                identity = file_identity(file_path.stat())
+            except OSError:
+                return parse_wav_file(file_path, include_chunks=include_chunks)
+
+        cached = self.lookup(file_path, identity, include_chunks=include_chunks)
+        if cached is not None:
+            return cached
+
+        metadata = parse_wav_file(file_path, include_chunks=include_chunks)
+        self.store(metadata, identity, include_chunks=include_chunks)
+        return metadata
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        """Write the batched rows; a batch the database refuses (e.g. locked) is dropped."""
+        if not self._pending and not self._touched:
+            return
+        connection = self._connection
+        try:
+            connection.execute("BEGIN")
+            if self._pending:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO wav_metadata "
+                    "(path, size, mtime_ns, inode, has_chunks, payload, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    self._pending,
+                )
+            if self._touched:
+                connection.executemany(
+                    "UPDATE wav_metadata SET last_used = ? WHERE path = ?",
+                    self._touched,
+                )
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            if connection.in_transaction:
+                with contextlib.suppress(sqlite3.Error):
+                    connection.execute("ROLLBACK")
+        finally:
+            self._pending.clear()
+            self._touched.clear()
+
+    def prune(self) -> int:
+        """Evict least recently used rows above ``max_entries`` and reclaim free pages."""
+        with self._lock:
+            self._flush_locked()
+            connection = self._connection
+            try:
+                count = connection.execute("SELECT COUNT(*) FROM wav_metadata").fetchone()[0]
+                excess = count - self.max_entries
+                if excess <= 0:
+                    return 0
+                connection.execute(
+                    "DELETE FROM wav_metadata WHERE path IN ("
+                    "SELECT path FROM wav_metadata ORDER BY last_used ASC LIMIT ?)",
+                    (excess,),
+                )
+                connection.execute("PRAGMA incremental_vacuum")
+            except sqlite3.Error:
+                # Left for a later close that gets the database to itself.
+                return 0
+            return excess
+
+    def close(self) -> None:
+        try:
+            self.prune()
+        finally:
+            self._connection.close()
+
+
+def open_metadata_index(db_path: Path | str | None) -> WavMetadataIndex | None:
+    """Open the index at ``db_path``; returns ``None`` when disabled or unavailable."""
+    if db_path is None:
+        return None
+    try:
+        return WavMetadataIndex(db_path)
+    except (OSError, sqlite3.Error):
+        return None
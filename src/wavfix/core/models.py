@@ -11,10 +11,14 @@ OverwritePolicy = Literal["ask", "yes", "no"]
 ProfileName = Literal["preserve_supported_rate", "universal_pioneer_safe"]
 MultiChannelPolicy = Literal["reject", "downmix"]
 MetadataPolicy = Literal["best_effort", "strict_preserve"]
-PerformanceMode = Literal["conservative", "balanced", "fast"]
+PerformanceMode = Literal["conservative", "balanced", "fast", "auto"]
 SampleRatePolicy = Literal["convert_nearest", "reject_unsupported"]
 BitDepthPolicy = Literal["convert", "reject_unsupported"]
 ConverterBackend = Literal["builtin", "ffmpeg"]
+LinkMode = Literal["copy", "hardlink", "symlink", "reflink"]
+Materialization = Literal["copy", "reflink", "hardlink", "symlink"]
+FsyncPolicy = Literal["off", "batch", "each"]
+ConversionEngine = Literal["thread", "process"]
 
 
 class RepairAction(StrEnum):
@@ -68,10 +72,21 @@ class WavMetadata:
     chunks: list[WavChunk] = field(default_factory=list)
 
 
+@dataclass(frozen=True, slots=True)
+class FileStat:
+    size: int
+    mtime_ns: int
+    inode: int
+    device: int
+
+
 @dataclass(slots=True)
 class InputFileSpec:
     path: Path
     source_root: Path | None = None
+    stat: FileStat | None = None
+    # Pre-parsed metadata, reused by workers only while the file still matches ``stat``.
+    metadata: WavMetadata | None = None
 
 
 @dataclass(slots=True)
@@ -81,6 +96,7 @@ class ProcessRequest:
     batch_mode: bool = False
     overwrite_policy: OverwritePolicy = "ask"
     input_specs: list[InputFileSpec] = field(default_factory=list)
+    stream_inputs: bool = False
     profile: ProfileName = "preserve_supported_rate"
     performance_mode: PerformanceMode = "balanced"
     allow_conversion: bool = False
@@ -90,6 +106,24 @@ class ProcessRequest:
     bit_depth_policy: BitDepthPolicy = "convert"
     converter_backend: ConverterBackend = "builtin"
     ffmpeg_path: str = ""
+    metadata_index_path: Path | None = None
+    # Folder of converted outputs reused by later exports of the same audio; None disables.
+    conversion_cache_path: Path | None = None
+    conversion_cache_max_bytes: int = 2 * 1024 * 1024 * 1024
+    link_mode: LinkMode = "copy"
+    fsync_policy: FsyncPolicy = "off"
+    conversion_engine: ConversionEngine = "thread"
+    # Seconds a single conversion may run; enforced by the process engine and FFmpeg.
+    conversion_timeout: float | None = None
+    # Keep a journal in the output folder so an interrupted export can be resumed.
+    journal: bool = False
+    # Continue the export journaled in the output folder, skipping verified-complete files.
+    resume: bool = False
+    # Mirror into an output folder exported before: keep the journal as a manifest and
+    # reprocess only files whose source, settings or output changed since the last sync.
+    sync: bool = False
+    # With ``sync``: delete outputs whose source has disappeared from the selected inputs.
+    delete_orphans: bool = False
 
 
 @dataclass(slots=True)
@@ -108,6 +142,53 @@ class ProcessResult:
     header_fixed_files: list[Path] = field(default_factory=list)
     converted_files: list[Path] = field(default_factory=list)
     rejected_files: list[Path] = field(default_factory=list)
+    error_count: int = 0
+    warning_count: int = 0
+    # Pass-through outputs by how they were written: copy, reflink, hardlink or symlink.
+    materializations: dict[str, int] = field(default_factory=dict)
+    # Scheduler cost model: summed predictions vs. summed measured worker time.
+    predicted_cost: float = 0.0
+    worker_seconds: float = 0.0
+    # How conversion slots and native (OpenMP/BLAS) threads were budgeted for the run.
+    thread_budget: str = ""
+    # Set when the run was cancelled; the counts cover only the files that finished.
+    cancelled: bool = False
+    # Files left alone because a previous run already completed them; not in ``total``.
+    skipped: int = 0
+    # Outputs a sync deleted because their source was removed.
+    deleted: int = 0
+    # Conversions served from / added to the conversion cache.
+    conversion_cache_hits: int = 0
+    conversion_cache_misses: int = 0
+
+
+@dataclass(slots=True)
+class FileOutcome:
+    """Per-file record yielded by ``process_request_iter`` as each file completes."""
+
+    input_path: Path
+    output_path: Path
+    action: RepairAction
+    reason: str
+    warnings: list[str] = field(default_factory=list)
+    error: str | None = None
+    materialization: Materialization | None = None
+    predicted_cost: float | None = None
+    elapsed_s: float = 0.0
+
+
+@dataclass(slots=True)
+class ProgressSnapshot:
+    bytes_read: int
+    bytes_written: int
+    frames: int
+    files_done: int
+    files_total: int
+    # Rolling input throughput per lane ("io" for copies and header fixes, "cpu" for
+    # conversions), in MB/s.
+    lane_mb_per_s: dict[str, float] = field(default_factory=dict)
+    # Cost-model estimate of the seconds left for the files planned so far.
+    eta_s: float | None = None
 
 
 @dataclass(slots=True)
@@ -115,6 +196,11 @@ class ProgressEvent:
     kind: str
     message: str
     path: Path | None = None
+    # Set on "tuning" events: the concurrency the run is currently using.
+    worker_count: int | None = None
+    conversion_slots: int | None = None
+    # Set on throttled "progress" events.
+    snapshot: ProgressSnapshot | None = None
 
 
 @dataclass(slots=True)
@@ -0,0 +1,120 @@
+"""Spawned worker processes with per-task timeouts for CPU-bound conversions."""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+
+class TaskTimeoutError(TimeoutError):
+    """A task exceeded its timeout and the worker processes running it were stopped."""
+
+
+def _kill_workers(executor: ProcessPoolExecutor) -> None:
+    # No public API stops a running task; the worker processes are ours to stop.
+    for process in list(getattr(executor, "_processes", {}).values()):
+        process.kill()
+
+
+class TimeoutProcessPool:
+    """Run picklable callables in ``spawn`` worker processes, killing tasks that overrun.
+
+    ``ProcessPoolExecutor`` cannot cancel a running task, so a timeout kills every worker of
+    the current pool and starts a fresh one on the next call. Tasks that were running on a
+    pool that broke, killed or crashed by a neighbour, are retried once, one at a time in a
+    worker of their own, so a task that crashes its worker again fails alone. Callers should
+    keep at most ``max_workers`` tasks in flight, otherwise queue time counts against the
+    timeout.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        *,
+        initializer: Callable[[], object] | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.initializer = initializer
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._retry_lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._generation = 0
+        self._closed = False
+
+    def _current(self) -> tuple[ProcessPoolExecutor, int]:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Process pool is closed.")
+            if self._executor is None:
+                self._executor = self._new_executor(self.max_workers)
+                self._generation += 1
+            return self._executor, self._generation
+
+    def _new_executor(self, max_workers: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=self.initializer,
+        )
+
+    def _discard(self, generation: int, *, kill: bool) -> None:
+        with self._lock:
+            executor = self._executor
+            if executor is None or generation != self._generation:
+                return
+            self._executor = None
+        if kill:
+            _kill_workers(executor)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _timed_out(self) -> TaskTimeoutError:
+        return TaskTimeoutError(
+            f"Task timed out after {self.timeout:g}s; its worker process was stopped."
+        )
+
+    def run(self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+        executor, generation = self._current()
+        future = executor.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            self._discard(generation, kill=True)
+            raise self._timed_out() from None
+        except BrokenProcessPool:
+            self._discard(generation, kill=False)
+        return self._retry_alone(fn, *args, **kwargs)
+
+    def _retry_alone(self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any) -> _T:
+        # Any task of the broken pool may have broken it; isolated, only the culprit fails.
+        with self._retry_lock:
+            executor = self._new_executor(1)
+            try:
+                return executor.submit(fn, *args, **kwargs).result(timeout=self.timeout)
+            except FutureTimeoutError:
+                _kill_workers(executor)
+                raise self._timed_out() from None
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._closed = True
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> TimeoutProcessPool:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
@@ -2,27 +2,53 @@
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import heapq
 import importlib
+import itertools
 import os
 import shutil
+import signal
 import struct
 import subprocess
 import tempfile
-from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from functools import lru_cache
+from functools import lru_cache, partial
 from pathlib import Path
+from queue import Empty, SimpleQueue
+from stat import S_ISLNK
 from threading import Semaphore
 from typing import Any
 
-from .constants import COMPATIBILITY_PROFILES, SUPPORTED_PCM_BIT_DEPTHS
+from .cancellation import CancellationToken, raise_if_cancelled
+from .constants import (
+    COMPATIBILITY_PROFILES,
+    RESAMPLE_QUALITY_BY_MODE,
+    SUPPORTED_PCM_BIT_DEPTHS,
+)
+from .conversion_cache import ConversionCache, conversion_cache_key, open_conversion_cache
 from .decisions import ConversionTarget, decide_repair_action
+from .devices import DevicePair, DeviceQueue
+from .errors import ProcessingCancelledError
+from .file_copy import materialize_file
+from .journal import ExportJournal, JournalEntry, open_export_journal, settings_hash
 from .metadata_chunks import is_common_metadata_chunk
+from .metadata_index import WavMetadataIndex, open_metadata_index
 from .models import (
     BitDepthPolicy,
+    ConversionEngine,
     ConverterBackend,
+    FileOutcome,
+    FileStat,
+    FsyncPolicy,
     InputFileSpec,
+    LinkMode,
+    Materialization,
     MetadataPolicy,
     MultiChannelPolicy,
     OverwritePolicy,
@@ -36,6 +62,16 @@ from .models import (
     WavMetadata,
 )
 from .planning import OutputPlanContext, plan_output_path, safe_common_parent
+from .process_pool import TimeoutProcessPool
+from .progress import FileProgress, ProgressTracker, format_progress
+from .scanner import (
+    file_stat_from_result,
+    iter_input_specs,
+    scan_input_specs,
+    selected_top_level_names,
+)
+from .scheduling import predict_cost
+from .tuning import ConcurrencyTuner, usable_cpu_count
 from .wav_parser import parse_wav_file
 
 ProgressCallback = Callable[[ProgressEvent], None] | None
@@ -49,6 +85,40 @@ class WorkerOutcome:
     reason: str
     warning_messages: list[str]
     error: str | None = None
+    materialization: Materialization | None = None
+    # Set when the input itself was patched, leaving no temp output to move into place.
+    patched_in_place: bool = False
+    # Set when the conversion was routed to the CPU lane and has not run yet.
+    conversion: ConversionJob | None = None
+    # Cost-model prediction (see scheduling.predict_cost) and measured wall time.
+    predicted_cost: float | None = None
+    elapsed_s: float = 0.0
+    # Set when the run was cancelled before this file finished; its output was discarded.
+    cancelled: bool = False
+    # Set on conversions run with a conversion cache: True when served from it.
+    cache_hit: bool | None = None
+
+
+@dataclass(slots=True)
+class ConversionJob:
+    input_path: Path
+    output_path: Path
+    profile_name: str
+    target: ConversionTarget
+    metadata: WavMetadata
+    metadata_policy: MetadataPolicy
+    converter_backend: ConverterBackend
+    ffmpeg_path: str
+    resample_quality: str
+    reason: str
+    warnings: list[str]
+    # In-place runs convert into a temp beside the output and rename it over this path.
+    replace_path: Path | None = None
+    predicted_cost: float = 0.0
+    # Time the I/O lane spent on the file before routing it here.
+    elapsed_s: float = 0.0
+    # Live counters for progress events; not updated across the process-engine boundary.
+    progress: FileProgress | None = None
 
 
 @dataclass(slots=True)
@@ -56,6 +126,12 @@ class PerformanceConfig:
     worker_count: int
     conversion_slots: int
     resample_quality: str
+    # Set in auto mode: the range the live tuner may move each lane within.
+    worker_bounds: tuple[int, int] | None = None
+    slot_bounds: tuple[int, int] | None = None
+    # Native threads (OpenMP/BLAS) each conversion slot may use, so the busiest slot count
+    # times this stays within the mode's CPU share.
+    native_threads: int = 1
 
 
 @dataclass(slots=True)
@@ -71,35 +147,68 @@ def resolve_performance_config(
     max_workers_override: int | None = None,
     cpu_count: int | None = None,
 ) -> PerformanceConfig:
-    detected_cpu = max(1, cpu_count if cpu_count is not None else (os.cpu_count() or 4))
+    detected_cpu = max(1, cpu_count if cpu_count is not None else usable_cpu_count())
     reserved_cpu = 2 if detected_cpu >= 6 else 1
     available = max(1, detected_cpu - reserved_cpu)
 
+    if performance_mode == "auto":
+        # Start where balanced would and let the tuner move each lane. I/O workers may go
+        # well past the core count, since they mostly wait on storage.
+        worker_count = max(1, min(8, available))
+        conversion_slots = 2 if detected_cpu >= 6 else 1
+        worker_bounds = (1, max(4, min(32, detected_cpu * 4)))
+        if max_workers_override is not None:
+            worker_count = max(1, max_workers_override)
+            worker_bounds = (worker_count, worker_count)
+        return PerformanceConfig(
+            worker_count=worker_count,
+            conversion_slots=conversion_slots,
+            resample_quality=RESAMPLE_QUALITY_BY_MODE[performance_mode],
+            worker_bounds=worker_bounds,
+            # Slots may grow to one per CPU, so each keeps to a single native thread.
+            slot_bounds=(1, detected_cpu),
+            native_threads=1,
+        )
+
     if performance_mode == "conservative":
         worker_count = max(1, min(4, detected_cpu // 2))
         conversion_slots = 1
-        resample_quality = "HQ"
+        cpu_share = max(1, detected_cpu // 2)
     elif performance_mode == "fast":
         worker_count = max(1, min(16, detected_cpu - 1))
         conversion_slots = max(1, min(4, detected_cpu // 4))
-        resample_quality = "HQ"
+        cpu_share = detected_cpu
     else:
         worker_count = max(1, min(8, available))
         conversion_slots = 2 if detected_cpu >= 6 else 1
-        resample_quality = "VHQ"
+        cpu_share = available
 
     if max_workers_override is not None:
         worker_count = max(1, max_workers_override)
 
+    conversion_slots = max(1, conversion_slots)
     return PerformanceConfig(
         worker_count=worker_count,
-        conversion_slots=max(1, conversion_slots),
-        resample_quality=resample_quality,
+        conversion_slots=conversion_slots,
+        resample_quality=RESAMPLE_QUALITY_BY_MODE[performance_mode],
+        native_threads=max(1, cpu_share // conversion_slots),
     )
 
 
-def _copy_unmodified(input_file: Path, output_file: Path) -> None:
-    shutil.copy2(input_file, output_file)
+def _copy_unmodified(
+    input_file: Path,
+    output_file: Path,
+    link_mode: LinkMode = "copy",
+    cancel_token: CancellationToken | None = None,
+    progress: FileProgress | None = None,
+) -> Materialization:
+    return materialize_file(
+        input_file,
+        output_file,
+        link_mode,
+        cancel_token=cancel_token,
+        on_progress=progress.copied if progress is not None else None,
+    )
 
 
 def _normalized_path_key(path: Path) -> str:
@@ -130,41 +239,43 @@ def _copy_stream_range(
     destination,
     size: int,
     buffer_size: int = 1024 * 1024,
+    digest: Any | None = None,
+    cancel_token: CancellationToken | None = None,
+    progress: FileProgress | None = None,
 ) -> None:
+    buffer = memoryview(bytearray(min(buffer_size, size) or 1))
     remaining = size
     while remaining > 0:
-        chunk = source.read(min(buffer_size, remaining))
-        if not chunk:
+        raise_if_cancelled(cancel_token)
+        read = source.readinto(buffer[: min(len(buffer), remaining)])
+        if not read:
             raise ValueError("Unexpected EOF while copying WAV chunk payload.")
+        chunk = buffer[:read]
         destination.write(chunk)
-        remaining -= len(chunk)
+        if digest is not None:
+            digest.update(chunk)
+        if progress is not None:
+            progress.copied(read)
+        remaining -= read
 
 
-def _streams_equal_range(
-    *,
-    left_path: Path,
-    left_offset: int,
-    right_path: Path,
-    right_offset: int,
-    size: int,
-    buffer_size: int = 1024 * 1024,
-) -> bool:
-    remaining = size
-    with left_path.open("rb") as left_handle, right_path.open("rb") as right_handle:
-        left_handle.seek(left_offset)
-        right_handle.seek(right_offset)
+def _new_data_digest() -> Any:
+    return hashlib.blake2b(digest_size=16)
 
-        while remaining > 0:
-            read_size = min(buffer_size, remaining)
-            left_chunk = left_handle.read(read_size)
-            right_chunk = right_handle.read(read_size)
-            if left_chunk != right_chunk:
-                return False
-            if not left_chunk:
-                return False
-            remaining -= len(left_chunk)
 
-    return True
+def _hash_file_range(path: Path, offset: int, size: int, buffer_size: int = 1024 * 1024) -> bytes:
+    digest = _new_data_digest()
+    buffer = memoryview(bytearray(min(buffer_size, size) or 1))
+    remaining = size
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        while remaining > 0:
+            read = handle.readinto(buffer[: min(len(buffer), remaining)])
+            if not read:
+                break
+            digest.update(buffer[:read])
+            remaining -= read
+    return digest.digest()
 
 
 def _write_header_fixed_file(
@@ -172,7 +283,13 @@ def _write_header_fixed_file(
     output_file: Path,
     *,
     metadata: WavMetadata,
-) -> None:
+    cancel_token: CancellationToken | None = None,
+    progress: FileProgress | None = None,
+) -> bytes:
+    """Write the header-fixed copy and return a BLAKE2b digest of the data chunk payload.
+
+    The digest is taken while copying, so validation only has to hash the output.
+    """
     if metadata.format_kind != WavFormatKind.EXTENSIBLE_PCM:
         raise ValueError("Header fix is only valid for extensible PCM WAV files.")
     if not metadata.chunks:
@@ -185,6 +302,7 @@ def _write_header_fixed_file(
         raise ValueError("Incomplete WAV metadata; cannot build canonical PCM fmt chunk.")
 
     canonical_fmt = _build_canonical_pcm_fmt(channels, sample_rate, bits)
+    data_digest = None
 
     with input_file.open("rb") as source, output_file.open("wb") as destination:
         destination.write(b"RIFF\x00\x00\x00\x00WAVE")
@@ -207,7 +325,17 @@ def _write_header_fixed_file(
             destination.write(chunk_id)
             destination.write(struct.pack("<I", chunk.size))
             source.seek(chunk.data_offset)
-            _copy_stream_range(source=source, destination=destination, size=chunk.size)
+            digest = None
+            if chunk_id == b"data" and data_digest is None:
+                digest = data_digest = _new_data_digest()
+            _copy_stream_range(
+                source=source,
+                destination=destination,
+                size=chunk.size,
+                digest=digest,
+                cancel_token=cancel_token,
+                progress=progress,
+            )
             if chunk.size % 2:
                 destination.write(b"\x00")
 
@@ -215,6 +343,239 @@ def _write_header_fixed_file(
         destination.seek(4)
         destination.write(struct.pack("<I", total_size - 8))
 
+    if data_digest is None:
+        raise ValueError("Data chunk missing; cannot perform streaming header fix.")
+    return data_digest.digest()
+
+
+_IN_PLACE_TEMP_SUFFIX = ".wavfix-tmp"
+# Where the writer's pid cannot be checked, a temp this old is taken to be abandoned.
+_IN_PLACE_TEMP_STALE_S = 24 * 60 * 60
+_JOURNAL_MAGIC = b"WFXJRNL1"
+_JOURNAL_HEADER = struct.Struct("<8sQI")
+_JOURNAL_DIGEST_SIZE = 16
+
+
+def _header_journal_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.wavfix-journal")
+
+
+def _fsync_directory(directory: Path) -> None:
+    if os.name == "nt":
+        return
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def _fsync_file(path: Path) -> None:
+    with path.open("rb") as handle:
+        os.fsync(handle.fileno())
+
+
+def _fsync_outputs(paths: Iterable[Path]) -> None:
+    """Flush written outputs, then each containing directory once."""
+    directories: set[Path] = set()
+    for path in paths:
+        _fsync_file(path)
+        directories.add(path.parent)
+    for directory in directories:
+        _fsync_directory(directory)
+
+
+def _in_place_fmt_patch(metadata: WavMetadata) -> tuple[int, bytes] | None:
+    """Return (offset, replacement) turning the ``fmt `` chunk into canonical fmt + JUNK.
+
+    The replacement has exactly the size of the existing chunk, so every other byte in
+    the file, including the RIFF size, stays valid.
+    """
+    if metadata.format_kind != WavFormatKind.EXTENSIBLE_PCM:
+        return None
+    channels = metadata.channels
+    sample_rate = metadata.sample_rate
+    bits = metadata.bits_per_sample
+    if channels is None or sample_rate is None or bits is None:
+        return None
+
+    fmt_chunk = next((chunk for chunk in metadata.chunks if chunk.chunk_id == "fmt "), None)
+    if fmt_chunk is None:
+        return None
+
+    canonical_fmt = _build_canonical_pcm_fmt(channels, sample_rate, bits)
+    leftover = fmt_chunk.padded_size - len(canonical_fmt)
+    # The JUNK chunk needs room for its own 8-byte header.
+    if leftover < 8:
+        return None
+
+    junk_size = leftover - 8
+    replacement = (
+        b"fmt "
+        + struct.pack("<I", len(canonical_fmt))
+        + canonical_fmt
+        + b"JUNK"
+        + struct.pack("<I", junk_size)
+        + bytes(junk_size)
+    )
+    return fmt_chunk.offset, replacement
+
+
+def _write_header_journal(journal_path: Path, offset: int, original: bytes) -> None:
+    header = _JOURNAL_HEADER.pack(_JOURNAL_MAGIC, offset, len(original))
+    digest = hashlib.blake2b(header + original, digest_size=_JOURNAL_DIGEST_SIZE).digest()
+    with journal_path.open("wb") as journal:
+        journal.write(header + original + digest)
+        journal.flush()
+        os.fsync(journal.fileno())
+    _fsync_directory(journal_path.parent)
+
+
+def _restore_region(path: Path, offset: int, original: bytes) -> None:
+    with path.open("r+b") as handle:
+        handle.seek(offset)
+        handle.write(original)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def recover_header_journal(path: Path) -> bool:
+    """Undo an interrupted in-place header fix on ``path``; returns True if one was undone.
+
+    A journal that fails its checksum was torn before the WAV was touched and is discarded.
+    """
+    journal_path = _header_journal_path(path)
+    try:
+        payload = journal_path.read_bytes()
+    except FileNotFoundError:
+        return False
+
+    restored = False
+    header_size = _JOURNAL_HEADER.size
+    if len(payload) >= header_size + _JOURNAL_DIGEST_SIZE:
+        magic, offset, length = _JOURNAL_HEADER.unpack_from(payload)
+        body_end = header_size + length
+        body = payload[:body_end]
+        digest = payload[body_end:]
+        expected = hashlib.blake2b(body, digest_size=_JOURNAL_DIGEST_SIZE).digest()
+        if magic == _JOURNAL_MAGIC and digest == expected:
+            _restore_region(path, offset, body[header_size:])
+            restored = True
+
+    journal_path.unlink()
+    _fsync_directory(journal_path.parent)
+    return restored
+
+
+def _process_alive(pid: int) -> bool | None:
+    """Whether process ``pid`` is running; None where that cannot be checked safely."""
+    if os.name == "nt":
+        # os.kill() terminates a process on Windows instead of probing it.
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # It exists, it is just not ours to signal.
+        return True
+    return True
+
+
+def _in_place_temp_abandoned(entry: os.DirEntry[str]) -> bool:
+    # Temps are named ".<output>.<writer pid>.<random><suffix>".
+    parts = entry.name[: -len(_IN_PLACE_TEMP_SUFFIX)].rsplit(".", 2)
+    writer = parts[1] if len(parts) == 3 else ""
+    alive = _process_alive(int(writer)) if writer.isdigit() else None
+    if alive is not None:
+        return not alive
+    try:
+        return time.time() - entry.stat().st_mtime > _IN_PLACE_TEMP_STALE_S
+    except OSError:
+        return False
+
+
+def sweep_in_place_temps(directory: Path) -> int:
+    """Remove temp files crashed in-place rewrites left in ``directory``; returns the count.
+
+    A temp is only removed once the process that wrote it is gone, so a run rewriting the
+    same folder at the same time, e.g. the GUI beside the CLI, keeps its temps.
+    """
+    removed = 0
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return 0
+    for entry in entries:
+        name = entry.name
+        if not (name.startswith(".") and name.endswith(_IN_PLACE_TEMP_SUFFIX)):
+            continue
+        if not _in_place_temp_abandoned(entry):
+            continue
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(entry.path)
+            removed += 1
+    return removed
+
+
+def _fix_header_in_place(path: Path, metadata: WavMetadata) -> bool:
+    """Rewrite only the ``fmt `` chunk of ``path``; returns False when that is not possible.
+
+    The original bytes are journaled and fsynced first, so an interrupted fix is undone
+    by ``recover_header_journal``. The patched file is re-parsed before the journal is
+    dropped and restored if validation fails.
+    """
+    patch = _in_place_fmt_patch(metadata)
+    if patch is None:
+        return False
+    offset, replacement = patch
+    # Patching would also change every other name of a linked file; a renamed temp does not.
+    link_stat = os.lstat(path)
+    if S_ISLNK(link_stat.st_mode) or link_stat.st_nlink > 1:
+        return False
+    journal_path = _header_journal_path(path)
+
+    with path.open("r+b") as handle:
+        handle.seek(offset)
+        original = handle.read(len(replacement))
+        if len(original) != len(replacement) or original[:4] != b"fmt ":
+            return False
+        try:
+            _write_header_journal(journal_path, offset, original)
+        except OSError:
+            journal_path.unlink(missing_ok=True)
+            return False
+
+        handle.seek(offset)
+        handle.write(replacement)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+    try:
+        patched = parse_wav_file(path, include_chunks=False)
+        if patched.format_kind != WavFormatKind.PCM or patched.format_tag != 0x0001:
+            raise ValueError("Output validation failed: in-place header fix is not canonical PCM.")
+        if (
+            patched.channels != metadata.channels
+            or patched.sample_rate != metadata.sample_rate
+            or patched.bits_per_sample != metadata.bits_per_sample
+            or patched.data_offset != metadata.data_offset
+            or patched.data_size != metadata.data_size
+        ):
+            raise ValueError("Output validation failed: in-place header fix changed the stream.")
+    except BaseException:
+        _restore_region(path, offset, original)
+        raise
+    finally:
+        journal_path.unlink(missing_ok=True)
+        _fsync_directory(journal_path.parent)
+    return True
+
 
 _SPEAKER_COEFFICIENTS: dict[int, tuple[float, float]] = {
     0: (1.0, 0.0),  # FL
@@ -237,6 +598,21 @@ _SPEAKER_COEFFICIENTS: dict[int, tuple[float, float]] = {
 }
 _DEFAULT_SPEAKER_ORDER_BITS: tuple[int, ...] = (0, 1, 2, 3, 4, 5, 9, 10)
 _CONVERSION_BLOCK_FRAMES = 65536
+# Names the dither applied by built-in conversions in conversion cache keys.
+_DITHER_SCHEME = "tpdf-seeded"
+# Bumped whenever built-in conversions start writing different bytes for the same input,
+# so the conversion cache stops serving outputs of earlier versions.
+_CONVERSION_REVISION = 2
+_SUBMIT_WINDOW_PER_WORKER = 4
+_FSYNC_BATCH_SIZE = 64
+_CONVERSION_BACKLOG_PER_SLOT = 64
+# Thread-pool sizes read by OpenMP (libsoxr, ffmpeg filters), OpenBLAS, MKL and Accelerate.
+_NATIVE_THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+)
 
 
 @lru_cache(maxsize=1)
@@ -276,6 +652,45 @@ def warm_conversion_backend() -> None:
         return
 
 
+def _native_thread_env(threads: int) -> dict[str, str]:
+    """Thread-count variables for native libraries, leaving any the user already set."""
+    return {name: str(threads) for name in _NATIVE_THREAD_ENV_VARS if name not in os.environ}
+
+
+@contextlib.contextmanager
+def _native_thread_limits(threads: int) -> Iterator[str]:
+    """Cap OpenMP/BLAS thread pools at ``threads`` per process; yields how it was applied.
+
+    threadpoolctl (optional) resizes pools that are already loaded. Without it the
+    environment variables only reach libraries loaded later and spawned workers.
+    """
+    try:
+        threadpoolctl = importlib.import_module("threadpoolctl")
+    except ImportError:
+        threadpoolctl = None
+    if threadpoolctl is not None:
+        with threadpoolctl.threadpool_limits(limits=threads):
+            yield "threadpoolctl"
+        return
+
+    applied = _native_thread_env(threads)
+    os.environ.update(applied)
+    try:
+        yield "environment"
+    finally:
+        for name in applied:
+            os.environ.pop(name, None)
+
+
+def _describe_thread_budget(config: PerformanceConfig, control: str) -> str:
+    _, max_slots = config.slot_bounds or (config.conversion_slots, config.conversion_slots)
+    slots = f"up to {max_slots}" if config.slot_bounds is not None else str(max_slots)
+    return (
+        f"{slots} conversion slot(s) x {config.native_threads} native thread(s), "
+        f"{config.worker_count} I/O worker(s); native limits via {control}"
+    )
+
+
 def _speaker_bits_for_layout(channel_count: int, channel_mask: int | None) -> list[int]:
     if channel_mask is not None and channel_mask > 0:
         bits = [bit for bit in range(32) if channel_mask & (1 << bit)]
@@ -367,7 +782,18 @@ def _create_soxr_resample_stream(
     if stream_class is None:
         return None
 
+    # Conversion blocks are float64; python-soxr streams default to float32 input.
     attempts: tuple[tuple[tuple[Any, ...], dict[str, Any]], ...] = (
+        (
+            (),
+            {
+                "in_rate": input_rate,
+                "out_rate": output_rate,
+                "num_channels": channels,
+                "dtype": "float64",
+                "quality": quality,
+            },
+        ),
         (
             (),
             {
@@ -447,26 +873,35 @@ def _quantize_pcm_float(
 
     max_int = float((1 << (bit_depth - 1)) - 1)
     min_int = float(-(1 << (bit_depth - 1)))
-    clipped = np_module.clip(samples, -1.0, 1.0)
-    clipped_samples = int(np_module.count_nonzero(samples != clipped))
+    # A fresh float64 array, so the scaling below can work in place at full precision.
+    scaled = np_module.clip(samples, -1.0, 1.0).astype(np_module.float64, copy=False)
+    clipped_samples = int(np_module.count_nonzero(samples != scaled))
 
     if apply_dither:
         rng_instance = rng if rng is not None else np_module.random.default_rng()
-        dither = (
-            rng_instance.random(clipped.shape) + rng_instance.random(clipped.shape) - 1.0
-        ) / max_int
-        scaled = (clipped + dither) * max_int
-    else:
-        scaled = clipped * max_int
+        # Both TPDF draws of a sample are taken together, in output sample order, so a
+        # seeded generator yields the same noise however the stream is split into blocks.
+        draws = rng_instance.random((*scaled.shape, 2))
+        dither = draws[..., 0] + draws[..., 1]
+        dither -= 1.0
+        dither /= max_int
+        scaled += dither
+    scaled *= max_int
 
-    quantized = np_module.rint(scaled)
-    quantized = np_module.clip(quantized, min_int, max_int).astype(np_module.int32, copy=False)
-    return quantized, clipped_samples
+    np_module.rint(scaled, out=scaled)
+    np_module.clip(scaled, min_int, max_int, out=scaled)
+    return scaled.astype(np_module.int32), clipped_samples
 
 
-def _int_to_float_grid(np_module: Any, samples: Any, bit_depth: int) -> Any:
-    max_int = float((1 << (bit_depth - 1)) - 1)
-    return samples.astype(np_module.float32, copy=False) / max_int
+def _pcm_write_buffer(np_module: Any, samples: Any, bit_depth: int) -> Any:
+    """Return quantized int32 samples in the integer layout soundfile writes unscaled.
+
+    soundfile treats int16/int32 buffers as full scale, so 24-bit samples are
+    left-justified in int32; the shift reuses ``samples``.
+    """
+    if bit_depth == 16:
+        return samples.astype(np_module.int16)
+    return np_module.left_shift(samples, 32 - bit_depth, out=samples)
 
 
 def _plan_metadata_chunks(
@@ -482,37 +917,26 @@ def _plan_metadata_chunks(
             raise ValueError("Strict metadata preservation requires chunk table metadata.")
         return plans, []
 
-    with input_file.open("rb") as source:
-        for chunk in metadata.chunks:
-            source.seek(chunk.offset)
-            header = source.read(8)
-            if len(header) != 8:
-                if metadata_policy == "strict_preserve":
-                    raise ValueError(
-                        "Strict metadata preservation failed: chunk header unreadable."
-                    )
-                continue
-
-            chunk_id_bytes = header[:4]
-            chunk_id = chunk_id_bytes.decode("ascii", errors="replace")
-            if chunk_id in {"fmt ", "data"}:
-                continue
-
-            if not is_common_metadata_chunk(chunk_id):
-                if metadata_policy == "strict_preserve":
-                    raise ValueError(
-                        "Strict metadata preservation rejected unsupported metadata chunk: "
-                        f"{chunk_id}."
-                    )
-                continue
+    # The parser already read every chunk header, so the table is trusted as-is.
+    for chunk in metadata.chunks:
+        chunk_id = chunk.chunk_id
+        if chunk_id in {"fmt ", "data"}:
+            continue
 
-            plans.append(
-                MetadataChunkPlan(
-                    chunk_id=chunk_id_bytes,
-                    size=chunk.size,
-                    data_offset=chunk.data_offset,
+        if not is_common_metadata_chunk(chunk_id):
+            if metadata_policy == "strict_preserve":
+                raise ValueError(
+                    f"Strict metadata preservation rejected unsupported metadata chunk: {chunk_id}."
                 )
+            continue
+
+        plans.append(
+            MetadataChunkPlan(
+                chunk_id=chunk_id.encode("ascii"),
+                size=chunk.size,
+                data_offset=chunk.data_offset,
             )
+        )
 
     return plans, []
 
@@ -549,7 +973,11 @@ def _run_conversion(
     input_metadata: WavMetadata,
     metadata_policy: MetadataPolicy,
     resample_quality: str,
+    cancel_token: CancellationToken | None = None,
+    progress: FileProgress | None = None,
+    dither_seed: int | None = None,
 ) -> list[str]:
+    """Convert with the built-in backend; a ``dither_seed`` makes the output reproducible."""
     chunk_plans, _ = _plan_metadata_chunks(
         input_file=input_file,
         metadata=input_metadata,
@@ -558,7 +986,7 @@ def _run_conversion(
 
     np_module, soundfile_module, soxr_module = _load_conversion_backends()
     subtype = "PCM_24" if target.bit_depth == 24 else "PCM_16"
-    conversion_rng = np_module.random.default_rng()
+    conversion_rng = np_module.random.default_rng(dither_seed)
     input_bits = int(input_metadata.bits_per_sample or target.bit_depth)
     source_kind = input_metadata.format_kind
     is_float_source = source_kind in {WavFormatKind.IEEE_FLOAT, WavFormatKind.EXTENSIBLE_FLOAT}
@@ -568,6 +996,8 @@ def _run_conversion(
         source_channels != target.channels or source_rate_hint != target.sample_rate
     )
     apply_dither = is_float_source or input_bits >= target.bit_depth or uses_processing_dsp
+    input_frame_bytes = int(input_metadata.block_align or source_channels * (input_bits // 8))
+    output_frame_bytes = target.channels * (target.bit_depth // 8)
 
     with soundfile_module.SoundFile(str(input_file), mode="r") as in_handle:
         source_rate = int(in_handle.samplerate)
@@ -592,6 +1022,9 @@ def _run_conversion(
                 always_2d=True,
             )
             for block in blocks:
+                raise_if_cancelled(cancel_token)
+                if progress is not None:
+                    progress.add(read=len(block) * input_frame_bytes, frames=len(block))
                 aligned = _to_aligned_channels(
                     np_module,
                     block,
@@ -640,7 +1073,9 @@ def _run_conversion(
                     rng=conversion_rng,
                     apply_dither=apply_dither,
                 )
-                out_handle.write(_int_to_float_grid(np_module, quantized, target.bit_depth))
+                out_handle.write(_pcm_write_buffer(np_module, quantized, target.bit_depth))
+                if progress is not None:
+                    progress.add(written=len(quantized) * output_frame_bytes)
 
             if source_rate != target.sample_rate and resampler is not None:
                 flush_block = _resample_block(
@@ -660,7 +1095,7 @@ def _run_conversion(
                         rng=conversion_rng,
                         apply_dither=apply_dither,
                     )
-                    out_handle.write(_int_to_float_grid(np_module, quantized, target.bit_depth))
+                    out_handle.write(_pcm_write_buffer(np_module, quantized, target.bit_depth))
 
     _append_metadata_chunks(
         input_file=input_file,
@@ -695,6 +1130,7 @@ def _run_ffmpeg_conversion(
     metadata_policy: MetadataPolicy,
     ffmpeg_path: str,
     resample_quality: str,
+    timeout: float | None = None,
 ) -> list[str]:
     chunk_plans, _ = _plan_metadata_chunks(
         input_file=input_file,
@@ -732,15 +1168,22 @@ def _run_ffmpeg_conversion(
         audio_filter,
         "-c:a",
         subtype,
+        "-f",
+        "wav",
         str(output_file),
     ]
 
-    completed = subprocess.run(
-        command,
-        capture_output=True,
-        text=True,
-        check=False,
-    )
+    try:
+        completed = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        _discard_partial_output(output_file)
+        raise TimeoutError(f"FFmpeg conversion timed out after {timeout:g}s.") from None
     if completed.returncode != 0:
         details = (completed.stderr or completed.stdout).strip()
         if details:
@@ -749,20 +1192,18 @@ def _run_ffmpeg_conversion(
     return []
 
 
-def _validate_pass_through_output(input_file: Path, output_file: Path) -> None:
-    if input_file.suffix.lower() != ".wav":
-        return
-
-    output_meta = parse_wav_file(output_file, include_chunks=False)
-    if output_meta.format_kind == WavFormatKind.MALFORMED:
+def _validate_pass_through_source(input_meta: WavMetadata) -> None:
+    # copy_file verifies the byte count, so the header parsed from the source stands in
+    # for re-parsing the output.
+    if input_meta.format_kind == WavFormatKind.MALFORMED:
         raise ValueError("Output validation failed: pass-through WAV is malformed.")
 
 
 def _validate_header_fix_output(
     *,
-    input_file: Path,
     output_file: Path,
     input_meta: WavMetadata,
+    data_digest: bytes,
 ) -> None:
     output_meta = parse_wav_file(output_file, include_chunks=False)
 
@@ -787,13 +1228,8 @@ def _validate_header_fix_output(
     if input_meta.data_size != output_meta.data_size:
         raise ValueError("Output validation failed: audio data size changed during header fix.")
 
-    if not _streams_equal_range(
-        left_path=input_file,
-        left_offset=input_meta.data_offset,
-        right_path=output_file,
-        right_offset=output_meta.data_offset,
-        size=input_meta.data_size,
-    ):
+    output_digest = _hash_file_range(output_file, output_meta.data_offset, output_meta.data_size)
+    if output_digest != data_digest:
         raise ValueError("Output validation failed: audio data changed during header fix.")
 
 
@@ -836,6 +1272,303 @@ def _validate_conversion_output(
         raise ValueError("Output validation failed: converted file bit depth target mismatch.")
 
 
+def _detach_linked_output(output_path: Path) -> None:
+    """Unlink an existing output that is a link so rewriting it cannot modify its source."""
+    try:
+        stat_result = output_path.lstat()
+    except OSError:
+        return
+    if S_ISLNK(stat_result.st_mode) or stat_result.st_nlink > 1:
+        output_path.unlink()
+
+
+def _reusable_metadata(
+    input_path: Path,
+    metadata: WavMetadata | None,
+    file_stat: FileStat | None,
+) -> WavMetadata | None:
+    """Return pre-parsed metadata when the file still has the size and mtime it was read at."""
+    if metadata is None or file_stat is None:
+        return None
+    try:
+        current = input_path.stat()
+    except OSError:
+        return None
+    if (current.st_size, current.st_mtime_ns) != (file_stat.size, file_stat.mtime_ns):
+        return None
+    return metadata
+
+
+def _parse_input(input_path: Path, metadata_index: WavMetadataIndex | None) -> WavMetadata:
+    # Parse the chunk table up front: the windowed walk costs little more than the header
+    # and lets header fixes and conversions reuse the same metadata.
+    if metadata_index is not None:
+        return metadata_index.parse(input_path, include_chunks=True)
+    return parse_wav_file(input_path, include_chunks=True)
+
+
+def _discard_partial_output(output_file: Path) -> None:
+    # A killed conversion may still hold the file briefly on Windows; leave it then.
+    with contextlib.suppress(OSError):
+        output_file.unlink(missing_ok=True)
+
+
+def _cancelled_outcome(output_path: Path, predicted_cost: float | None = None) -> WorkerOutcome:
+    return WorkerOutcome(
+        output_path=output_path,
+        action=RepairAction.REJECT,
+        reason="Cancelled.",
+        warning_messages=[],
+        predicted_cost=predicted_cost,
+        cancelled=True,
+    )
+
+
+def _init_conversion_worker(native_threads: int = 1) -> None:
+    """Process-pool initializer: import the conversion backends once per worker.
+
+    Thread limits are set first, since native libraries size their pools on load. Ctrl+C
+    reaches the whole process group; workers ignore it so only the parent's cancellation
+    token stops the run, and a worker finishes the file it is converting.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    os.environ.update(_native_thread_env(native_threads))
+    try:
+        _load_conversion_backends()
+    except RuntimeError:
+        # Let each task report the missing backend instead of breaking the pool.
+        pass
+
+
+def _convert_in_worker(
+    *,
+    input_path: Path,
+    output_path: Path,
+    profile_name: str,
+    target: ConversionTarget,
+    metadata: WavMetadata,
+    metadata_policy: MetadataPolicy,
+    resample_quality: str,
+    reason: str,
+    warnings: list[str],
+    dither_seed: int | None = None,
+) -> WorkerOutcome:
+    conversion_warnings = _run_conversion(
+        input_file=input_path,
+        output_file=output_path,
+        target=target,
+        input_metadata=metadata,
+        metadata_policy=metadata_policy,
+        resample_quality=resample_quality,
+        dither_seed=dither_seed,
+    )
+    _validate_conversion_output(
+        output_file=output_path,
+        profile_name=profile_name,
+        target=target,
+    )
+    return WorkerOutcome(
+        output_path=output_path,
+        action=RepairAction.CONVERT,
+        reason=reason,
+        warning_messages=[*warnings, *conversion_warnings],
+    )
+
+
+def _open_tuner(config: PerformanceConfig) -> ConcurrencyTuner | None:
+    if config.worker_bounds is None or config.slot_bounds is None:
+        return None
+    return ConcurrencyTuner(
+        io_start=config.worker_count,
+        io_bounds=config.worker_bounds,
+        cpu_start=config.conversion_slots,
+        cpu_bounds=config.slot_bounds,
+    )
+
+
+def _open_conversion_pool(
+    engine: ConversionEngine,
+    *,
+    slots: int,
+    timeout: float | None,
+    native_threads: int = 1,
+) -> TimeoutProcessPool | None:
+    if engine != "process":
+        return None
+    # Workers are spawned on the first conversion, so runs without one pay nothing.
+    return TimeoutProcessPool(
+        slots,
+        initializer=partial(_init_conversion_worker, native_threads),
+        timeout=timeout,
+    )
+
+
+def _audio_digest(input_path: Path, metadata: WavMetadata) -> bytes:
+    if metadata.data_offset is None or metadata.data_size is None:
+        raise ValueError("Input file has no data chunk to convert.")
+    return _hash_file_range(input_path, metadata.data_offset, metadata.data_size)
+
+
+def _dither_seed(audio_digest: bytes, target: ConversionTarget) -> int:
+    """Seed a conversion's dither from its audio and target, so reruns give identical bytes."""
+    digest = hashlib.blake2b(audio_digest, digest_size=16)
+    digest.update(struct.pack("<III", target.sample_rate, target.channels, target.bit_depth))
+    return int.from_bytes(digest.digest(), "little")
+
+
+def _conversion_cache_key(job: ConversionJob, audio_digest: bytes) -> str:
+    metadata = job.metadata
+    header_digest = _new_data_digest()
+    for chunk in metadata.chunks:
+        if chunk.chunk_id == "data":
+            continue
+        header_digest.update(chunk.chunk_id.encode("ascii", errors="replace"))
+        header_digest.update(_hash_file_range(job.input_path, chunk.data_offset, chunk.size))
+    return conversion_cache_key(
+        audio_digest=audio_digest,
+        header_digest=header_digest.digest(),
+        target=job.target,
+        resample_quality=job.resample_quality,
+        converter_backend=job.converter_backend,
+        metadata_policy=job.metadata_policy,
+        dither=_DITHER_SCHEME if job.converter_backend == "builtin" else "ffmpeg-triangular",
+        revision=_CONVERSION_REVISION,
+    )
+
+
+def _convert(
+    job: ConversionJob,
+    *,
+    conversion_pool: TimeoutProcessPool | None,
+    conversion_timeout: float | None,
+    cancel_token: CancellationToken | None = None,
+    conversion_cache: ConversionCache | None = None,
+) -> WorkerOutcome:
+    """Convert ``job``, serving it from ``conversion_cache`` when an identical one is there."""
+    # Only now that the file is sure to be rewritten; a rejected file keeps its old output.
+    _detach_linked_output(job.output_path)
+    if conversion_cache is None:
+        return _convert_uncached(
+            job,
+            conversion_pool=conversion_pool,
+            conversion_timeout=conversion_timeout,
+            cancel_token=cancel_token,
+        )
+
+    audio_digest = _audio_digest(job.input_path, job.metadata)
+    key = _conversion_cache_key(job, audio_digest)
+    progress = job.progress
+    if conversion_cache.fetch(
+        key,
+        job.output_path,
+        cancel_token=cancel_token,
+        on_progress=None if progress is None else lambda count: progress.add(written=count),
+    ):
+        if progress is not None:
+            progress.add(read=progress.size)
+        _validate_conversion_output(
+            output_file=job.output_path,
+            profile_name=job.profile_name,
+            target=job.target,
+        )
+        return WorkerOutcome(
+            output_path=job.output_path,
+            action=RepairAction.CONVERT,
+            reason=job.reason,
+            warning_messages=list(job.warnings),
+            predicted_cost=job.predicted_cost,
+            cache_hit=True,
+        )
+
+    outcome = _convert_uncached(
+        job,
+        conversion_pool=conversion_pool,
+        conversion_timeout=conversion_timeout,
+        cancel_token=cancel_token,
+        audio_digest=audio_digest,
+    )
+    conversion_cache.store(key, job.output_path)
+    outcome.cache_hit = False
+    return outcome
+
+
+def _convert_uncached(
+    job: ConversionJob,
+    *,
+    conversion_pool: TimeoutProcessPool | None,
+    conversion_timeout: float | None,
+    cancel_token: CancellationToken | None = None,
+    audio_digest: bytes | None = None,
+) -> WorkerOutcome:
+    dither_seed: int | None = None
+    if job.converter_backend != "ffmpeg":
+        if audio_digest is None:
+            audio_digest = _audio_digest(job.input_path, job.metadata)
+        dither_seed = _dither_seed(audio_digest, job.target)
+    if job.converter_backend != "ffmpeg" and conversion_pool is not None:
+        try:
+            outcome = conversion_pool.run(
+                _convert_in_worker,
+                input_path=job.input_path,
+                output_path=job.output_path,
+                profile_name=job.profile_name,
+                target=job.target,
+                metadata=job.metadata,
+                metadata_policy=job.metadata_policy,
+                resample_quality=job.resample_quality,
+                reason=job.reason,
+                warnings=job.warnings,
+                dither_seed=dither_seed,
+            )
+        except TimeoutError:
+            _discard_partial_output(job.output_path)
+            raise
+        except (KeyboardInterrupt, BrokenProcessPool):
+            # A worker that was interrupted or died leaves its output half written.
+            _discard_partial_output(job.output_path)
+            if cancel_token is not None and cancel_token.cancelled:
+                raise ProcessingCancelledError("Processing was cancelled.") from None
+            raise
+        outcome.predicted_cost = job.predicted_cost
+        return outcome
+
+    if job.converter_backend == "ffmpeg":
+        conversion_warnings = _run_ffmpeg_conversion(
+            input_file=job.input_path,
+            output_file=job.output_path,
+            target=job.target,
+            input_metadata=job.metadata,
+            metadata_policy=job.metadata_policy,
+            ffmpeg_path=job.ffmpeg_path,
+            resample_quality=job.resample_quality,
+            timeout=conversion_timeout,
+        )
+    else:
+        conversion_warnings = _run_conversion(
+            input_file=job.input_path,
+            output_file=job.output_path,
+            target=job.target,
+            input_metadata=job.metadata,
+            metadata_policy=job.metadata_policy,
+            resample_quality=job.resample_quality,
+            cancel_token=cancel_token,
+            progress=job.progress,
+            dither_seed=dither_seed,
+        )
+    _validate_conversion_output(
+        output_file=job.output_path,
+        profile_name=job.profile_name,
+        target=job.target,
+    )
+    return WorkerOutcome(
+        output_path=job.output_path,
+        action=RepairAction.CONVERT,
+        reason=job.reason,
+        warning_messages=[*job.warnings, *conversion_warnings],
+        predicted_cost=job.predicted_cost,
+    )
+
+
 def _process_path(
     *,
     input_path: Path,
@@ -850,19 +1583,35 @@ def _process_path(
     ffmpeg_path: str,
     conversion_semaphore: Semaphore | None,
     resample_quality: str,
+    metadata_index: WavMetadataIndex | None = None,
+    input_metadata: WavMetadata | None = None,
+    input_stat: FileStat | None = None,
+    link_mode: LinkMode = "copy",
+    patch_in_place: bool = False,
+    conversion_pool: TimeoutProcessPool | None = None,
+    conversion_timeout: float | None = None,
+    defer_conversion: bool = False,
+    cancel_token: CancellationToken | None = None,
+    progress: FileProgress | None = None,
 ) -> WorkerOutcome:
+    size = input_stat.size if input_stat is not None else input_path.stat().st_size
     suffix = input_path.suffix.lower()
     if suffix != ".wav":
-        _copy_unmodified(input_path, output_path)
-        _validate_pass_through_output(input_path, output_path)
+        materialization = _copy_unmodified(
+            input_path, output_path, link_mode, cancel_token, progress
+        )
         return WorkerOutcome(
             output_path=output_path,
             action=RepairAction.PASS_THROUGH,
             reason="Non-WAV file copied unchanged.",
             warning_messages=[],
+            materialization=materialization,
+            predicted_cost=predict_cost(size, RepairAction.PASS_THROUGH),
         )
 
-    metadata = parse_wav_file(input_path, include_chunks=False)
+    metadata = _reusable_metadata(input_path, input_metadata, input_stat)
+    if metadata is None:
+        metadata = _parse_input(input_path, metadata_index)
     decision = decide_repair_action(
         metadata,
         profile_name=profile_name,
@@ -871,6 +1620,7 @@ def _process_path(
         sample_rate_policy=sample_rate_policy,
         bit_depth_policy=bit_depth_policy,
     )
+    cost = predict_cost(size, decision.action, metadata=metadata, target=decision.target)
 
     if decision.action == RepairAction.REJECT:
         return WorkerOutcome(
@@ -878,77 +1628,168 @@ def _process_path(
             action=RepairAction.REJECT,
             reason=decision.reason,
             warning_messages=decision.warnings,
+            predicted_cost=cost,
         )
 
     if decision.action == RepairAction.PASS_THROUGH:
-        _copy_unmodified(input_path, output_path)
-        _validate_pass_through_output(input_path, output_path)
+        _validate_pass_through_source(metadata)
+        _detach_linked_output(output_path)
+        materialization = _copy_unmodified(
+            input_path, output_path, link_mode, cancel_token, progress
+        )
         return WorkerOutcome(
             output_path=output_path,
             action=RepairAction.PASS_THROUGH,
             reason=decision.reason,
             warning_messages=decision.warnings,
+            predicted_cost=cost,
+            materialization=materialization,
         )
 
     if decision.action == RepairAction.HEADER_FIX:
-        metadata = parse_wav_file(input_path, include_chunks=True)
-        _write_header_fixed_file(input_path, output_path, metadata=metadata)
+        if not metadata.chunks:
+            metadata = _parse_input(input_path, metadata_index)
+        if patch_in_place and _fix_header_in_place(input_path, metadata):
+            return WorkerOutcome(
+                output_path=input_path,
+                action=RepairAction.HEADER_FIX,
+                reason=decision.reason,
+                warning_messages=decision.warnings,
+                predicted_cost=cost,
+                patched_in_place=True,
+            )
+        _detach_linked_output(output_path)
+        data_digest = _write_header_fixed_file(
+            input_path,
+            output_path,
+            metadata=metadata,
+            cancel_token=cancel_token,
+            progress=progress,
+        )
         _validate_header_fix_output(
-            input_file=input_path,
             output_file=output_path,
             input_meta=metadata,
+            data_digest=data_digest,
         )
         return WorkerOutcome(
             output_path=output_path,
             action=RepairAction.HEADER_FIX,
             reason=decision.reason,
             warning_messages=decision.warnings,
+            predicted_cost=cost,
         )
 
     if decision.action == RepairAction.CONVERT:
         if decision.target is None:
             raise RuntimeError("Decision requested conversion without conversion target details.")
-        metadata = parse_wav_file(input_path, include_chunks=True)
+        if not metadata.chunks:
+            metadata = _parse_input(input_path, metadata_index)
+        job = ConversionJob(
+            input_path=input_path,
+            output_path=output_path,
+            profile_name=profile_name,
+            target=decision.target,
+            metadata=metadata,
+            metadata_policy=metadata_policy,
+            converter_backend=converter_backend,
+            ffmpeg_path=ffmpeg_path,
+            resample_quality=resample_quality,
+            reason=decision.reason,
+            warnings=decision.warnings,
+            predicted_cost=cost,
+            progress=progress,
+        )
+        if defer_conversion:
+            return WorkerOutcome(
+                output_path=output_path,
+                action=RepairAction.CONVERT,
+                reason=decision.reason,
+                warning_messages=decision.warnings,
+                predicted_cost=cost,
+                conversion=job,
+            )
         if conversion_semaphore is not None:
             conversion_semaphore.acquire()
         try:
-            if converter_backend == "ffmpeg":
-                conversion_warnings = _run_ffmpeg_conversion(
-                    input_file=input_path,
-                    output_file=output_path,
-                    target=decision.target,
-                    input_metadata=metadata,
-                    metadata_policy=metadata_policy,
-                    ffmpeg_path=ffmpeg_path,
-                    resample_quality=resample_quality,
-                )
-            else:
-                conversion_warnings = _run_conversion(
-                    input_file=input_path,
-                    output_file=output_path,
-                    target=decision.target,
-                    input_metadata=metadata,
-                    metadata_policy=metadata_policy,
-                    resample_quality=resample_quality,
-                )
+            return _convert(
+                job,
+                conversion_pool=conversion_pool,
+                conversion_timeout=conversion_timeout,
+                cancel_token=cancel_token,
+            )
         finally:
             if conversion_semaphore is not None:
                 conversion_semaphore.release()
-        _validate_conversion_output(
-            output_file=output_path,
-            profile_name=profile_name,
-            target=decision.target,
-        )
-        return WorkerOutcome(
-            output_path=output_path,
-            action=RepairAction.CONVERT,
-            reason=decision.reason,
-            warning_messages=[*decision.warnings, *conversion_warnings],
-        )
 
     raise RuntimeError(f"Unhandled repair action: {decision.action}")
 
 
+def _wrote_output_data(outcome: WorkerOutcome) -> bool:
+    # Links add no file data of their own to flush.
+    return (
+        outcome.error is None
+        and outcome.conversion is None
+        and outcome.action != RepairAction.REJECT
+        and outcome.materialization not in {"hardlink", "symlink"}
+    )
+
+
+def _swap_into_place(temp_path: Path, output_path: Path, fsync_policy: FsyncPolicy) -> None:
+    if fsync_policy == "each":
+        _fsync_file(temp_path)
+    os.replace(temp_path, output_path)
+    if fsync_policy == "each":
+        _fsync_directory(output_path.parent)
+
+
+def _run_conversion_job(
+    job: ConversionJob,
+    *,
+    conversion_pool: TimeoutProcessPool | None,
+    conversion_timeout: float | None,
+    fsync_policy: FsyncPolicy,
+    cancel_token: CancellationToken | None = None,
+    conversion_cache: ConversionCache | None = None,
+) -> WorkerOutcome:
+    """CPU-lane task: run a conversion routed from the I/O lane and finish its output."""
+    final_path = job.replace_path if job.replace_path is not None else job.output_path
+    started = False
+    try:
+        # Checked before the output is opened, so an untouched earlier output survives.
+        raise_if_cancelled(cancel_token)
+        started = True
+        outcome = _convert(
+            job,
+            conversion_pool=conversion_pool,
+            conversion_timeout=conversion_timeout,
+            cancel_token=cancel_token,
+            conversion_cache=conversion_cache,
+        )
+        if job.replace_path is not None:
+            _swap_into_place(job.output_path, job.replace_path, fsync_policy)
+            outcome.output_path = job.replace_path
+        elif fsync_policy == "each":
+            _fsync_outputs([job.output_path])
+    except ProcessingCancelledError:
+        if started and job.replace_path is None:
+            _discard_partial_output(job.output_path)
+        outcome = _cancelled_outcome(final_path, job.predicted_cost)
+    except Exception as exc:  # pragma: no cover - propagated into result/errors
+        outcome = WorkerOutcome(
+            output_path=final_path,
+            action=RepairAction.REJECT,
+            reason="Processing failed.",
+            warning_messages=[],
+            error=str(exc),
+            predicted_cost=job.predicted_cost,
+        )
+    finally:
+        if job.replace_path is not None:
+            _discard_partial_output(job.output_path)
+    outcome.elapsed_s += job.elapsed_s
+    return outcome
+
+
 def _process_single_file(
     *,
     input_path_str: str,
@@ -964,15 +1805,38 @@ def _process_single_file(
     ffmpeg_path: str,
     conversion_semaphore: Semaphore | None,
     resample_quality: str,
+    metadata_index: WavMetadataIndex | None = None,
+    input_metadata: WavMetadata | None = None,
+    input_stat: FileStat | None = None,
+    link_mode: LinkMode = "copy",
+    fsync_policy: FsyncPolicy = "off",
+    conversion_pool: TimeoutProcessPool | None = None,
+    conversion_timeout: float | None = None,
+    defer_conversion: bool = False,
+    cancel_token: CancellationToken | None = None,
+    progress: FileProgress | None = None,
 ) -> WorkerOutcome:
     input_path = Path(input_path_str)
     output_path = Path(output_path_str)
+    if cancel_token is not None and cancel_token.cancelled:
+        return _cancelled_outcome(output_path)
 
     try:
         if in_place:
-            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                temp_path = Path(temp_file.name)
+            # Keep the temp beside the output so the swap is a same-filesystem rename; the
+            # suffix keeps it out of a scan that is still walking this folder.
+            temp_descriptor, temp_name = tempfile.mkstemp(
+                prefix=f".{output_path.name}.{os.getpid()}.",
+                suffix=_IN_PLACE_TEMP_SUFFIX,
+                dir=output_path.parent,
+            )
+            os.close(temp_descriptor)
+            temp_path = Path(temp_name)
 
+            recover_header_journal(input_path)
+            # In-place outputs always use a real copy: a link to the input renamed over the
+            # input would replace the file with a link to itself.
+            keep_temp = False
             try:
                 result = _process_path(
                     input_path=input_path,
@@ -987,20 +1851,36 @@ def _process_single_file(
                     ffmpeg_path=ffmpeg_path,
                     conversion_semaphore=conversion_semaphore,
                     resample_quality=resample_quality,
+                    metadata_index=metadata_index,
+                    input_metadata=input_metadata,
+                    input_stat=input_stat,
+                    patch_in_place=True,
+                    conversion_pool=conversion_pool,
+                    conversion_timeout=conversion_timeout,
+                    defer_conversion=defer_conversion,
+                    cancel_token=cancel_token,
+                    progress=progress,
                 )
-                if result.action != RepairAction.REJECT:
-                    shutil.move(str(temp_path), str(output_path))
+                if result.conversion is not None:
+                    # The CPU lane converts into the temp and swaps it in afterwards.
+                    result.conversion.replace_path = output_path
+                    keep_temp = True
+                    return result
+                if result.action != RepairAction.REJECT and not result.patched_in_place:
+                    _swap_into_place(temp_path, output_path, fsync_policy)
                 return WorkerOutcome(
                     output_path=output_path,
                     action=result.action,
                     reason=result.reason,
                     warning_messages=result.warning_messages,
+                    materialization=result.materialization,
+                    predicted_cost=result.predicted_cost,
                 )
             finally:
-                if temp_path.exists():
+                if not keep_temp and temp_path.exists():
                     temp_path.unlink()
 
-        return _process_path(
+        outcome = _process_path(
             input_path=input_path,
             output_path=output_path,
             profile_name=profile_name,
@@ -1013,7 +1893,24 @@ def _process_single_file(
             ffmpeg_path=ffmpeg_path,
             conversion_semaphore=conversion_semaphore,
             resample_quality=resample_quality,
+            metadata_index=metadata_index,
+            input_metadata=input_metadata,
+            input_stat=input_stat,
+            link_mode=link_mode,
+            conversion_pool=conversion_pool,
+            conversion_timeout=conversion_timeout,
+            defer_conversion=defer_conversion,
+            cancel_token=cancel_token,
+            progress=progress,
         )
+        if fsync_policy == "each" and _wrote_output_data(outcome):
+            _fsync_outputs([output_path])
+        return outcome
+    except ProcessingCancelledError:
+        # Only raised once the output was being written; an in-place temp is already gone.
+        if not in_place:
+            _discard_partial_output(output_path)
+        return _cancelled_outcome(output_path)
     except Exception as exc:  # pragma: no cover - propagated into result/errors
         return WorkerOutcome(
             output_path=output_path,
@@ -1024,21 +1921,83 @@ def _process_single_file(
         )
 
 
+def _timed_call(task: Callable[..., WorkerOutcome], /, *args: Any, **kwargs: Any) -> WorkerOutcome:
+    started = time.perf_counter()
+    outcome = task(*args, **kwargs)
+    outcome.elapsed_s += time.perf_counter() - started
+    return outcome
+
+
+# A planned file: its input path, the I/O-lane call and its progress counters.
+_PlannedTask = tuple[Path, Callable[[], WorkerOutcome], FileProgress | None]
+# A finished task: input path, future, device pair (None from the CPU lane), progress.
+_CompletedTask = tuple[Path, Future[WorkerOutcome], DevicePair | None, FileProgress | None]
+
+
+def _provisional_cost(spec: InputFileSpec, size: int, request: ProcessRequest) -> float:
+    """Cost estimate for a file not yet opened; workers refine it once they parse it."""
+    if spec.metadata is None:
+        return predict_cost(size, RepairAction.PASS_THROUGH)
+    decision = decide_repair_action(
+        spec.metadata,
+        profile_name=request.profile,
+        allow_conversion=request.allow_conversion,
+        multichannel_policy=request.multichannel_policy,
+        sample_rate_policy=request.sample_rate_policy,
+        bit_depth_policy=request.bit_depth_policy,
+    )
+    return predict_cost(size, decision.action, metadata=spec.metadata, target=decision.target)
+
+
+def _spec_stat(spec: InputFileSpec) -> FileStat | None:
+    if spec.stat is not None:
+        return spec.stat
+    try:
+        return file_stat_from_result(spec.path.stat())
+    except OSError:
+        return None
+
+
+def _spec_size(spec: InputFileSpec) -> int:
+    stat = _spec_stat(spec)
+    return stat.size if stat is not None else 0
+
+
+def _plan_tasks(
+    input_specs: Iterable[InputFileSpec],
+    context: OutputPlanContext,
+    journal: ExportJournal | None = None,
+) -> Iterable[tuple[InputFileSpec, Path, JournalEntry | None]]:
+    """Pair each spec with its output path, biggest files first when the selection is known.
+
+    Paths are planned in selection order either way, so name conflicts resolve the same.
+    A streamed scan is consumed lazily in scan order. With a resumed ``journal``, files the
+    interrupted run already planned keep the output path it recorded.
+    """
+
+    def plan(spec: InputFileSpec) -> tuple[InputFileSpec, Path, JournalEntry | None]:
+        entry = journal.entry(spec.path) if journal is not None else None
+        if entry is not None:
+            return spec, entry.output_path, entry
+        return spec, plan_output_path(spec, context), None
+
+    planned = (plan(spec) for spec in input_specs)
+    if not isinstance(input_specs, list):
+        return planned
+    return sorted(planned, key=lambda task: _spec_size(task[0]), reverse=True)
+
+
 def _resolve_overwrite_policy(
     request: ProcessRequest,
     existing_items: set[str],
-    input_specs: list[InputFileSpec],
+    top_level_names: set[str],
     overwrite_resolver: OverwriteResolver,
 ) -> OverwritePolicy:
     policy = request.overwrite_policy
     if policy != "ask":
         return policy
 
-    has_conflict = any(
-        (spec.source_root.name if spec.source_root is not None else spec.path.name)
-        in existing_items
-        for spec in input_specs
-    )
+    has_conflict = not existing_items.isdisjoint(top_level_names)
 
     if not has_conflict:
         return "yes"
@@ -1048,19 +2007,36 @@ def _resolve_overwrite_policy(
     return "yes" if overwrite_resolver() else "no"
 
 
-def process_request(
-    request: ProcessRequest,
-    progress_callback: ProgressCallback = None,
-    overwrite_resolver: OverwriteResolver = None,
-    max_workers: int | None = None,
-) -> ProcessResult:
-    """Process selected files using thread-based workers with format-safe decisions."""
-    if not request.input_paths and not request.input_specs:
-        return ProcessResult(total=0, modified=0, copied=0)
+def _selected_roots(request: ProcessRequest) -> list[Path]:
+    """Files and folders the request selected, which bound what a sync may delete."""
+    roots = [Path(path).expanduser().resolve() for path in request.input_paths]
+    for spec in request.input_specs:
+        root = spec.source_root if spec.source_root is not None else spec.path
+        roots.append(Path(root).expanduser().resolve())
+    return roots
+
+
+def _prune_empty_parents(path: Path, stop: Path) -> None:
+    """Remove directories left empty above ``path``, up to but not including ``stop``."""
+    parent = path.parent
+    while parent != stop and stop in parent.parents:
+        try:
+            parent.rmdir()
+        except OSError:
+            return
+        parent = parent.parent
+
 
-    output_dir = request.output_dir.expanduser().resolve()
-    output_dir.mkdir(parents=True, exist_ok=True)
+def _top_level_name(spec: InputFileSpec) -> str:
+    return spec.source_root.name if spec.source_root is not None else spec.path.name
 
+
+def _request_input_specs(request: ProcessRequest) -> tuple[Iterable[InputFileSpec], set[str]]:
+    """Return the request's input specs and the names they occupy in the output folder.
+
+    With ``stream_inputs`` the specs are a lazy scan of ``input_paths`` so processing can
+    start before discovery finishes; the occupied names come from the selected roots.
+    """
     if request.input_specs:
         input_specs = [
             InputFileSpec(
@@ -1070,197 +2046,723 @@ def process_request(
                     if spec.source_root is not None
                     else None
                 ),
+                stat=spec.stat,
+                metadata=spec.metadata,
             )
             for spec in request.input_specs
         ]
-    else:
-        normalized_inputs = [Path(path).expanduser().resolve() for path in request.input_paths]
-        if request.batch_mode:
-            source_root = safe_common_parent(normalized_inputs)
-            input_specs = [
-                InputFileSpec(path=path, source_root=source_root) for path in normalized_inputs
-            ]
-        else:
-            input_specs = [InputFileSpec(path=path, source_root=None) for path in normalized_inputs]
+        return input_specs, {_top_level_name(spec) for spec in input_specs}
 
-    existing_items = set(os.listdir(output_dir)) if output_dir.exists() else set()
+    if request.stream_inputs and not request.batch_mode:
+        return (
+            iter_input_specs(request.input_paths),
+            selected_top_level_names(request.input_paths),
+        )
 
-    overwrite_policy = _resolve_overwrite_policy(
-        request,
-        existing_items,
-        input_specs,
-        overwrite_resolver,
-    )
+    if request.stream_inputs:
+        # Batch mode nests everything under the common parent of all discovered files,
+        # which is only known once the scan completes.
+        scanned = scan_input_specs(request.input_paths)
+        if not scanned:
+            return [], set()
+        source_root = safe_common_parent([spec.path for spec in scanned])
+        input_specs = [
+            InputFileSpec(path=spec.path, source_root=source_root, stat=spec.stat)
+            for spec in scanned
+        ]
+        return input_specs, {_top_level_name(spec) for spec in input_specs}
 
-    context = OutputPlanContext(
-        output_dir=output_dir,
-        overwrite_policy=overwrite_policy,
-        existing_items=existing_items,
-    )
+    normalized_inputs = [Path(path).expanduser().resolve() for path in request.input_paths]
+    if not normalized_inputs:
+        return [], set()
+    if request.batch_mode:
+        source_root = safe_common_parent(normalized_inputs)
+        input_specs = [
+            InputFileSpec(path=path, source_root=source_root) for path in normalized_inputs
+        ]
+    else:
+        input_specs = [InputFileSpec(path=path, source_root=None) for path in normalized_inputs]
+    return input_specs, {_top_level_name(spec) for spec in input_specs}
+
+
+class ProcessingSession:
+    """Run a processing request, yielding a ``FileOutcome`` for each file as it completes.
+
+    Iterating drives the run; progress events are emitted along the way. Once iteration
+    finishes, ``result`` holds a summary-only ``ProcessResult`` with counts but no per-file
+    lists, so memory stays flat however many files are processed.
+
+    Setting ``cancel_token`` stops the run early: no new files start, files in progress
+    stop at their next chunk or block and discard their partial output, and ``result`` is
+    marked ``cancelled`` with counts for the files that did finish.
+    """
+
+    def __init__(
+        self,
+        request: ProcessRequest,
+        progress_callback: ProgressCallback = None,
+        overwrite_resolver: OverwriteResolver = None,
+        max_workers: int | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> None:
+        self.request = request
+        self.progress_callback = progress_callback
+        self.overwrite_resolver = overwrite_resolver
+        self.max_workers = max_workers
+        self.cancel_token = cancel_token
+        self.result: ProcessResult | None = None
+
+    def __iter__(self) -> Iterator[FileOutcome]:
+        summary = ProcessResult(total=0, modified=0, copied=0)
+        yield from self._run(summary)
+        self.result = summary
+
+    def _emit(self, event: ProgressEvent) -> None:
+        if self.progress_callback:
+            self.progress_callback(event)
+
+    def _run(self, summary: ProcessResult) -> Iterator[FileOutcome]:
+        request = self.request
+        if not request.input_paths and not request.input_specs:
+            return
 
-    input_path_keys = {spec.path: _normalized_path_key(spec.path) for spec in input_specs}
-    tasks: list[tuple[Path, Path, bool]] = []
-    created_dirs: set[Path] = set()
-    for file_spec in input_specs:
-        output_path = plan_output_path(file_spec, context)
-        output_parent = output_path.parent
-        if output_parent not in created_dirs:
-            output_parent.mkdir(parents=True, exist_ok=True)
-            created_dirs.add(output_parent)
-        in_place = input_path_keys[file_spec.path] == _normalized_path_key(output_path)
-        tasks.append((file_spec.path, output_path, in_place))
-
-    performance_config = resolve_performance_config(
-        request.performance_mode,
-        max_workers_override=max_workers,
-    )
-    workers = performance_config.worker_count
-    conversion_semaphore = Semaphore(performance_config.conversion_slots)
+        # An empty selection ends the run before the output folder is prompted about or made.
+        input_specs, top_level_names = _request_input_specs(request)
+        if isinstance(input_specs, list):
+            if not input_specs:
+                return
+        else:
+            scanned_specs = iter(input_specs)
+            first_spec = next(scanned_specs, None)
+            if first_spec is None:
+                return
+            input_specs = itertools.chain((first_spec,), scanned_specs)
+
+        output_dir = request.output_dir.expanduser().resolve()
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        existing_items = set(os.listdir(output_dir)) if output_dir.exists() else set()
+
+        journal, resuming = self._open_journal(output_dir)
+        settings = settings_hash(request)
+        stored_policy = journal.overwrite_policy() if journal is not None and resuming else None
+        if stored_policy is not None:
+            # The existing outputs are an earlier run's own; do not ask about them again.
+            overwrite_policy = stored_policy
+        else:
+            overwrite_policy = _resolve_overwrite_policy(
+                request,
+                existing_items,
+                top_level_names,
+                self.overwrite_resolver,
+            )
+        if journal is not None and (not resuming or request.sync):
+            journal.begin(request, overwrite_policy, keep_files=request.sync)
 
-    modified = 0
-    copied = 0
-    errors: list[str] = []
-    outputs: list[Path] = []
+        context = OutputPlanContext(
+            output_dir=output_dir,
+            overwrite_policy=overwrite_policy,
+            existing_items=existing_items,
+        )
+        if journal is not None and resuming:
+            context.root_aliases.update(journal.root_aliases())
 
-    unchanged = 0
-    header_fixed = 0
-    converted = 0
-    rejected = 0
-    warnings: list[str] = []
-    unchanged_files: list[Path] = []
-    header_fixed_files: list[Path] = []
-    converted_files: list[Path] = []
-    rejected_files: list[Path] = []
+        performance_config = resolve_performance_config(
+            request.performance_mode,
+            max_workers_override=self.max_workers,
+        )
+        cancel_token = self.cancel_token
+        workers = performance_config.worker_count
+        conversion_slots = performance_config.conversion_slots
+        tuner = _open_tuner(performance_config)
+        # Lanes are sized for the largest limit the tuner may pick; the limits gate dispatch.
+        _, max_workers = performance_config.worker_bounds or (workers, workers)
+        _, max_slots = performance_config.slot_bounds or (conversion_slots, conversion_slots)
+
+        # Keep only a few tasks queued per worker so memory stays flat for huge selections.
+        # Conversions leave the I/O window once routed, so a conversion backlog never holds
+        # up copies; the backlog has its own, larger bound.
+        submit_window = max(1, max_workers * _SUBMIT_WINDOW_PER_WORKER)
+        conversion_backlog = max(submit_window, max_slots * _CONVERSION_BACKLOG_PER_SLOT)
+        # Planned files wait here until both their source and destination device have room;
+        # the worker limit (or the tuner's) caps how many run across all devices.
+        device_queue: DeviceQueue[_PlannedTask] = DeviceQueue()
+        io_in_flight = 0
+        io_running = 0
+        cpu_in_flight = 0
+        cpu_running = 0
+        # Routed conversions wait here, longest predicted first, until a CPU slot frees up.
+        conversion_queue: list[tuple[float, int, Path, ConversionJob]] = []
+        conversion_order = itertools.count()
+        # Finished tasks carry their device pair from the I/O lane, None from the CPU lane.
+        completed: SimpleQueue[_CompletedTask] = SimpleQueue()
+        # Progress events are only worth their bookkeeping when someone listens.
+        tracker = ProgressTracker() if self.progress_callback is not None else None
+        output_devices: dict[Path, int] = {}
+        # Folders already cleared of temps that crashed in-place rewrites left behind.
+        swept_dirs: set[Path] = set()
+        # Selected roots this run found files under; only those may lose orphaned outputs,
+        # so an unmounted or emptied source never wipes its mirror.
+        orphan_roots = (
+            set(_selected_roots(request)) if request.sync and request.delete_orphans else set()
+        )
+        populated_roots: set[Path] = set()
+        pending_sync: list[Path] = []
+        metadata_index = open_metadata_index(request.metadata_index_path)
+        conversion_cache = open_conversion_cache(
+            request.conversion_cache_path, max_bytes=request.conversion_cache_max_bytes
+        )
+        conversion_pool = _open_conversion_pool(
+            request.conversion_engine,
+            slots=max_slots,
+            timeout=request.conversion_timeout,
+            native_threads=performance_config.native_threads,
+        )
+        if tuner is not None:
+            self._emit_tuning(tuner, "Auto performance: starting with")
+        try:
+            with (
+                _native_thread_limits(performance_config.native_threads) as thread_control,
+                ThreadPoolExecutor(max_workers=max_workers) as io_lane,
+                ThreadPoolExecutor(max_workers=max_slots) as cpu_lane,
+            ):
+                summary.thread_budget = _describe_thread_budget(performance_config, thread_control)
+
+                def dispatch_io() -> None:
+                    nonlocal io_running
+                    limit = workers if tuner is None else tuner.io_limit
+                    while io_running < limit:
+                        ready = device_queue.pop_ready()
+                        if ready is None:
+                            return
+                        (source, task, progress), devices = ready
+                        future = io_lane.submit(_timed_call, task)
+                        future.add_done_callback(
+                            lambda done, source=source, devices=devices, progress=progress: (
+                                completed.put((source, done, devices, progress))
+                            )
+                        )
+                        io_running += 1
+
+                def dispatch_conversions() -> None:
+                    nonlocal cpu_running
+                    slots = conversion_slots if tuner is None else tuner.cpu_limit
+                    while cpu_running < slots and conversion_queue:
+                        _, _, source, job = heapq.heappop(conversion_queue)
+                        future = cpu_lane.submit(
+                            _timed_call,
+                            _run_conversion_job,
+                            job,
+                            conversion_pool=conversion_pool,
+                            conversion_timeout=request.conversion_timeout,
+                            fsync_policy=request.fsync_policy,
+                            cancel_token=cancel_token,
+                            conversion_cache=conversion_cache,
+                        )
+                        future.add_done_callback(
+                            lambda converted, source=source, progress=job.progress: completed.put(
+                                (source, converted, None, progress)
+                            )
+                        )
+                        cpu_running += 1
+
+                def drop_pending() -> None:
+                    """After cancellation: forget files that have not started yet."""
+                    nonlocal io_in_flight, cpu_in_flight
+                    dropped = [progress for _, _, progress in device_queue.clear()]
+                    for _, _, _, job in conversion_queue:
+                        if job.replace_path is not None:
+                            _discard_partial_output(job.output_path)
+                        dropped.append(job.progress)
+                    io_in_flight -= len(dropped) - len(conversion_queue)
+                    cpu_in_flight -= len(conversion_queue)
+                    summary.total -= len(dropped)
+                    conversion_queue.clear()
+                    if tracker is not None:
+                        for progress in dropped:
+                            if progress is not None:
+                                tracker.drop(progress)
+
+                def take() -> FileOutcome | None:
+                    """Collect one finished task; returns None when there is nothing to report."""
+                    nonlocal io_in_flight, io_running, cpu_in_flight, cpu_running
+                    source, done, devices, progress = self._next_completed(completed, tracker)
+                    outcome = done.result()
+                    if devices is None:
+                        cpu_in_flight -= 1
+                        cpu_running -= 1
+                    else:
+                        io_in_flight -= 1
+                        io_running -= 1
+                        device_queue.release(devices)
+                    job = outcome.conversion
+                    if tuner is not None and not outcome.cancelled:
+                        # Routed files only finished their I/O part; count them in the CPU lane.
+                        lane = "cpu" if devices is None else "io"
+                        cost = 0.0 if job is not None else outcome.predicted_cost or 0.0
+                        if tuner.record(lane, cost):
+                            self._emit_tuning(tuner, "Auto performance: now using")
+                    if job is not None:
+                        job.elapsed_s = outcome.elapsed_s
+                        entry = (-job.predicted_cost, next(conversion_order), source, job)
+                        heapq.heappush(conversion_queue, entry)
+                        cpu_in_flight += 1
+                    if tracker is not None and progress is not None:
+                        if outcome.cancelled:
+                            tracker.drop(progress)
+                        elif job is not None:
+                            progress.lane = "cpu"
+                            progress.cost = job.predicted_cost
+                        else:
+                            tracker.finish(progress, outcome.predicted_cost)
+                    if cancel_token is not None and cancel_token.cancelled:
+                        drop_pending()
+                    dispatch_io()
+                    dispatch_conversions()
+                    if tracker is not None and tracker.due():
+                        self._emit_progress(tracker)
+                    if job is not None:
+                        return None
+                    if outcome.cancelled:
+                        # Partial output is gone; the file counts as never started.
+                        summary.total -= 1
+                        return None
+                    record = self._complete(summary, source, outcome, pending_sync)
+                    if journal is not None and outcome.error is None:
+                        journal.record_done(source, outcome.action, outcome.output_path)
+                    return record
+
+                planned_tasks = _plan_tasks(input_specs, context, journal if resuming else None)
+                for file_spec, output_path, entry in planned_tasks:
+                    if cancel_token is not None and cancel_token.cancelled:
+                        break
+                    if len(populated_roots) < len(orphan_roots):
+                        spec_root = file_spec.source_root or file_spec.path
+                        if spec_root in orphan_roots:
+                            populated_roots.add(spec_root)
+                        else:
+                            populated_roots.update(
+                                root for root in orphan_roots if file_spec.path.is_relative_to(root)
+                            )
+                    input_stat = _spec_stat(file_spec)
+                    # A sync checks outputs by stat alone so a no-change run only walks the tree.
+                    if entry is not None and entry.is_complete(
+                        input_stat, settings, verify_content=not request.sync
+                    ):
+                        summary.skipped += 1
+                        if journal is not None:
+                            journal.mark_seen(file_spec.path)
+                        continue
+                    output_parent = output_path.parent
+                    output_device = output_devices.get(output_parent)
+                    if output_device is None:
+                        output_parent.mkdir(parents=True, exist_ok=True)
+                        output_device = output_parent.stat().st_dev
+                        output_devices[output_parent] = output_device
+                    progress = None
+                    if tracker is not None:
+                        size = input_stat.size if input_stat is not None else 0
+                        progress = FileProgress(size, _provisional_cost(file_spec, size, request))
+                        tracker.start(progress)
+                    # Only an existing output can alias its input; skip resolving new paths.
+                    in_place = output_path.exists() and _normalized_path_key(
+                        file_spec.path
+                    ) == _normalized_path_key(output_path)
+                    if in_place and output_parent not in swept_dirs:
+                        swept_dirs.add(output_parent)
+                        sweep_in_place_temps(output_parent)
+                    if journal is not None:
+                        if entry is not None and entry.action is None and not in_place:
+                            # The interrupted run may have left this output half written.
+                            _discard_partial_output(output_path)
+                        source_root = file_spec.source_root
+                        alias = context.root_aliases.get(source_root) if source_root else None
+                        journal.record_planned(
+                            file_spec.path,
+                            output_path,
+                            input_stat,
+                            settings,
+                            in_place=in_place,
+                            root=(source_root, alias) if source_root and alias else None,
+                        )
+                    task = partial(
+                        _process_single_file,
+                        input_path_str=str(file_spec.path),
+                        output_path_str=str(output_path),
+                        in_place=in_place,
+                        profile_name=request.profile,
+                        allow_conversion=request.allow_conversion,
+                        multichannel_policy=request.multichannel_policy,
+                        metadata_policy=request.metadata_policy,
+                        sample_rate_policy=request.sample_rate_policy,
+                        bit_depth_policy=request.bit_depth_policy,
+                        converter_backend=request.converter_backend,
+                        ffmpeg_path=request.ffmpeg_path,
+                        conversion_semaphore=None,
+                        resample_quality=performance_config.resample_quality,
+                        metadata_index=metadata_index,
+                        input_metadata=file_spec.metadata,
+                        input_stat=file_spec.stat,
+                        link_mode=request.link_mode,
+                        fsync_policy=request.fsync_policy,
+                        conversion_pool=conversion_pool,
+                        conversion_timeout=request.conversion_timeout,
+                        defer_conversion=True,
+                        cancel_token=cancel_token,
+                        progress=progress,
+                    )
+                    # An unreadable source still goes through a worker, which reports it.
+                    device_queue.push(
+                        (file_spec.path, task, progress),
+                        source_device=input_stat.device if input_stat is not None else 0,
+                        destination_device=output_device,
+                        inode=input_stat.inode if input_stat is not None else 0,
+                    )
+                    summary.total += 1
+                    io_in_flight += 1
+                    dispatch_io()
+
+                    while (
+                        io_in_flight >= submit_window
+                        or cpu_in_flight >= conversion_backlog
+                        or not completed.empty()
+                    ):
+                        record = take()
+                        if record is not None:
+                            yield record
+
+                if cancel_token is not None and cancel_token.cancelled:
+                    drop_pending()
+                while io_in_flight or cpu_in_flight:
+                    record = take()
+                    if record is not None:
+                        yield record
+            _fsync_outputs(pending_sync)
+            cancelled = cancel_token is not None and cancel_token.cancelled
+            if journal is not None and request.sync and not cancelled:
+                if request.delete_orphans:
+                    self._delete_orphans(journal, summary, output_dir, populated_roots)
+                journal.finish()
+        finally:
+            if conversion_pool is not None:
+                conversion_pool.close()
+            if metadata_index is not None:
+                metadata_index.close()
+            if conversion_cache is not None:
+                conversion_cache.close()
+            if journal is not None:
+                journal.close()
+
+        if tracker is not None:
+            self._emit_progress(tracker)
+        if summary.skipped:
+            if request.sync:
+                message = f"Skipped {summary.skipped} file(s) unchanged since the last sync."
+            else:
+                message = f"Skipped {summary.skipped} file(s) the interrupted export completed."
+            self._emit(ProgressEvent(kind="journal", message=message))
+        if cancel_token is not None and cancel_token.cancelled:
+            summary.cancelled = True
+            self._emit(ProgressEvent(kind="cancelled", message="Cancelled."))
+            return
+        if journal is not None and not request.sync:
+            # Every file finished (or failed with an error to report); nothing is left to resume.
+            journal.discard()
+        self._emit(ProgressEvent(kind="done", message="Done!"))
+
+    def _open_journal(self, output_dir: Path) -> tuple[ExportJournal | None, bool]:
+        """Open the export journal if requested; the flag is True when this run resumes it."""
+        request = self.request
+        if not (request.journal or request.resume or request.sync):
+            return None, False
+        journal = open_export_journal(output_dir)
+        if journal is None:
+            message = f"Could not open the export journal in {output_dir}; it cannot be resumed."
+            self._emit(ProgressEvent(kind="journal", message=message))
+            return None, False
+        if request.sync:
+            # Per-file settings hashes decide what a sync redoes, so any manifest is usable.
+            if not journal.has_run():
+                return journal, False
+            message = f"Syncing against the manifest in {output_dir}."
+            self._emit(ProgressEvent(kind="journal", message=message))
+            return journal, True
+        if not request.resume:
+            return journal, False
+        if journal.matches(request):
+            message = f"Resuming the interrupted export in {output_dir}."
+            self._emit(ProgressEvent(kind="journal", message=message))
+            return journal, True
+        if journal.has_run():
+            message = "The export journal was written with different settings; redoing every file."
+        else:
+            message = f"No export journal in {output_dir}; processing every file."
+        self._emit(ProgressEvent(kind="journal", message=message))
+        return journal, False
+
+    def _delete_orphans(
+        self,
+        journal: ExportJournal,
+        summary: ProcessResult,
+        output_dir: Path,
+        populated_roots: set[Path],
+    ) -> None:
+        """Delete outputs of earlier syncs whose source was removed from the selected inputs.
+
+        Only sources under a selected root this run found files in are considered: a root
+        that is missing or empty is more likely unmounted than emptied. Outputs changed
+        since they were written are no longer the sync's to delete; their entries are
+        dropped all the same, while an output that could not be deleted keeps its entry.
+        """
+        for root in dict.fromkeys(_selected_roots(self.request)):
+            if root not in populated_roots:
+                message = f"Not deleting orphaned outputs of {root}: no files were found there."
+                self._emit(ProgressEvent(kind="journal", message=message, path=root))
+        forgotten: list[Path] = []
+        for entry in journal.unseen_entries():
+            source = entry.input_path
+            if not any(source.is_relative_to(root) for root in populated_roots):
+                continue
+            if source.exists():
+                continue
+            if entry.output_unchanged():
+                try:
+                    entry.output_path.unlink()
+                except OSError:
+                    continue
+                _prune_empty_parents(entry.output_path, output_dir)
+                summary.deleted += 1
+                self._emit(
+                    ProgressEvent(
+                        kind="delete",
+                        message=f"Deleted orphaned output: {entry.output_path}",
+                        path=entry.output_path,
+                    )
+                )
+            forgotten.append(source)
+        journal.forget(forgotten)
+
+    def _next_completed(
+        self,
+        completed: SimpleQueue[_CompletedTask],
+        tracker: ProgressTracker | None,
+    ) -> _CompletedTask:
+        # Wake up between completions so long files still report progress.
+        if tracker is None:
+            return completed.get()
+        while True:
+            try:
+                return completed.get(timeout=tracker.interval_s)
+            except Empty:
+                self._emit_progress(tracker)
+
+    def _emit_progress(self, tracker: ProgressTracker) -> None:
+        snapshot = tracker.snapshot()
+        self._emit(
+            ProgressEvent(kind="progress", message=format_progress(snapshot), snapshot=snapshot)
+        )
 
-    def _emit(event: ProgressEvent) -> None:
-        if progress_callback:
-            progress_callback(event)
+    def _emit_tuning(self, tuner: ConcurrencyTuner, prefix: str) -> None:
+        message = f"{prefix} {tuner.io_limit} I/O workers, {tuner.cpu_limit} conversion slots"
+        if tuner.last_iowait is not None:
+            message += f" (iowait {tuner.last_iowait:.0%})"
+        self._emit(
+            ProgressEvent(
+                kind="tuning",
+                message=message,
+                worker_count=tuner.io_limit,
+                conversion_slots=tuner.cpu_limit,
+            )
+        )
 
-    def _collect_result(outcome: WorkerOutcome) -> None:
-        nonlocal modified, copied, unchanged, header_fixed, converted, rejected
+    def _complete(
+        self,
+        summary: ProcessResult,
+        input_path: Path,
+        outcome: WorkerOutcome,
+        pending_sync: list[Path],
+    ) -> FileOutcome:
+        # Batched fsync: flush outputs in groups so each directory is synced once per batch.
+        if self.request.fsync_policy == "batch" and _wrote_output_data(outcome):
+            pending_sync.append(outcome.output_path)
+            if len(pending_sync) >= _FSYNC_BATCH_SIZE:
+                _fsync_outputs(pending_sync)
+                pending_sync.clear()
+        return self._record(summary, input_path, outcome)
+
+    def _record(
+        self,
+        summary: ProcessResult,
+        input_path: Path,
+        outcome: WorkerOutcome,
+    ) -> FileOutcome:
+        output_path = outcome.output_path
+        record = FileOutcome(
+            input_path=input_path,
+            output_path=output_path,
+            action=outcome.action,
+            reason=outcome.reason,
+            warnings=outcome.warning_messages,
+            error=outcome.error,
+            materialization=outcome.materialization,
+            predicted_cost=outcome.predicted_cost,
+            elapsed_s=outcome.elapsed_s,
+        )
+        if outcome.predicted_cost is not None:
+            summary.predicted_cost += outcome.predicted_cost
+        summary.worker_seconds += outcome.elapsed_s
 
         if outcome.error is not None:
-            message = f"{outcome.output_path}: {outcome.error}"
-            errors.append(message)
-            rejected += 1
-            rejected_files.append(outcome.output_path)
-            _emit(
+            summary.error_count += 1
+            summary.rejected += 1
+            self._emit(
                 ProgressEvent(
                     kind="error",
-                    message=f"Error while processing file: {outcome.output_path} ({outcome.error})",
-                    path=outcome.output_path,
+                    message=f"Error while processing file: {output_path} ({outcome.error})",
+                    path=output_path,
                 )
             )
-            return
+            return record
 
         for warning in outcome.warning_messages:
-            warning_message = f"{outcome.output_path}: {warning}"
-            warnings.append(warning_message)
-            _emit(
+            summary.warning_count += 1
+            self._emit(
                 ProgressEvent(
                     kind="warning",
-                    message=f"Warning: {warning_message}",
-                    path=outcome.output_path,
+                    message=f"Warning: {output_path}: {warning}",
+                    path=output_path,
                 )
             )
 
         if outcome.action == RepairAction.REJECT:
-            rejected += 1
-            rejected_files.append(outcome.output_path)
-            warnings.append(f"{outcome.output_path}: rejected - {outcome.reason}")
-            _emit(
+            summary.rejected += 1
+            summary.warning_count += 1
+            self._emit(
                 ProgressEvent(
                     kind="reject",
-                    message=f"Rejected: {outcome.output_path} ({outcome.reason})",
-                    path=outcome.output_path,
+                    message=f"Rejected: {output_path} ({outcome.reason})",
+                    path=output_path,
                 )
             )
-            return
-
-        outputs.append(outcome.output_path)
+            return record
 
         if outcome.action == RepairAction.PASS_THROUGH:
-            unchanged += 1
-            unchanged_files.append(outcome.output_path)
-            copied += 1
-            _emit(
-                ProgressEvent(
-                    kind="file",
-                    message=f"Unchanged copy: {outcome.output_path}",
-                    path=outcome.output_path,
-                )
-            )
-            return
+            summary.unchanged += 1
+            summary.copied += 1
+            if outcome.materialization is not None:
+                counts = summary.materializations
+                counts[outcome.materialization] = counts.get(outcome.materialization, 0) + 1
+            message = f"Unchanged copy: {output_path}"
+        elif outcome.action == RepairAction.HEADER_FIX:
+            summary.header_fixed += 1
+            summary.modified += 1
+            message = f"Header fixed: {output_path}"
+        elif outcome.action == RepairAction.CONVERT:
+            summary.converted += 1
+            summary.modified += 1
+            message = f"Converted: {output_path}"
+            if outcome.cache_hit:
+                summary.conversion_cache_hits += 1
+                message += " (from conversion cache)"
+            elif outcome.cache_hit is not None:
+                summary.conversion_cache_misses += 1
+        else:
+            summary.error_count += 1
+            return record
 
-        if outcome.action == RepairAction.HEADER_FIX:
-            header_fixed += 1
-            header_fixed_files.append(outcome.output_path)
-            modified += 1
-            _emit(
-                ProgressEvent(
-                    kind="file",
-                    message=f"Header fixed: {outcome.output_path}",
-                    path=outcome.output_path,
-                )
-            )
-            return
+        self._emit(ProgressEvent(kind="file", message=message, path=output_path))
+        return record
 
-        if outcome.action == RepairAction.CONVERT:
-            converted += 1
-            converted_files.append(outcome.output_path)
-            modified += 1
-            _emit(
-                ProgressEvent(
-                    kind="file",
-                    message=f"Converted: {outcome.output_path}",
-                    path=outcome.output_path,
-                )
-            )
-            return
 
-        errors.append(f"{outcome.output_path}: unhandled action {outcome.action}")
-
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = [
-            executor.submit(
-                _process_single_file,
-                input_path_str=str(input_path),
-                output_path_str=str(output_path),
-                in_place=in_place,
-                profile_name=request.profile,
-                allow_conversion=request.allow_conversion,
-                multichannel_policy=request.multichannel_policy,
-                metadata_policy=request.metadata_policy,
-                sample_rate_policy=request.sample_rate_policy,
-                bit_depth_policy=request.bit_depth_policy,
-                converter_backend=request.converter_backend,
-                ffmpeg_path=request.ffmpeg_path,
-                conversion_semaphore=conversion_semaphore,
-                resample_quality=performance_config.resample_quality,
-            )
-            for input_path, output_path, in_place in tasks
-        ]
+def outcome_warning_lines(outcome: FileOutcome) -> list[str]:
+    """Format an outcome's warnings the way ``ProcessResult.warnings`` lists them."""
+    if outcome.error is not None:
+        return []
+    lines = [f"{outcome.output_path}: {warning}" for warning in outcome.warnings]
+    if outcome.action == RepairAction.REJECT:
+        lines.append(f"{outcome.output_path}: rejected - {outcome.reason}")
+    return lines
 
-        for future in as_completed(futures):
-            _collect_result(future.result())
-
-    result = ProcessResult(
-        total=len(tasks),
-        modified=modified,
-        copied=copied,
-        errors=errors,
-        outputs=outputs,
-        unchanged=unchanged,
-        header_fixed=header_fixed,
-        converted=converted,
-        rejected=rejected,
-        warnings=warnings,
-        unchanged_files=unchanged_files,
-        header_fixed_files=header_fixed_files,
-        converted_files=converted_files,
-        rejected_files=rejected_files,
+
+def process_request_iter(
+    request: ProcessRequest,
+    progress_callback: ProgressCallback = None,
+    overwrite_resolver: OverwriteResolver = None,
+    max_workers: int | None = None,
+    cancel_token: CancellationToken | None = None,
+) -> ProcessingSession:
+    """Start a processing run that yields per-file outcomes as they complete.
+
+    Iterate the returned session to drive the run, then read ``session.result`` for the
+    summary counts.
+    """
+    return ProcessingSession(
+        request,
+        progress_callback=progress_callback,
+        overwrite_resolver=overwrite_resolver,
+        max_workers=max_workers,
+        cancel_token=cancel_token,
     )
 
-    _emit(ProgressEvent(kind="done", message="Done!"))
 
+def process_request(
+    request: ProcessRequest,
+    progress_callback: ProgressCallback = None,
+    overwrite_resolver: OverwriteResolver = None,
+    max_workers: int | None = None,
+    cancel_token: CancellationToken | None = None,
+) -> ProcessResult:
+    """Process selected files using thread-based workers with format-safe decisions.
+
+    Collects every per-file outcome into the result lists; use ``process_request_iter``
+    to consume outcomes incrementally on very large batches. A cancelled run returns the
+    files finished so far, with ``cancelled`` set.
+    """
+    session = process_request_iter(
+        request,
+        progress_callback=progress_callback,
+        overwrite_resolver=overwrite_resolver,
+        max_workers=max_workers,
+        cancel_token=cancel_token,
+    )
+    outputs: list[Path] = []
+    errors: list[str] = []
+    warnings: list[str] = []
+    unchanged_files: list[Path] = []
+    header_fixed_files: list[Path] = []
+    converted_files: list[Path] = []
+    rejected_files: list[Path] = []
+
+    for outcome in session:
+        output_path = outcome.output_path
+        if outcome.error is not None:
+            errors.append(f"{output_path}: {outcome.error}")
+            rejected_files.append(output_path)
+            continue
+
+        warnings.extend(outcome_warning_lines(outcome))
+
+        if outcome.action == RepairAction.REJECT:
+            rejected_files.append(output_path)
+            continue
+
+        if outcome.action == RepairAction.PASS_THROUGH:
+            unchanged_files.append(output_path)
+        elif outcome.action == RepairAction.HEADER_FIX:
+            header_fixed_files.append(output_path)
+        elif outcome.action == RepairAction.CONVERT:
+            converted_files.append(output_path)
+        else:
+            errors.append(f"{output_path}: unhandled action {outcome.action}")
+            continue
+        outputs.append(output_path)
+
+    result = session.result or ProcessResult(total=0, modified=0, copied=0)
+    result.outputs = outputs
+    result.errors = errors
+    result.warnings = warnings
+    result.unchanged_files = unchanged_files
+    result.header_fixed_files = header_fixed_files
+    result.converted_files = converted_files
+    result.rejected_files = rejected_files
     return result
@@ -0,0 +1,151 @@
+"""Byte, frame and throughput accounting behind throttled ``progress`` events."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .models import ProgressSnapshot
+from .tuning import Lane
+
+_LANES: tuple[Lane, ...] = ("io", "cpu")
+
+
+@dataclass(slots=True, eq=False)
+class FileProgress:
+    """Counters the worker handling one file advances as it reads and writes.
+
+    Only that worker writes them and the session only reads them, so no lock is needed.
+    ``cost`` starts as the session's estimate and is replaced by the worker's prediction
+    once the file's action is known.
+    """
+
+    size: int
+    cost: float
+    lane: Lane = "io"
+    bytes_read: int = 0
+    bytes_written: int = 0
+    frames: int = 0
+
+    def add(self, *, read: int = 0, written: int = 0, frames: int = 0) -> None:
+        self.bytes_read += read
+        self.bytes_written += written
+        self.frames += frames
+
+    def copied(self, byte_count: int) -> None:
+        self.add(read=byte_count, written=byte_count)
+
+    @property
+    def fraction_done(self) -> float:
+        if self.size <= 0:
+            return 0.0
+        return min(1.0, self.bytes_read / self.size)
+
+
+class ProgressTracker:
+    """Fold per-file counters into snapshots with rolling lane rates and a cost-model ETA.
+
+    The ETA divides the predicted cost still outstanding by the rate at which predicted
+    cost has been completed so far, counting files in progress by the share of their input
+    already read. Files a streamed scan has not reached yet are not included.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_s: float = 0.5,
+        window_s: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.interval_s = interval_s
+        self.window_s = window_s
+        self._clock = clock
+        self._started = clock()
+        self._last_emit: float | None = None
+        self._active: set[FileProgress] = set()
+        self._files_total = 0
+        self._files_done = 0
+        self._done_cost = 0.0
+        self._done_read: dict[Lane, int] = dict.fromkeys(_LANES, 0)
+        self._done_written = 0
+        self._done_frames = 0
+        self._samples: deque[tuple[float, dict[Lane, int]]] = deque()
+
+    def start(self, progress: FileProgress) -> None:
+        self._active.add(progress)
+        self._files_total += 1
+
+    def finish(self, progress: FileProgress, cost: float | None) -> None:
+        """Count a finished file at its final predicted cost."""
+        self._active.discard(progress)
+        self._files_done += 1
+        self._done_cost += cost if cost is not None else progress.cost
+        self._done_read[progress.lane] += progress.bytes_read
+        self._done_written += progress.bytes_written
+        self._done_frames += progress.frames
+
+    def drop(self, progress: FileProgress) -> None:
+        """Forget a file that will not finish (cancelled before or while it ran)."""
+        self._active.discard(progress)
+        self._files_total -= 1
+
+    def due(self) -> bool:
+        return self._last_emit is None or self._clock() - self._last_emit >= self.interval_s
+
+    def snapshot(self) -> ProgressSnapshot:
+        now = self._clock()
+        self._last_emit = now
+        read = dict(self._done_read)
+        written = self._done_written
+        frames = self._done_frames
+        done_cost = self._done_cost
+        outstanding_cost = 0.0
+        for progress in list(self._active):
+            read[progress.lane] += progress.bytes_read
+            written += progress.bytes_written
+            frames += progress.frames
+            share = progress.fraction_done
+            done_cost += progress.cost * share
+            outstanding_cost += progress.cost * (1.0 - share)
+
+        self._samples.append((now, read))
+        while len(self._samples) > 2 and now - self._samples[1][0] >= self.window_s:
+            self._samples.popleft()
+        oldest_time, oldest_read = self._samples[0]
+        span = now - oldest_time
+        lane_rates = {
+            lane: (read[lane] - oldest_read[lane]) / span / 1_000_000 if span > 0 else 0.0
+            for lane in _LANES
+        }
+
+        elapsed = now - self._started
+        eta_s = None
+        if done_cost > 0 and elapsed > 0:
+            eta_s = outstanding_cost / (done_cost / elapsed)
+        return ProgressSnapshot(
+            bytes_read=sum(read.values()),
+            bytes_written=written,
+            frames=frames,
+            files_done=self._files_done,
+            files_total=self._files_total,
+            lane_mb_per_s=lane_rates,
+            eta_s=eta_s,
+        )
+
+
+def format_progress(snapshot: ProgressSnapshot) -> str:
+    rates = ", ".join(
+        f"{lane} {rate:.1f} MB/s" for lane, rate in snapshot.lane_mb_per_s.items() if rate > 0
+    )
+    message = (
+        f"Progress: {snapshot.files_done}/{snapshot.files_total} files, "
+        f"{snapshot.bytes_read / 1_000_000:.1f} MB read"
+    )
+    if rates:
+        message += f" ({rates})"
+    if snapshot.eta_s is not None:
+        minutes, seconds = divmod(round(snapshot.eta_s), 60)
+        message += f", ETA {minutes}:{seconds:02d}"
+    return message
@@ -3,55 +3,205 @@
 from __future__ import annotations
 
 import os
-from collections.abc import Sequence
+from collections.abc import Generator, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from stat import S_ISDIR, S_ISREG
 
 from .constants import ACCEPTED_EXTENSIONS
-from .models import InputFileSpec
+from .models import FileStat, InputFileSpec
+
+_DEFAULT_SCAN_WORKERS = 16
+
+# Folder listings the walk keeps in flight per scan worker.
+_LOOK_AHEAD_PER_WORKER = 2
+
+_DirectoryListing = tuple[list[tuple[Path, FileStat | None]], list[Path]]
 
 
 def is_supported_file(path: Path | str) -> bool:
     return Path(path).suffix.lower() in ACCEPTED_EXTENSIONS
 
 
-def scan_input_specs(input_paths: Sequence[Path | str]) -> list[InputFileSpec]:
-    """Expand input paths into file specs preserving selected folder roots."""
-    discovered: list[InputFileSpec] = []
-    seen_indices: dict[Path, int] = {}
+def file_stat_from_result(stat_result: os.stat_result) -> FileStat:
+    return FileStat(
+        size=stat_result.st_size,
+        mtime_ns=stat_result.st_mtime_ns,
+        inode=stat_result.st_ino,
+        device=stat_result.st_dev,
+    )
+
+
+def _entry_stat(entry: os.DirEntry[str]) -> FileStat | None:
+    try:
+        stat_result = entry.stat()
+        inode = stat_result.st_ino or entry.inode()
+    except OSError:
+        return None
+    return FileStat(
+        size=stat_result.st_size,
+        mtime_ns=stat_result.st_mtime_ns,
+        inode=inode,
+        device=stat_result.st_dev,
+    )
+
+
+def _list_directory(directory: Path) -> _DirectoryListing:
+    files: list[tuple[Path, FileStat | None]] = []
+    subdirectories: list[Path] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    is_directory = entry.is_dir()
+                except OSError:
+                    is_directory = False
+                if is_directory:
+                    # Mirror os.walk(followlinks=False): list linked folders but don't descend.
+                    if not entry.is_symlink():
+                        subdirectories.append(directory / entry.name)
+                    continue
+                if entry.name.startswith("._") or not is_supported_file(entry.name):
+                    continue
+                files.append((directory / entry.name, _entry_stat(entry)))
+    except OSError:
+        pass
+    return files, subdirectories
+
+
+def _walk_tree(
+    source_root: Path,
+    executor: ThreadPoolExecutor,
+    *,
+    look_ahead: int,
+) -> Iterator[tuple[Path, FileStat | None]]:
+    """Yield files in os.walk top-down order while listing folders concurrently.
+
+    The pool lists the folders the walk reaches next, at most ``look_ahead`` of them ahead
+    of the consumer, so finished listings never pile up however large the tree is.
+    """
+    stack: list[Path | Future[_DirectoryListing]] = [source_root]
+    in_flight = 0
+    while stack:
+        for index in range(len(stack) - 1, -1, -1):
+            if in_flight >= look_ahead:
+                break
+            pending = stack[index]
+            if isinstance(pending, Path):
+                stack[index] = executor.submit(_list_directory, pending)
+                in_flight += 1
+        pending = stack.pop()
+        if isinstance(pending, Path):
+            # Out of look-ahead: the listings ahead are still being consumed.
+            files, subdirectories = _list_directory(pending)
+        else:
+            in_flight -= 1
+            files, subdirectories = pending.result()
+        yield from files
+        stack.extend(reversed(subdirectories))
+
 
+def _resolve_selection(raw_path: Path | str) -> tuple[Path, os.stat_result] | None:
+    selected_path = Path(raw_path).expanduser().resolve()
+    try:
+        selected_stat = selected_path.stat()
+    except OSError:
+        return None
+    if S_ISDIR(selected_stat.st_mode):
+        return selected_path, selected_stat
+    if not S_ISREG(selected_stat.st_mode):
+        return None
+    if selected_path.name.startswith("._") or not is_supported_file(selected_path):
+        return None
+    return selected_path, selected_stat
+
+
+def _folder_has_files(folder: Path) -> bool:
+    pending = [folder]
+    while pending:
+        files, subdirectories = _list_directory(pending.pop())
+        if files:
+            return True
+        pending.extend(subdirectories)
+    return False
+
+
+def selected_top_level_names(input_paths: Sequence[Path | str]) -> set[str]:
+    """Names that selected inputs occupy directly under an output folder.
+
+    A selected folder only occupies its name once it holds a supported file; the search
+    for one stops at the first it finds.
+    """
+    names: set[str] = set()
     for raw_path in input_paths:
-        selected_path = Path(raw_path).expanduser().resolve()
-        if not selected_path.exists():
+        selection = _resolve_selection(raw_path)
+        if selection is None:
             continue
-
-        if selected_path.is_file():
-            if selected_path.name.startswith("._") or not is_supported_file(selected_path):
-                continue
-            spec = InputFileSpec(path=selected_path, source_root=None)
-            if selected_path not in seen_indices:
-                discovered.append(spec)
-                seen_indices[selected_path] = len(discovered) - 1
+        selected_path, selected_stat = selection
+        if S_ISDIR(selected_stat.st_mode) and not _folder_has_files(selected_path):
             continue
+        names.add(selected_path.name)
+    return names
 
-        source_root = selected_path
-        for root_dir, _, files in os.walk(source_root):
-            for file_name in files:
-                if file_name.startswith("._"):
+
+def iter_input_specs(
+    input_paths: Sequence[Path | str],
+    *,
+    max_workers: int = _DEFAULT_SCAN_WORKERS,
+) -> Generator[InputFileSpec, None, None]:
+    """Yield input file specs as folders are discovered.
+
+    Only the selected roots are resolved; folders are listed concurrently with
+    ``os.scandir`` and each spec carries the directory entry's stat so later stages
+    do not need to stat the file again. A file selected both directly and through a
+    selected folder is yielded once, with the folder as its source root.
+    """
+    selections = [
+        selection
+        for selection in (_resolve_selection(raw_path) for raw_path in input_paths)
+        if selection is not None
+    ]
+    folder_roots = [path for path, stat_result in selections if S_ISDIR(stat_result.st_mode)]
+    # Duplicates are only possible across overlapping selections; a single folder walk
+    # skips the seen set so memory does not grow with the size of the tree.
+    track_seen = len(selections) > 1
+    seen: set[Path] = set()
+
+    workers = max(1, max_workers)
+    look_ahead = workers * _LOOK_AHEAD_PER_WORKER
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for selected_path, selected_stat in selections:
+            if not S_ISDIR(selected_stat.st_mode):
+                if selected_path in seen:
                     continue
-                candidate = (Path(root_dir) / file_name).resolve()
-                if not is_supported_file(candidate):
+                if any(root in selected_path.parents for root in folder_roots):
                     continue
+                seen.add(selected_path)
+                yield InputFileSpec(
+                    path=selected_path,
+                    source_root=None,
+                    stat=file_stat_from_result(selected_stat),
+                )
+                continue
+
+            for candidate, file_stat in _walk_tree(selected_path, executor, look_ahead=look_ahead):
+                if track_seen:
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                yield InputFileSpec(path=candidate, source_root=selected_path, stat=file_stat)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
-                spec = InputFileSpec(path=candidate, source_root=source_root)
-                index = seen_indices.get(candidate)
-                if index is None:
-                    discovered.append(spec)
-                    seen_indices[candidate] = len(discovered) - 1
-                elif discovered[index].source_root is None:
-                    # Prefer preserving structure if selected both directly and via folder.
-                    discovered[index] = spec
 
-    return discovered
+def scan_input_specs(
+    input_paths: Sequence[Path | str],
+    *,
+    max_workers: int = _DEFAULT_SCAN_WORKERS,
+) -> list[InputFileSpec]:
+    """Expand input paths into file specs preserving selected folder roots."""
+    return list(iter_input_specs(input_paths, max_workers=max_workers))
 
 
 def scan_inputs(input_paths: Sequence[Path | str]) -> list[Path]:
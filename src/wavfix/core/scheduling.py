@@ -0,0 +1,38 @@
+"""Per-file cost predictions used to run the longest jobs first."""
+
+from __future__ import annotations
+
+from .decisions import ConversionTarget
+from .models import RepairAction, WavMetadata
+
+# Costs are in "copied bytes": one unit is the work of copying one byte unchanged.
+# Opening and parsing a file costs about as much as copying this many bytes.
+_PER_FILE_OVERHEAD = 64 * 1024
+_ACTION_WEIGHTS: dict[RepairAction, float] = {
+    RepairAction.PASS_THROUGH: 1.0,
+    RepairAction.HEADER_FIX: 1.5,
+    RepairAction.CONVERT: 20.0,
+    RepairAction.REJECT: 0.0,
+}
+# Resampling roughly doubles conversion work per input byte, more when upsampling.
+_RESAMPLE_WEIGHT = 1.0
+
+
+def predict_cost(
+    size_bytes: int,
+    action: RepairAction,
+    *,
+    metadata: WavMetadata | None = None,
+    target: ConversionTarget | None = None,
+) -> float:
+    """Predict the work of processing one file from its size, action and conversion target."""
+    cost = size_bytes * _ACTION_WEIGHTS.get(action, 1.0)
+    if action == RepairAction.CONVERT and metadata is not None and target is not None:
+        input_rate = metadata.sample_rate or target.sample_rate
+        if input_rate != target.sample_rate:
+            cost *= 1.0 + _RESAMPLE_WEIGHT * max(1.0, target.sample_rate / input_rate)
+        input_channels = metadata.channels or target.channels
+        # Channel remapping touches every input channel once more per output channel.
+        if input_channels != target.channels:
+            cost *= 1.0 + target.channels / max(1, input_channels)
+    return cost + _PER_FILE_OVERHEAD
@@ -0,0 +1,168 @@
+"""CPU limit detection and live concurrency tuning for the ``auto`` performance mode."""
+
+from __future__ import annotations
+
+import math
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+Lane = Literal["io", "cpu"]
+
+_CGROUP_ROOT = Path("/sys/fs/cgroup")
+_PROC_STAT = Path("/proc/stat")
+# Changes smaller than this are treated as noise rather than a trend.
+_RATE_TOLERANCE = 0.05
+# Above this iowait share the disks, not the CPUs, limit conversions.
+_IOWAIT_CEILING = 0.3
+
+
+def _cgroup_v2_limit(root: Path) -> float | None:
+    try:
+        quota, period = (root / "cpu.max").read_text(encoding="ascii").split()[:2]
+    except (OSError, ValueError):
+        return None
+    if quota == "max":
+        return None
+    return int(quota) / int(period)
+
+
+def _cgroup_v1_limit(root: Path) -> float | None:
+    try:
+        quota = int((root / "cpu" / "cpu.cfs_quota_us").read_text(encoding="ascii"))
+        period = int((root / "cpu" / "cpu.cfs_period_us").read_text(encoding="ascii"))
+    except (OSError, ValueError):
+        return None
+    if quota <= 0 or period <= 0:
+        return None
+    return quota / period
+
+
+def usable_cpu_count(cgroup_root: Path = _CGROUP_ROOT) -> int:
+    """CPUs this process may actually use: affinity mask and cgroup quota, not host cores."""
+    if hasattr(os, "sched_getaffinity"):
+        count = len(os.sched_getaffinity(0))
+    else:  # pragma: no cover - macOS and Windows
+        count = os.cpu_count() or 4
+    quota = _cgroup_v2_limit(cgroup_root) or _cgroup_v1_limit(cgroup_root)
+    if quota is not None:
+        count = min(count, max(1, math.ceil(quota)))
+    return max(1, count)
+
+
+class IowaitSampler:
+    """Share of CPU time spent waiting on I/O since the previous sample (Linux only)."""
+
+    def __init__(self, stat_path: Path = _PROC_STAT) -> None:
+        self.stat_path = stat_path
+        self._last = self._read()
+
+    def _read(self) -> tuple[int, int] | None:
+        try:
+            with self.stat_path.open(encoding="ascii") as handle:
+                fields = handle.readline().split()
+        except OSError:
+            return None
+        if len(fields) < 6 or fields[0] != "cpu":
+            return None
+        times = [int(value) for value in fields[1:]]
+        return times[4], sum(times)
+
+    def sample(self) -> float | None:
+        current = self._read()
+        previous, self._last = self._last, current
+        if current is None or previous is None or current[1] <= previous[1]:
+            return None
+        return (current[0] - previous[0]) / (current[1] - previous[1])
+
+
+@dataclass(slots=True)
+class _LaneClimber:
+    """Hill-climb one lane's concurrency on measured throughput."""
+
+    limit: int
+    low: int
+    high: int
+    direction: int = 1
+    last_rate: float | None = None
+
+    def step(self, rate: float, *, allow_increase: bool = True) -> None:
+        if self.last_rate is not None:
+            if rate < self.last_rate * (1 - _RATE_TOLERANCE):
+                # The last move hurt: undo it and explore the other way.
+                self.direction = -self.direction
+            elif rate <= self.last_rate * (1 + _RATE_TOLERANCE):
+                self.last_rate = rate
+                return
+        self.last_rate = rate
+        if self.direction > 0 and not allow_increase:
+            self.direction = -1
+            return
+        proposed = self.limit + self.direction
+        if not self.low <= proposed <= self.high:
+            self.direction = -self.direction
+            proposed = self.limit + self.direction
+        self.limit = max(self.low, min(self.high, proposed))
+
+
+class ConcurrencyTuner:
+    """Adjust I/O-worker and conversion-slot limits from per-lane throughput samples.
+
+    Each lane hill-climbs within its bounds once per ``interval_s``: keep moving while
+    throughput (predicted cost completed per second) improves, reverse when it drops, hold
+    inside the noise band. Conversion slots do not grow while iowait is high, since the
+    CPU lane is then starved by storage rather than by slots.
+    """
+
+    def __init__(
+        self,
+        *,
+        io_start: int,
+        io_bounds: tuple[int, int],
+        cpu_start: int,
+        cpu_bounds: tuple[int, int],
+        interval_s: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+        iowait: Callable[[], float | None] | None = None,
+    ) -> None:
+        self._lanes: dict[Lane, _LaneClimber] = {
+            "io": _LaneClimber(io_start, *io_bounds),
+            "cpu": _LaneClimber(cpu_start, *cpu_bounds),
+        }
+        self.interval_s = interval_s
+        self._clock = clock
+        self._iowait = iowait if iowait is not None else IowaitSampler().sample
+        self._window_start = clock()
+        self._completed: dict[Lane, float] = {"io": 0.0, "cpu": 0.0}
+        self.last_iowait: float | None = None
+
+    @property
+    def io_limit(self) -> int:
+        return self._lanes["io"].limit
+
+    @property
+    def cpu_limit(self) -> int:
+        return self._lanes["cpu"].limit
+
+    def record(self, lane: Lane, cost: float) -> bool:
+        """Count a finished task; returns True when the limits were adjusted."""
+        self._completed[lane] += cost
+        now = self._clock()
+        elapsed = now - self._window_start
+        if elapsed < self.interval_s:
+            return False
+
+        before = (self.io_limit, self.cpu_limit)
+        self.last_iowait = self._iowait()
+        io_bound = self.last_iowait is not None and self.last_iowait > _IOWAIT_CEILING
+        for name, climber in self._lanes.items():
+            completed = self._completed[name]
+            # A lane with nothing finished (e.g. no conversions yet) has nothing to learn.
+            if completed > 0:
+                climber.step(completed / elapsed, allow_increase=not (name == "cpu" and io_bound))
+        self._window_start = now
+        self._completed = {"io": 0.0, "cpu": 0.0}
+        return (self.io_limit, self.cpu_limit) != before
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import os
 import struct
 from io import BufferedReader
 from pathlib import Path
+from typing import BinaryIO, cast
 
 from .models import WavChunk, WavFormatKind, WavMetadata
 
@@ -15,6 +17,9 @@ WAVE_FORMAT_EXTENSIBLE = 0xFFFE
 PCM_SUBTYPE_GUID = bytes.fromhex("0100000000001000800000aa00389b71")
 FLOAT_SUBTYPE_GUID = bytes.fromhex("0300000000001000800000aa00389b71")
 
+_WINDOW_SIZE = 4096
+_pread = getattr(os, "pread", None)
+
 
 def _classify_from_fmt(metadata: WavMetadata, fmt_payload: bytes) -> WavMetadata:
     if len(fmt_payload) < 16:
@@ -75,100 +80,232 @@ def _read_exact(handle: BufferedReader, size: int) -> bytes | None:
     return data
 
 
-def parse_wav_file(path: Path | str, *, include_chunks: bool = True) -> WavMetadata:
-    """Parse a WAV file and return structured metadata for safe processing decisions."""
-    file_path = Path(path)
-    metadata = WavMetadata(path=file_path, riff_valid=False, wave_valid=False)
+def _parse_streamed(
+    handle: BufferedReader,
+    metadata: WavMetadata,
+    *,
+    file_size: int,
+    include_chunks: bool,
+) -> WavMetadata:
+    header = _read_exact(handle, 12)
+    if header is None:
+        metadata.parse_error = "File is too short to be a valid RIFF/WAVE file."
+        metadata.format_kind = WavFormatKind.MALFORMED
+        return metadata
 
-    try:
-        file_size = file_path.stat().st_size
-        with file_path.open("rb") as handle:
-            header = _read_exact(handle, 12)
-            if header is None:
-                metadata.parse_error = "File is too short to be a valid RIFF/WAVE file."
-                metadata.format_kind = WavFormatKind.MALFORMED
-                return metadata
+    if header[:4] != b"RIFF":
+        metadata.parse_error = "RIFF header missing."
+        metadata.format_kind = WavFormatKind.MALFORMED
+        return metadata
+    metadata.riff_valid = True
+    metadata.riff_size = struct.unpack_from("<I", header, 4)[0]
 
-            if header[:4] != b"RIFF":
-                metadata.parse_error = "RIFF header missing."
+    if header[8:12] != b"WAVE":
+        metadata.parse_error = "WAVE signature missing."
+        metadata.format_kind = WavFormatKind.MALFORMED
+        return metadata
+    metadata.wave_valid = True
+
+    offset = 12
+    handle.seek(offset)
+    fmt_payload: bytes | None = None
+    while offset + 8 <= file_size:
+        chunk_header = _read_exact(handle, 8)
+        if chunk_header is None:
+            metadata.parse_error = "Chunk header could not be read."
+            metadata.format_kind = WavFormatKind.MALFORMED
+            return metadata
+
+        chunk_id = chunk_header[:4]
+        chunk_size = struct.unpack_from("<I", chunk_header, 4)[0]
+        data_offset = offset + 8
+        data_end = data_offset + chunk_size
+        if data_end > file_size:
+            metadata.parse_error = "Chunk size exceeds file bounds."
+            metadata.format_kind = WavFormatKind.MALFORMED
+            return metadata
+
+        padded_size = chunk_size + (chunk_size % 2)
+        if include_chunks:
+            metadata.chunks.append(
+                WavChunk(
+                    chunk_id=chunk_id.decode("ascii", errors="replace"),
+                    offset=offset,
+                    size=chunk_size,
+                    data_offset=data_offset,
+                    padded_size=padded_size,
+                )
+            )
+
+        if chunk_id == b"fmt " and fmt_payload is None:
+            metadata.fmt_offset = offset
+            metadata.fmt_size = chunk_size
+            fmt_payload = _read_exact(handle, chunk_size)
+            if fmt_payload is None:
+                metadata.parse_error = "fmt chunk payload could not be read."
                 metadata.format_kind = WavFormatKind.MALFORMED
                 return metadata
-            metadata.riff_valid = True
-            metadata.riff_size = struct.unpack_from("<I", header, 4)[0]
-
-            if header[8:12] != b"WAVE":
-                metadata.parse_error = "WAVE signature missing."
+        elif chunk_id == b"data" and metadata.data_offset is None:
+            metadata.data_offset = data_offset
+            metadata.data_size = chunk_size
+            if chunk_size:
+                handle.seek(chunk_size, 1)
+        else:
+            if chunk_size:
+                handle.seek(chunk_size, 1)
+
+        if chunk_size % 2:
+            padding = _read_exact(handle, 1)
+            if padding is None:
+                metadata.parse_error = "Chunk padding exceeds file bounds."
                 metadata.format_kind = WavFormatKind.MALFORMED
                 return metadata
-            metadata.wave_valid = True
-
-            offset = 12
-            handle.seek(offset)
-            fmt_payload: bytes | None = None
-            while offset + 8 <= file_size:
-                chunk_header = _read_exact(handle, 8)
-                if chunk_header is None:
-                    metadata.parse_error = "Chunk header could not be read."
-                    metadata.format_kind = WavFormatKind.MALFORMED
-                    return metadata
-
-                chunk_id = chunk_header[:4]
-                chunk_size = struct.unpack_from("<I", chunk_header, 4)[0]
-                data_offset = offset + 8
-                data_end = data_offset + chunk_size
-                if data_end > file_size:
-                    metadata.parse_error = "Chunk size exceeds file bounds."
-                    metadata.format_kind = WavFormatKind.MALFORMED
-                    return metadata
-
-                padded_size = chunk_size + (chunk_size % 2)
-                if include_chunks:
-                    metadata.chunks.append(
-                        WavChunk(
-                            chunk_id=chunk_id.decode("ascii", errors="replace"),
-                            offset=offset,
-                            size=chunk_size,
-                            data_offset=data_offset,
-                            padded_size=padded_size,
-                        )
-                    )
-
-                if chunk_id == b"fmt " and fmt_payload is None:
-                    metadata.fmt_offset = offset
-                    metadata.fmt_size = chunk_size
-                    fmt_payload = _read_exact(handle, chunk_size)
-                    if fmt_payload is None:
-                        metadata.parse_error = "fmt chunk payload could not be read."
-                        metadata.format_kind = WavFormatKind.MALFORMED
-                        return metadata
-                elif chunk_id == b"data" and metadata.data_offset is None:
-                    metadata.data_offset = data_offset
-                    metadata.data_size = chunk_size
-                    if chunk_size:
-                        handle.seek(chunk_size, 1)
-                else:
-                    if chunk_size:
-                        handle.seek(chunk_size, 1)
-
-                if chunk_size % 2:
-                    padding = _read_exact(handle, 1)
-                    if padding is None:
-                        metadata.parse_error = "Chunk padding exceeds file bounds."
-                        metadata.format_kind = WavFormatKind.MALFORMED
-                        return metadata
-
-                offset = data_offset + padded_size
 
-            if fmt_payload is None:
-                metadata.parse_error = "Missing fmt chunk."
+        offset = data_offset + padded_size
+
+    return _finish_parse(metadata, fmt_payload)
+
+
+def _read_window(handle: BinaryIO, offset: int, size: int) -> bytes:
+    if _pread is not None:
+        return _pread(handle.fileno(), size, offset)
+    handle.seek(offset)
+    return handle.read(size)
+
+
+def _parse_windowed(
+    handle: BinaryIO,
+    metadata: WavMetadata,
+    *,
+    file_size: int,
+    include_chunks: bool,
+) -> WavMetadata:
+    """Walk the chunk table over bounded reads of the file head and tail.
+
+    Header chunks usually fit in the first window and trailing metadata (LIST/ID3/bext)
+    in one more, so the walk costs two reads instead of a read/seek pair per chunk.
+    """
+    if file_size < 12:
+        metadata.parse_error = "File is too short to be a valid RIFF/WAVE file."
+        metadata.format_kind = WavFormatKind.MALFORMED
+        return metadata
+
+    window_start = 0
+    window = memoryview(_read_window(handle, 0, min(file_size, _WINDOW_SIZE)))
+
+    if window[:4] != b"RIFF":
+        metadata.parse_error = "RIFF header missing."
+        metadata.format_kind = WavFormatKind.MALFORMED
+        return metadata
+    metadata.riff_valid = True
+    metadata.riff_size = struct.unpack_from("<I", window, 4)[0]
+
+    if window[8:12] != b"WAVE":
+        metadata.parse_error = "WAVE signature missing."
+        metadata.format_kind = WavFormatKind.MALFORMED
+        return metadata
+    metadata.wave_valid = True
+
+    offset = 12
+    fmt_payload: bytes | None = None
+    while offset + 8 <= file_size:
+        if offset + 8 > window_start + len(window) or offset < window_start:
+            window_start = offset
+            window = memoryview(_read_window(handle, offset, min(file_size - offset, _WINDOW_SIZE)))
+            if len(window) < 8:
+                metadata.parse_error = "Chunk header could not be read."
                 metadata.format_kind = WavFormatKind.MALFORMED
                 return metadata
-            if metadata.data_offset is None:
-                metadata.parse_error = "Missing data chunk."
+        local = offset - window_start
+        chunk_id = bytes(window[local : local + 4])
+        chunk_size = struct.unpack_from("<I", window, local + 4)[0]
+        data_offset = offset + 8
+        data_end = data_offset + chunk_size
+        if data_end > file_size:
+            metadata.parse_error = "Chunk size exceeds file bounds."
+            metadata.format_kind = WavFormatKind.MALFORMED
+            return metadata
+
+        padded_size = chunk_size + (chunk_size % 2)
+        if include_chunks:
+            metadata.chunks.append(
+                WavChunk(
+                    chunk_id=chunk_id.decode("ascii", errors="replace"),
+                    offset=offset,
+                    size=chunk_size,
+                    data_offset=data_offset,
+                    padded_size=padded_size,
+                )
+            )
+
+        if chunk_id == b"fmt " and fmt_payload is None:
+            metadata.fmt_offset = offset
+            metadata.fmt_size = chunk_size
+            if data_end <= window_start + len(window):
+                fmt_payload = bytes(window[local + 8 : local + 8 + chunk_size])
+            else:
+                fmt_payload = _read_window(handle, data_offset, chunk_size)
+            if len(fmt_payload) != chunk_size:
+                metadata.parse_error = "fmt chunk payload could not be read."
                 metadata.format_kind = WavFormatKind.MALFORMED
                 return metadata
+        elif chunk_id == b"data" and metadata.data_offset is None:
+            metadata.data_offset = data_offset
+            metadata.data_size = chunk_size
+
+        if chunk_size % 2 and data_end + 1 > file_size:
+            metadata.parse_error = "Chunk padding exceeds file bounds."
+            metadata.format_kind = WavFormatKind.MALFORMED
+            return metadata
+
+        offset = data_offset + padded_size
 
-            return _classify_from_fmt(metadata, fmt_payload)
+    return _finish_parse(metadata, fmt_payload)
+
+
+def _finish_parse(metadata: WavMetadata, fmt_payload: bytes | None) -> WavMetadata:
+    if fmt_payload is None:
+        metadata.parse_error = "Missing fmt chunk."
+        metadata.format_kind = WavFormatKind.MALFORMED
+        return metadata
+    if metadata.data_offset is None:
+        metadata.parse_error = "Missing data chunk."
+        metadata.format_kind = WavFormatKind.MALFORMED
+        return metadata
+
+    return _classify_from_fmt(metadata, fmt_payload)
+
+
+def parse_wav_file(
+    path: Path | str,
+    *,
+    include_chunks: bool = True,
+    windowed: bool = True,
+) -> WavMetadata:
+    """Parse a WAV file and return structured metadata for safe processing decisions.
+
+    The default windowed reader walks the chunk table over bounded head/tail reads;
+    ``windowed=False`` selects the per-chunk streamed reader. Both return identical results.
+    """
+    file_path = Path(path)
+    metadata = WavMetadata(path=file_path, riff_valid=False, wave_valid=False)
+
+    try:
+        with file_path.open("rb", buffering=0 if windowed else -1) as handle:
+            file_size = os.fstat(handle.fileno()).st_size
+            if windowed:
+                return _parse_windowed(
+                    handle,
+                    metadata,
+                    file_size=file_size,
+                    include_chunks=include_chunks,
+                )
+            return _parse_streamed(
+                cast(BufferedReader, handle),
+                metadata,
+                file_size=file_size,
+                include_chunks=include_chunks,
+            )
     except OSError as exc:
         metadata.parse_error = str(exc)
         metadata.format_kind = WavFormatKind.MALFORMED
@@ -26,6 +26,8 @@ from .windows.dialogs import show_info, show_update_available, show_warning
 from .windows.settings_window import SettingsWindow
 
 _UPDATE_CHECK_INTERVAL_SECONDS = 24 * 60 * 60
+# How long closing the window waits for a cancelled export to remove its partial outputs.
+_CLOSE_EXPORT_TIMEOUT_SECONDS = 5.0
 
 
 class WavFixApp:
@@ -48,6 +50,7 @@ class WavFixApp:
         self._settings_button_width = 86
 
         self.action_buttons_row: CTkFrame | None = None
+        self._closing = False
 
         self._logo_row_height = 60
         self._resource_bases = self._build_resource_search_paths()
@@ -116,6 +119,7 @@ class WavFixApp:
             self.root.focus_force()
         self.root.after(250, self._warm_conversion_backend)
         self.root.after(1500, self._check_for_updates_on_launch)
+        self.root.after(1000, self.export_controller.offer_resume_last_export)
 
     def _build_branding_row(self) -> None:
         self.branding_frame = tk.Frame(
@@ -425,7 +429,11 @@ class WavFixApp:
         self.file_controller.select_inputs()
 
     def _on_remove_tags_clicked(self) -> None:
-        if self.file_controller.is_loading() or self.export_controller.is_processing():
+        if self.export_controller.is_processing():
+            # The button turns into Cancel while an export runs.
+            self.export_controller.cancel_export()
+            return
+        if self.file_controller.is_loading():
             return
         self.settings_controller.close()
         self.export_controller.initiate_export()
@@ -435,9 +443,12 @@ class WavFixApp:
         self.select_files_button.configure(state="disabled" if is_busy else "normal")
         self.settings_controller.set_busy(is_busy)
 
+        if self.export_controller.is_processing():
+            self.remove_tags_button.configure(text="Cancel", state="normal")
+            return
         has_files = bool(self.files_tree.get_children())
         remove_state = "normal" if (has_files and not is_busy) else "disabled"
-        self.remove_tags_button.configure(state=remove_state)
+        self.remove_tags_button.configure(text="Clean Files", state=remove_state)
 
     def _update_widget_colors(self) -> None:
         self.frame.configure(bg=UIConfig.bg_color())
@@ -619,10 +630,26 @@ class WavFixApp:
         threading.Thread(target=warm_conversion_backend, daemon=True).start()
 
     def _on_close(self) -> None:
+        if self._closing:
+            return
+        self._closing = True
+        self._wait_for_cancelled_export()
         UIConfig.save()
         self.settings_controller.close(revert_preview=False)
+        self.file_controller.close()
         self.root.destroy()
 
+    def _wait_for_cancelled_export(self) -> None:
+        # The export thread is a daemon, so let it stop and remove its partial outputs
+        # before the app exits; the window keeps repainting while it does.
+        if not self.export_controller.is_processing():
+            return
+        self.export_controller.cancel_export()
+        done = self.export_controller.processing_done
+        deadline = time.monotonic() + _CLOSE_EXPORT_TIMEOUT_SECONDS
+        while not done.wait(0.05) and time.monotonic() < deadline:
+            self.root.update()
+
     def _quit_bindings(self) -> None:
         if UIConfig.os_name == "Darwin":
             self.root.bind_all("<Command-Q>", lambda _event: self._on_close())
@@ -7,13 +7,21 @@ import queue as queue_module
 import shutil
 import threading
 import tkinter as tk
+from dataclasses import replace
 from pathlib import Path
 from tkinter import filedialog, messagebox
 from typing import Any, cast
 
 from customtkinter import CTkTextbox
 
-from ...core import InputFileSpec, ProcessRequest, process_request
+from ...core import (
+    CancellationToken,
+    FileInspection,
+    InputFileSpec,
+    ProcessRequest,
+    load_journal_request,
+    process_request_iter,
+)
 from ...core.models import (
     BitDepthPolicy,
     ConverterBackend,
@@ -24,6 +32,7 @@ from ...core.models import (
     RepairAction,
     SampleRatePolicy,
 )
+from ...core.processing import outcome_warning_lines
 from ..theme import UIConfig
 from ..windows.dialogs import ask_warning_yes_no, show_ffmpeg_recommendation, show_warning
 from .file_tree_controller import FileTreeController
@@ -48,11 +57,22 @@ class ExportController:
         self.queue: queue_module.Queue[tuple[str, str]] = queue_module.Queue()
         self.processing_done = threading.Event()
         self._processing = False
+        self._cancel_token: CancellationToken | None = None
+        # Only the newest progress line matters, so it bypasses the message queue.
+        self._latest_progress: str | None = None
         self.refresh_output_tags()
 
     def is_processing(self) -> bool:
         return self._processing
 
+    def cancel_export(self) -> None:
+        """Ask the running export to stop; finished files are kept, partial ones removed."""
+        token = self._cancel_token
+        if not self._processing or token is None or token.cancelled:
+            return
+        token.cancel()
+        self._enqueue_output("\n\nCancelling export...", "summary_warning")
+
     def _set_processing(self, processing: bool) -> None:
         self._processing = processing
         if self.on_processing_changed:
@@ -84,14 +104,15 @@ class ExportController:
                 ffmpeg_path,
             ) = self.get_processing_options()
 
-        allow_conversion = self._prompt_for_conversion_if_needed(
-            input_specs=input_specs,
+        inspections = self.file_controller.get_inspections_for_specs(
+            input_specs,
             profile=profile,
             multichannel_policy=multichannel_policy,
             metadata_policy=metadata_policy,
             sample_rate_policy=sample_rate_policy,
             bit_depth_policy=bit_depth_policy,
         )
+        allow_conversion = self._prompt_for_conversion_if_needed(inspections)
         if allow_conversion is None:
             return
         resolved_ffmpeg_path = ""
@@ -106,6 +127,11 @@ class ExportController:
             return
 
         overwrite_policy = self._resolve_overwrite_policy(Path(output_directory), input_specs)
+        # Hand the inspection metadata to the workers so they skip re-parsing unchanged files.
+        input_specs = [
+            replace(spec, metadata=inspection.wav_metadata)
+            for spec, inspection in zip(input_specs, inspections, strict=True)
+        ]
 
         request = ProcessRequest(
             output_dir=Path(output_directory),
@@ -122,16 +148,44 @@ class ExportController:
             bit_depth_policy=cast(BitDepthPolicy, bit_depth_policy),
             converter_backend=cast(ConverterBackend, converter_backend),
             ffmpeg_path=resolved_ffmpeg_path,
+            metadata_index_path=self.file_controller.metadata_index_path(),
+            journal=True,
         )
+        UIConfig.LAST_EXPORT_DIR = str(request.output_dir)
+        UIConfig.save()
+        self._start_processing(request)
 
+    def offer_resume_last_export(self) -> None:
+        """Ask to resume the last export when it left an unfinished journal behind."""
+        if self._processing or not UIConfig.LAST_EXPORT_DIR:
+            return
+        output_directory = Path(UIConfig.LAST_EXPORT_DIR)
+        request = load_journal_request(output_directory)
+        if request is None:
+            return
+        should_resume = messagebox.askyesno(
+            title="Resume last export?",
+            message=(
+                f"The last export to {output_directory} did not finish.\n\n"
+                "Resume it now? Files it already completed are kept and skipped."
+            ),
+        )
+        if not should_resume:
+            return
+        request.metadata_index_path = self.file_controller.metadata_index_path()
+        self._start_processing(request)
+
+    def _start_processing(self, request: ProcessRequest) -> None:
+        self._cancel_token = CancellationToken()
         self._set_processing(True)
         self.processing_done.clear()
+        self._latest_progress = None
         self._drain_output_queue()
         self._update_output_window()
 
         processing_thread = threading.Thread(
             target=self._process_selected_files,
-            args=(request,),
+            args=(request, self._cancel_token),
             daemon=True,
         )
         processing_thread.start()
@@ -158,29 +212,49 @@ class ExportController:
 
         return "yes"
 
-    def _process_selected_files(self, request: ProcessRequest) -> None:
+    def _process_selected_files(
+        self,
+        request: ProcessRequest,
+        cancel_token: CancellationToken | None = None,
+    ) -> None:
         processed_outputs: list[Path] = []
+        warnings: list[str] = []
+        errors: list[str] = []
         try:
-            result = process_request(
+            session = process_request_iter(
                 request,
                 progress_callback=self._on_progress,
+                cancel_token=cancel_token,
             )
-            processed_outputs = list(result.outputs)
+            for outcome in session:
+                if outcome.error is not None:
+                    errors.append(f"{outcome.output_path}: {outcome.error}")
+                    continue
+                warnings.extend(outcome_warning_lines(outcome))
+                if outcome.action != RepairAction.REJECT:
+                    processed_outputs.append(outcome.output_path)
+
+            result = session.result
+            if result is None:
+                return
             success_count = result.unchanged + result.header_fixed + result.converted
             rejected_count = result.rejected
-            error_count = len(result.errors)
+            error_count = result.error_count
             has_failures = rejected_count > 0 or error_count > 0
             if has_failures and success_count == 0:
                 header_style = "summary_error"
-            elif has_failures:
+            elif has_failures or result.cancelled:
                 header_style = "summary_warning"
             else:
                 header_style = "summary"
 
-            self._enqueue_output("\n\nSummary:", header_style)
+            header = "Summary (cancelled, finished files only):" if result.cancelled else "Summary:"
+            self._enqueue_output(f"\n\n{header}", header_style)
             self._enqueue_output(f"\n  Unchanged: {result.unchanged}", "summary")
             self._enqueue_output(f"\n  Header-fixed: {result.header_fixed}", "summary")
             self._enqueue_output(f"\n  Converted: {result.converted}", "summary")
+            if result.skipped:
+                self._enqueue_output(f"\n  Skipped (completed before): {result.skipped}", "summary")
             self._enqueue_output(
                 f"\n  Rejected: {rejected_count}",
                 "error" if rejected_count > 0 else "summary",
@@ -189,14 +263,14 @@ class ExportController:
                 f"\n  Errors: {error_count}",
                 "error" if error_count > 0 else "summary",
             )
-            if result.warnings:
+            if warnings:
                 self._enqueue_output("\nWarnings:", "warning")
-                for warning in result.warnings:
+                for warning in warnings:
                     self._enqueue_output(
                         f"\n  - {self._format_warning_text(warning)}",
                         "warning",
                     )
-            for error in result.errors:
+            for error in errors:
                 self._enqueue_output(f"\nERROR: {error}", "error")
         except Exception as exc:  # pragma: no cover - UI runtime protection
             self._enqueue_output(f"\n\nError while processing files: {exc}", "error")
@@ -207,9 +281,17 @@ class ExportController:
                 self.root.after(50, self._show_output_files_in_tree, processed_outputs)
 
     def _on_progress(self, event: Any) -> None:
+        if event.kind == "progress":
+            self._latest_progress = str(event.message)
+            return
+        if event.kind in {"done", "cancelled"}:
+            self._latest_progress = None
         if event.kind == "done":
             self._enqueue_output("\n\nDone!", "summary")
             return
+        if event.kind == "cancelled":
+            self._enqueue_output("\n\nCancelled.", "summary_warning")
+            return
         message = str(event.message)
         if event.kind == "warning":
             message = self._format_warning_text(message)
@@ -217,22 +299,8 @@ class ExportController:
 
     def _prompt_for_conversion_if_needed(
         self,
-        *,
-        input_specs: list[InputFileSpec],
-        profile: str,
-        multichannel_policy: str,
-        metadata_policy: str,
-        sample_rate_policy: str,
-        bit_depth_policy: str,
+        inspections: list[FileInspection],
     ) -> bool | None:
-        inspections = self.file_controller.get_inspections_for_specs(
-            input_specs,
-            profile=profile,
-            multichannel_policy=multichannel_policy,
-            metadata_policy=metadata_policy,
-            sample_rate_policy=sample_rate_policy,
-            bit_depth_policy=bit_depth_policy,
-        )
         conversion_required = [item for item in inspections if item.action == RepairAction.CONVERT]
         if not conversion_required:
             return False
@@ -311,10 +379,17 @@ class ExportController:
             except queue_module.Empty:
                 break
 
-        if messages:
+        progress = self._latest_progress
+        shown = self.output_text.tag_ranges("out_progress")
+        if messages or shown or progress:
             self.output_text.configure(state="normal")
+            # The progress line always sits last; drop it before appending new output.
+            if shown:
+                self.output_text.delete(shown[0], shown[-1])
             for style, message in messages:
                 self.output_text.insert(tk.END, message, f"out_{style}")
+            if progress:
+                self.output_text.insert(tk.END, f"\n{progress}", "out_progress")
             self.output_text.see(tk.END)
             self.output_text.configure(state="disabled")
 
@@ -327,6 +402,7 @@ class ExportController:
         self.output_text.tag_config("out_summary_warning", foreground=UIConfig.orange_files_color())
         self.output_text.tag_config("out_summary_error", foreground=UIConfig.red_files_color())
         self.output_text.tag_config("out_neutral", foreground=UIConfig.neutral_files_color())
+        self.output_text.tag_config("out_progress", foreground=UIConfig.neutral_files_color())
         self.output_text.tag_config("out_pass", foreground=UIConfig.green_files_color())
         self.output_text.tag_config("out_header", foreground=UIConfig.green_files_color())
         self.output_text.tag_config("out_convert", foreground=UIConfig.green_files_color())
@@ -11,17 +11,21 @@ from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 from typing import Any, Literal, cast
 
+from ...config import metadata_index_file
 from ...core import InputFileSpec, inspect_file, scan_input_specs
 from ...core.constants import SUPPORTED_EXTENSIONS
 from ...core.inspection import format_kind_label, inspect_wav_metadata, short_status
+from ...core.metadata_index import WavMetadataIndex, open_metadata_index
 from ...core.models import (
     BitDepthPolicy,
     FileInspection,
+    FileStat,
     MetadataPolicy,
     MultiChannelPolicy,
     SampleRatePolicy,
     WavMetadata,
 )
+from ...core.scanner import file_stat_from_result
 from ..theme import UIConfig
 from ..windows.dialogs import show_warning
 
@@ -66,6 +70,7 @@ class FileTreeController:
         self._inspection_cache: dict[Path, tuple[_InspectionSignature, FileInspection]] = {}
         self._wav_metadata_cache: dict[Path, tuple[_FileSignature, WavMetadata]] = {}
         self._cache_lock = threading.Lock()
+        self._metadata_index: WavMetadataIndex | None = open_metadata_index(metadata_index_file())
         self._tree_update_token = 0
 
     def _file_types(self) -> tuple[str, str]:
@@ -74,6 +79,16 @@ class FileTreeController:
             " ".join(f"*{ext}" for ext in SUPPORTED_EXTENSIONS),
         )
 
+    def metadata_index_path(self) -> Path | None:
+        if self._metadata_index is None:
+            return None
+        return self._metadata_index.db_path
+
+    def close(self) -> None:
+        if self._metadata_index is not None:
+            self._metadata_index.close()
+            self._metadata_index = None
+
     def get_input_specs(self) -> list[InputFileSpec]:
         return list(self.input_specs)
 
@@ -104,12 +119,11 @@ class FileTreeController:
         )
 
     @staticmethod
-    def _file_signature(path: Path) -> _FileSignature | None:
+    def _current_stat(path: Path) -> FileStat | None:
         try:
-            stat = path.stat()
+            return file_stat_from_result(path.stat())
         except OSError:
             return None
-        return stat.st_size, stat.st_mtime_ns
 
     @staticmethod
     def _inspection_signature(
@@ -273,8 +287,18 @@ class FileTreeController:
         if not input_specs:
             return []
 
-        if not parallel or len(input_specs) <= 1:
-            return self._inspect_specs_serial(
+        try:
+            if not parallel or len(input_specs) <= 1:
+                return self._inspect_specs_serial(
+                    input_specs,
+                    profile=profile,
+                    multichannel_policy=multichannel_policy,
+                    metadata_policy=metadata_policy,
+                    sample_rate_policy=sample_rate_policy,
+                    bit_depth_policy=bit_depth_policy,
+                )
+
+            return self._inspect_specs_parallel(
                 input_specs,
                 profile=profile,
                 multichannel_policy=multichannel_policy,
@@ -282,15 +306,9 @@ class FileTreeController:
                 sample_rate_policy=sample_rate_policy,
                 bit_depth_policy=bit_depth_policy,
             )
-
-        return self._inspect_specs_parallel(
-            input_specs,
-            profile=profile,
-            multichannel_policy=multichannel_policy,
-            metadata_policy=metadata_policy,
-            sample_rate_policy=sample_rate_policy,
-            bit_depth_policy=bit_depth_policy,
-        )
+        finally:
+            if self._metadata_index is not None:
+                self._metadata_index.flush()
 
     def _inspect_specs_parallel(
         self,
@@ -663,7 +681,18 @@ class FileTreeController:
         sample_rate_policy: str,
         bit_depth_policy: str,
     ) -> FileInspection:
-        file_signature = self._file_signature(spec.path)
+        with self._cache_lock:
+            cached_entry = self._inspection_cache.get(spec.path)
+            metadata_entry = self._wav_metadata_cache.get(spec.path)
+
+        # The scan's stat only vouches for the first inspection; the file may have changed
+        # since. Keeping the fresh stat on the spec pairs it with the metadata read now.
+        if cached_entry is not None or spec.stat is None:
+            spec.stat = self._current_stat(spec.path)
+        file_stat = spec.stat
+        file_signature: _FileSignature | None = None
+        if file_stat is not None:
+            file_signature = file_stat.size, file_stat.mtime_ns
         inspection_signature: _InspectionSignature | None = None
         if file_signature is not None:
             inspection_signature = self._inspection_signature(
@@ -675,10 +704,6 @@ class FileTreeController:
                 bit_depth_policy=bit_depth_policy,
             )
 
-        with self._cache_lock:
-            cached_entry = self._inspection_cache.get(spec.path)
-            metadata_entry = self._wav_metadata_cache.get(spec.path)
-
         if cached_entry is not None and inspection_signature is not None:
             cached_signature, cached_inspection = cached_entry
             if cached_signature == inspection_signature:
@@ -709,6 +734,8 @@ class FileTreeController:
                 metadata_policy=cast(MetadataPolicy, metadata_policy),
                 sample_rate_policy=cast(SampleRatePolicy, sample_rate_policy),
                 bit_depth_policy=cast(BitDepthPolicy, bit_depth_policy),
+                metadata_index=self._metadata_index,
+                file_stat=file_stat,
             )
 
         with self._cache_lock:
@@ -21,7 +21,7 @@ class UIConfig:
 
     os_name = platform.system()
     DARK_MODE: bool = True
-    PERFORMANCE_MODE: Literal["conservative", "balanced", "fast"] = "balanced"
+    PERFORMANCE_MODE: Literal["conservative", "balanced", "fast", "auto"] = "balanced"
     PROFILE: ProfileName = "preserve_supported_rate"
     MULTICHANNEL_POLICY: MultiChannelPolicy = "downmix"
     METADATA_POLICY: MetadataPolicy = "best_effort"
@@ -34,6 +34,7 @@ class UIConfig:
     CHECK_FOR_UPDATES: bool = True
     SKIPPED_UPDATE_VERSION: str = ""
     LAST_UPDATE_CHECK: int = 0
+    LAST_EXPORT_DIR: str = ""
 
     @staticmethod
     def load() -> None:
@@ -52,6 +53,7 @@ class UIConfig:
         UIConfig.CHECK_FOR_UPDATES = settings.check_for_updates
         UIConfig.SKIPPED_UPDATE_VERSION = settings.skipped_update_version
         UIConfig.LAST_UPDATE_CHECK = settings.last_update_check
+        UIConfig.LAST_EXPORT_DIR = settings.last_export_dir
 
     @staticmethod
     def save() -> None:
@@ -71,6 +73,7 @@ class UIConfig:
                 check_for_updates=UIConfig.CHECK_FOR_UPDATES,
                 skipped_update_version=UIConfig.SKIPPED_UPDATE_VERSION,
                 last_update_check=UIConfig.LAST_UPDATE_CHECK,
+                last_export_dir=UIConfig.LAST_EXPORT_DIR,
             )
         )
 
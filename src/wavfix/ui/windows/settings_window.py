@@ -83,6 +83,7 @@ class SettingsWindow:
         "Conservative": "Lowest resource usage; slowest processing.",
         "Balanced": "Balanced speed and system load.",
         "Fast": "Highest throughput with higher system load.",
+        "Auto": "Tunes workers and conversion slots to measured throughput while exporting.",
     }
     _UPDATE_TOOLTIPS: dict[str, str] = {
         "On": "Check GitHub Releases periodically and notify you when a new version is available.",
@@ -215,7 +216,7 @@ class SettingsWindow:
 
         self.perf_segmented = SegmentedControl(
             master=self.general_panel,
-            values=["Conservative", "Balanced", "Fast"],
+            values=["Conservative", "Balanced", "Fast", "Auto"],
             width=segmented_width,
         )
         self.perf_segmented.grid(row=3, column=0, sticky="we", padx=10, pady=(0, 10))
@@ -223,6 +224,7 @@ class SettingsWindow:
             "conservative": "Conservative",
             "balanced": "Balanced",
             "fast": "Fast",
+            "auto": "Auto",
         }
         self.perf_segmented.set(perf_map.get(UIConfig.PERFORMANCE_MODE, "Balanced"))
 
@@ -862,9 +864,10 @@ class SettingsWindow:
             "Conservative": "conservative",
             "Balanced": "balanced",
             "Fast": "fast",
+            "Auto": "auto",
         }
         UIConfig.PERFORMANCE_MODE = cast(
-            Literal["conservative", "balanced", "fast"],
+            Literal["conservative", "balanced", "fast", "auto"],
             perf_map.get(selected_perf, "balanced"),
         )
         UIConfig.CHECK_FOR_UPDATES = selected_updates == "On"
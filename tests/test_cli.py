@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import importlib.util
+import signal
 from pathlib import Path
 
 import pytest
 
+import wavfix.cli as cli_module
+import wavfix.config.settings as settings_module
 from wavfix.cli import main
+from wavfix.core import CancellationToken, ProcessRequest, process_request
+from wavfix.core.journal import JOURNAL_FILE_NAME
 from wavfix.core.wav_parser import parse_wav_file
 
 from .wav_helpers import PCM_SUBTYPE_GUID, build_extensible_wav, build_standard_wav, write_bytes
@@ -18,6 +23,11 @@ def _conversion_backend_available() -> bool:
     )
 
 
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(settings_module, "user_cache_dir", lambda *_: str(tmp_path / "cache"))
+
+
 def test_cli_batch_command_processes_folder(tmp_path: Path, capsys) -> None:
     source = tmp_path / "source"
     output = tmp_path / "output"
@@ -46,6 +56,7 @@ def test_cli_batch_command_processes_folder(tmp_path: Path, capsys) -> None:
     captured = capsys.readouterr().out
     assert "Summary: total=1" in captured
     assert "header_fixed=1" in captured
+    assert "Thread budget:" in captured
 
 
 def test_cli_requires_allow_conversion_for_float(tmp_path: Path, capsys) -> None:
@@ -109,3 +120,216 @@ def test_cli_converts_float_with_allow_conversion(tmp_path: Path, capsys) -> Non
 
     captured = capsys.readouterr().out
     assert "converted=1" in captured
+
+
+@pytest.mark.skipif(
+    not _conversion_backend_available(),
+    reason="conversion backend (numpy/soundfile/soxr) not available",
+)
+def test_cli_conversion_cache_reports_hits(tmp_path: Path, capsys) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    write_bytes(source / "float.wav", build_standard_wav(format_tag=0x0003, bits_per_sample=32))
+    args = [str(source), "--allow-conversion", "--overwrite", "yes", "--conversion-cache"]
+
+    assert main([*args, "--output", str(tmp_path / "first")]) == 0
+    assert "Conversion cache: hits=0, misses=1" in capsys.readouterr().out
+    assert main([*args, "--output", str(tmp_path / "second")]) == 0
+    assert "Conversion cache: hits=1, misses=0" in capsys.readouterr().out
+    assert (tmp_path / "cache" / "conversions").is_dir()
+
+
+def test_cli_reuses_metadata_index_between_runs(tmp_path: Path, capsys) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    wav_file = source / "song.wav"
+    write_bytes(wav_file, build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID, bits_per_sample=24))
+    index_file = tmp_path / "index.sqlite3"
+
+    for run in range(2):
+        exit_code = main(
+            [
+                str(source),
+                "--overwrite",
+                "yes",
+                "--metadata-index",
+                str(index_file),
+                "--output",
+                str(tmp_path / f"output_{run}"),
+            ]
+        )
+        assert exit_code == 0
+
+    assert index_file.exists()
+    assert not (tmp_path / "cache").exists()
+    assert "header_fixed=1" in capsys.readouterr().out
+
+
+def test_cli_link_mode_hardlinks_unchanged_files(tmp_path: Path, capsys) -> None:
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    source.mkdir()
+
+    pcm_file = source / "pcm.wav"
+    write_bytes(pcm_file, build_standard_wav(format_tag=0x0001, bits_per_sample=16))
+    ext_file = source / "ext.wav"
+    write_bytes(ext_file, build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID, bits_per_sample=24))
+
+    exit_code = main(
+        [str(source), "--overwrite", "yes", "--output", str(output), "--link-mode", "hardlink"]
+    )
+
+    assert exit_code == 0
+    assert (output / "source" / "pcm.wav").stat().st_ino == pcm_file.stat().st_ino
+    assert (output / "source" / "ext.wav").stat().st_ino != ext_file.stat().st_ino
+    assert "Unchanged files written as: hardlink=1" in capsys.readouterr().out
+
+
+def test_cli_rewrite_does_not_modify_hardlinked_source(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    source.mkdir()
+    wav_file = source / "song.wav"
+    write_bytes(wav_file, build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID, bits_per_sample=24))
+    original = wav_file.read_bytes()
+    (output / "source").mkdir(parents=True)
+    (output / "source" / "song.wav").hardlink_to(wav_file)
+
+    assert main([str(source), "--overwrite", "yes", "--output", str(output)]) == 0
+
+    assert wav_file.read_bytes() == original
+    assert parse_wav_file(output / "source" / "song.wav").format_tag == 0x0001
+
+
+def test_cli_rejected_file_keeps_its_linked_output(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    source.mkdir()
+    write_bytes(source / "float.wav", build_standard_wav(format_tag=0x0003, bits_per_sample=32))
+    earlier = tmp_path / "earlier_export.wav"
+    earlier.write_bytes(b"converted by an earlier run")
+    (output / "source").mkdir(parents=True)
+    (output / "source" / "float.wav").hardlink_to(earlier)
+
+    # Without --allow-conversion the file is rejected, so its previous output stays put.
+    main([str(source), "--overwrite", "yes", "--output", str(output)])
+
+    kept = output / "source" / "float.wav"
+    assert kept.read_bytes() == b"converted by an earlier run"
+    assert kept.stat().st_nlink == 2
+
+
+def test_cli_first_sigint_cancels_and_second_interrupts(capsys) -> None:
+    token = CancellationToken()
+    with cli_module._cancel_on_sigint(token):
+        signal.raise_signal(signal.SIGINT)
+        assert token.cancelled
+        with pytest.raises(KeyboardInterrupt):
+            signal.raise_signal(signal.SIGINT)
+
+    assert "Cancelling" in capsys.readouterr().err
+
+
+def test_cli_sigint_at_the_overwrite_prompt_interrupts_it(monkeypatch) -> None:
+    def interrupted_input(_prompt: str) -> str:
+        signal.raise_signal(signal.SIGINT)
+        return "y"
+
+    monkeypatch.setattr("builtins.input", interrupted_input)
+    token = CancellationToken()
+    with cli_module._cancel_on_sigint(token):
+        with pytest.raises(KeyboardInterrupt):
+            cli_module._prompt_overwrite()
+        # The cancel handler is back for the rest of the run.
+        signal.raise_signal(signal.SIGINT)
+    assert token.cancelled
+
+
+def test_cli_reports_cancelled_run(tmp_path: Path, monkeypatch, capsys) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    write_bytes(source / "song.wav", build_standard_wav(format_tag=0x0001))
+
+    class CancelledToken(CancellationToken):
+        def __init__(self) -> None:
+            super().__init__()
+            self.cancel()
+
+    monkeypatch.setattr(cli_module, "CancellationToken", CancelledToken)
+
+    exit_code = main([str(source), "--overwrite", "yes", "--output", str(tmp_path / "out")])
+
+    assert exit_code == 130
+    assert "Cancelled before any file finished." in capsys.readouterr().out
+    assert not (tmp_path / "out" / "song.wav").exists()
+
+
+def test_cli_resume_skips_files_the_interrupted_export_completed(tmp_path: Path, capsys) -> None:
+    source = tmp_path / "source"
+    output = tmp_path / "out"
+    source.mkdir()
+    for name in ("a.wav", "b.wav", "c.wav"):
+        write_bytes(source / name, build_standard_wav(format_tag=0x0001))
+    token = CancellationToken()
+    interrupted = ProcessRequest(
+        input_paths=[source],
+        output_dir=output,
+        overwrite_policy="yes",
+        stream_inputs=True,
+        journal=True,
+    )
+    process_request(
+        interrupted,
+        progress_callback=lambda event: token.cancel() if event.kind == "file" else None,
+        max_workers=1,
+        cancel_token=token,
+    )
+
+    assert main([str(source), "--output", str(output), "--resume"]) == 0
+
+    out = capsys.readouterr().out
+    assert "Resuming the interrupted export" in out
+    assert "Resumed: skipped" in out
+    assert sorted(path.name for path in (output / "source").iterdir()) == [
+        "a.wav",
+        "b.wav",
+        "c.wav",
+    ]
+    assert not (output / JOURNAL_FILE_NAME).exists()
+
+
+def test_cli_sync_skips_unchanged_files_on_the_next_run(tmp_path: Path, capsys) -> None:
+    source = tmp_path / "source"
+    output = tmp_path / "out"
+    source.mkdir()
+    write_bytes(source / "a.wav", build_standard_wav(format_tag=0x0001))
+    write_bytes(source / "b.wav", build_standard_wav(format_tag=0x0001))
+    with pytest.raises(SystemExit):
+        main([str(source), "--output", str(output), "--delete-orphans"])
+
+    assert main([str(source), "--output", str(output), "--sync"]) == 0
+    (source / "b.wav").unlink()
+    capsys.readouterr()
+    assert main([str(source), "--output", str(output), "--sync", "--delete-orphans"]) == 0
+
+    out = capsys.readouterr().out
+    assert "Nothing left to do: all 1 file(s) were already complete." in out
+    assert "Sync: deleted 1 orphaned output(s)" in out
+    assert sorted(path.name for path in (output / "source").iterdir()) == ["a.wav"]
+
+
+def test_cli_empty_selection_neither_prompts_nor_creates_the_output(
+    tmp_path: Path, monkeypatch, capsys
+) -> None:
+    source = tmp_path / "source"
+    (source / "empty").mkdir(parents=True)
+    output = tmp_path / "out"
+
+    def unexpected_prompt(_prompt: str) -> str:
+        raise AssertionError("asked to overwrite for an empty selection")
+
+    monkeypatch.setattr("builtins.input", unexpected_prompt)
+
+    assert main([str(source), "--overwrite", "ask", "--output", str(output)]) == 1
+    assert "No supported files were found" in capsys.readouterr().out
+    assert not output.exists()
@@ -26,6 +26,7 @@ def test_config_round_trip(tmp_path: Path, monkeypatch) -> None:
             check_for_updates=False,
             skipped_update_version="2.0.1",
             last_update_check=123456,
+            last_export_dir="/music/export",
         )
     )
     loaded = load_settings()
@@ -43,6 +44,7 @@ def test_config_round_trip(tmp_path: Path, monkeypatch) -> None:
     assert loaded.check_for_updates is False
     assert loaded.skipped_update_version == "2.0.1"
     assert loaded.last_update_check == 123456
+    assert loaded.last_export_dir == "/music/export"
 
 
 def test_config_defaults_when_missing(tmp_path: Path, monkeypatch) -> None:
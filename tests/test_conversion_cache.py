@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from wavfix.core import ProcessRequest, process_request
+from wavfix.core.conversion_cache import ConversionCache, conversion_cache_key
+from wavfix.core.decisions import ConversionTarget
+
+from .wav_helpers import build_standard_wav, write_bytes
+
+
+def _conversion_backend_available() -> bool:
+    return all(
+        importlib.util.find_spec(module_name) is not None
+        for module_name in ("numpy", "soundfile", "soxr")
+    )
+
+
+def _key(audio: bytes, **overrides: object) -> str:
+    fields: dict[str, object] = {
+        "audio_digest": audio,
+        "header_digest": b"fmt",
+        "target": ConversionTarget(sample_rate=44100, channels=2, bit_depth=24),
+        "resample_quality": "HQ",
+        "converter_backend": "builtin",
+        "metadata_policy": "best_effort",
+        "dither": "tpdf",
+    }
+    fields.update(overrides)
+    return conversion_cache_key(**fields)  # type: ignore[arg-type]
+
+
+def test_cache_key_covers_every_conversion_setting() -> None:
+    base = _key(b"audio")
+    assert _key(b"audio") == base
+    assert _key(b"other") != base
+    assert _key(b"audio", target=ConversionTarget(48000, 2, 24)) != base
+    assert _key(b"audio", resample_quality="VHQ") != base
+    assert _key(b"audio", converter_backend="ffmpeg") != base
+    assert _key(b"audio", dither="tpdf-seed-1") != base
+
+
+def test_cache_serves_stored_outputs_and_evicts_least_recently_used(tmp_path: Path) -> None:
+    outputs = []
+    for index in range(3):
+        output = tmp_path / f"converted_{index}.wav"
+        output.write_bytes(bytes([index]) * 400)
+        outputs.append(output)
+
+    with ConversionCache(tmp_path / "cache", max_bytes=1000) as cache:
+        assert cache.store("aa01", outputs[0])
+        assert cache.store("bb02", outputs[1])
+        served = tmp_path / "served.wav"
+        assert cache.fetch("aa01", served)
+        assert served.read_bytes() == outputs[0].read_bytes()
+
+        # Over budget: the entry not used since it was stored goes first.
+        assert cache.store("cc03", outputs[2])
+        assert not cache.fetch("bb02", served)
+        assert cache.fetch("cc03", served)
+        assert cache.total_bytes() == 800
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    with ConversionCache(tmp_path / "cache", max_bytes=1000) as reopened:
+        assert reopened.fetch("aa01", served)
+
+
+def test_cache_treats_a_missing_blob_as_a_miss(tmp_path: Path) -> None:
+    output = tmp_path / "converted.wav"
+    output.write_bytes(b"RIFF")
+    with ConversionCache(tmp_path / "cache") as cache:
+        cache.store("dd04", output)
+        for blob in (tmp_path / "cache").rglob("dd04.wav"):
+            blob.unlink()
+
+        assert not cache.fetch("dd04", tmp_path / "served.wav")
+        assert cache.total_bytes() == 0
+
+
+@pytest.mark.skipif(
+    not _conversion_backend_available(),
+    reason="conversion backend (numpy/soundfile/soxr) not available",
+)
+def test_exports_reuse_conversions_of_identical_audio(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    first = source / "first.wav"
+    twin = source / "twin.wav"
+    wav_bytes = build_standard_wav(format_tag=0x0003, bits_per_sample=32, frames=256)
+    write_bytes(first, wav_bytes)
+    write_bytes(twin, wav_bytes)
+    cache_dir = tmp_path / "cache"
+
+    def export(inputs: list[Path], output: Path, **kwargs: object):
+        request = ProcessRequest(
+            input_paths=inputs,
+            output_dir=output,
+            overwrite_policy="yes",
+            allow_conversion=True,
+            conversion_cache_path=cache_dir,
+            **kwargs,  # type: ignore[arg-type]
+        )
+        return process_request(request, max_workers=1)
+
+    initial = export([first], tmp_path / "out_a")
+    assert (initial.conversion_cache_hits, initial.conversion_cache_misses) == (0, 1)
+
+    repeated = export([first, twin], tmp_path / "out_b")
+    assert repeated.converted == 2
+    assert (repeated.conversion_cache_hits, repeated.conversion_cache_misses) == (2, 0)
+    converted = (tmp_path / "out_a" / "first.wav").read_bytes()
+    assert (tmp_path / "out_b" / "first.wav").read_bytes() == converted
+    assert (tmp_path / "out_b" / "twin.wav").read_bytes() == converted
+
+    strict = export([first], tmp_path / "out_c", metadata_policy="strict_preserve")
+    assert (strict.conversion_cache_hits, strict.conversion_cache_misses) == (0, 1)
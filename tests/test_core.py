@@ -1,23 +1,36 @@
 from __future__ import annotations
 
+import hashlib
 import importlib.util
+import os
+import signal
 import struct
+import subprocess
+import sys
 import threading
+import time
 from pathlib import Path
 
 import pytest
 
+import wavfix.core.processing as processing_module
+import wavfix.core.scanner as scanner_module
 from wavfix.core import (
+    CancellationToken,
     InputFileSpec,
     ProcessRequest,
     inspect_file,
+    iter_input_specs,
     process_request,
+    process_request_iter,
     scan_input_specs,
     scan_inputs,
 )
 from wavfix.core.decisions import decide_repair_action
 from wavfix.core.models import RepairAction
 from wavfix.core.planning import OutputPlanContext, plan_output_path
+from wavfix.core.process_pool import TimeoutProcessPool
+from wavfix.core.processing import outcome_warning_lines
 from wavfix.core.wav_parser import parse_wav_file
 
 from .wav_helpers import (
@@ -69,6 +82,124 @@ def test_scan_input_specs_preserves_folder_context(tmp_path: Path) -> None:
     assert by_path[wav_file].source_root == folder
 
 
+def test_scan_input_specs_matches_walk_order_and_carries_stat(tmp_path: Path) -> None:
+    folder = tmp_path / "crate"
+    for relative in ("a", "a/b", "a/b/c", "d", "e/f"):
+        (folder / relative).mkdir(parents=True)
+    expected: list[Path] = []
+    for relative in ("top.wav", "a/one.wav", "a/b/two.txt", "a/b/c/three.wav", "e/f/four.wav"):
+        (folder / relative).write_bytes(b"x" * len(relative))
+    (folder / "a" / "._resource.wav").write_bytes(b"")
+    (folder / "d" / "skip.exe").write_bytes(b"")
+    if hasattr(os, "symlink"):
+        os.symlink(folder / "a", folder / "linked", target_is_directory=True)
+
+    for root_dir, _, files in os.walk(folder):
+        for file_name in files:
+            candidate = Path(root_dir) / file_name
+            if not file_name.startswith("._") and candidate.suffix in {".wav", ".txt"}:
+                expected.append(candidate)
+
+    specs = scan_input_specs([folder], max_workers=4)
+
+    assert [spec.path for spec in specs] == expected
+    for spec in specs:
+        assert spec.source_root == folder
+        assert spec.stat is not None
+        stat_result = spec.path.stat()
+        assert spec.stat.size == stat_result.st_size
+        assert spec.stat.mtime_ns == stat_result.st_mtime_ns
+        assert spec.stat.inode == stat_result.st_ino
+        assert spec.stat.device == stat_result.st_dev
+
+
+def test_iter_input_specs_yields_before_walk_finishes(tmp_path: Path) -> None:
+    folder = tmp_path / "crate"
+    for number in range(50):
+        nested = folder / f"dir_{number:02d}"
+        nested.mkdir(parents=True)
+        (nested / "track.wav").write_bytes(b"x")
+
+    specs = iter_input_specs([folder], max_workers=2)
+    first = next(specs)
+    assert first.path.name == "track.wav"
+    assert first.source_root == folder
+    specs.close()
+
+
+def test_iter_input_specs_lists_a_bounded_number_of_folders_ahead(
+    tmp_path: Path, monkeypatch
+) -> None:
+    folder = tmp_path / "crate"
+    for number in range(50):
+        nested = folder / f"dir_{number:02d}"
+        nested.mkdir(parents=True)
+        (nested / "track.wav").write_bytes(b"x")
+    listed: list[Path] = []
+    list_directory = scanner_module._list_directory
+
+    def counting_list_directory(directory: Path):
+        listed.append(directory)
+        return list_directory(directory)
+
+    monkeypatch.setattr(scanner_module, "_list_directory", counting_list_directory)
+
+    specs = iter_input_specs([folder], max_workers=2)
+    next(specs)
+    # The root, then only the look-ahead window of its subfolders.
+    assert len(listed) <= 1 + 2 * scanner_module._LOOK_AHEAD_PER_WORKER
+    assert len(list(specs)) == 49
+    assert len(listed) == 51
+
+
+def test_scan_input_specs_prefers_folder_root_for_duplicate_selection(tmp_path: Path) -> None:
+    folder = tmp_path / "album"
+    folder.mkdir()
+    track = folder / "track.wav"
+    track.write_bytes(b"x")
+
+    specs = scan_input_specs([track, folder, track])
+
+    assert [(spec.path, spec.source_root) for spec in specs] == [(track, folder)]
+
+
+def test_selected_top_level_names_skip_folders_without_supported_files(tmp_path: Path) -> None:
+    album = tmp_path / "album"
+    (album / "disc_1").mkdir(parents=True)
+    (album / "disc_1" / "track.wav").write_bytes(b"x")
+    artwork = tmp_path / "artwork"
+    (artwork / "raw").mkdir(parents=True)
+    (artwork / "raw" / "cover.psd").write_bytes(b"x")
+    single = tmp_path / "single.wav"
+    single.write_bytes(b"x")
+
+    names = scanner_module.selected_top_level_names([album, artwork, single])
+
+    assert names == {"album", "single.wav"}
+
+
+def test_streamed_batch_specs_keep_the_scanned_stat(tmp_path: Path) -> None:
+    folder = tmp_path / "crate"
+    (folder / "a").mkdir(parents=True)
+    for relative in ("top.wav", "a/one.wav"):
+        (folder / relative).write_bytes(b"x")
+    request = ProcessRequest(
+        input_paths=[folder / "top.wav", folder / "a"],
+        output_dir=tmp_path / "out",
+        batch_mode=True,
+        stream_inputs=True,
+    )
+
+    specs, names = processing_module._request_input_specs(request)
+
+    assert names == {"crate"}
+    assert sorted(spec.path.name for spec in specs) == ["one.wav", "top.wav"]
+    for spec in specs:
+        assert spec.source_root == folder
+        assert spec.stat is not None
+        assert spec.stat.inode == spec.path.stat().st_ino
+
+
 def test_inspect_file_classification_and_action(tmp_path: Path) -> None:
     pcm = tmp_path / "pcm.wav"
     ext_pcm = tmp_path / "ext_pcm.wav"
@@ -170,6 +301,117 @@ def test_process_request_converts_float(tmp_path: Path) -> None:
     assert out_meta.bits_per_sample == 24
 
 
+@pytest.mark.skipif(
+    not _conversion_backend_available(),
+    reason="conversion backend (numpy/soundfile/soxr) not available",
+)
+def test_conversions_are_byte_identical_across_block_sizes_and_workers(
+    tmp_path: Path, monkeypatch
+) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    inputs = []
+    # Same-rate requantization, plus a resample from an unsupported rate.
+    for name, sample_rate in (("float.wav", 44100), ("resampled.wav", 22050)):
+        wav_file = source / name
+        write_bytes(
+            wav_file,
+            build_standard_wav(
+                format_tag=0x0003, bits_per_sample=32, sample_rate=sample_rate, frames=3000
+            ),
+        )
+        inputs.append(wav_file)
+
+    outputs: list[dict[str, bytes]] = []
+    for block_frames, workers in ((65536, 1), (8, 2), (1001, 4)):
+        monkeypatch.setattr(processing_module, "_CONVERSION_BLOCK_FRAMES", block_frames)
+        output = tmp_path / f"out_{block_frames}"
+        request = ProcessRequest(
+            input_paths=inputs,
+            output_dir=output,
+            overwrite_policy="yes",
+            allow_conversion=True,
+        )
+        result = process_request(request, max_workers=workers)
+        assert result.converted == 2
+        outputs.append({path.name: (output / path.name).read_bytes() for path in inputs})
+
+    assert outputs[1] == outputs[0]
+    assert outputs[2] == outputs[0]
+    assert parse_wav_file(output / "resampled.wav").sample_rate == 44100
+
+
+@pytest.mark.skipif(
+    not _conversion_backend_available(),
+    reason="conversion backend (numpy/soundfile/soxr) not available",
+)
+def test_process_engine_converts_and_rejects_timeouts(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    output = tmp_path / "out"
+    source.mkdir()
+    float_wav = source / "float.wav"
+    write_bytes(float_wav, build_standard_wav(format_tag=0x0003, bits_per_sample=32))
+
+    request = ProcessRequest(
+        input_paths=[float_wav],
+        output_dir=output,
+        overwrite_policy="yes",
+        allow_conversion=True,
+        conversion_engine="process",
+    )
+    result = process_request(request, max_workers=1)
+
+    assert result.converted == 1
+    assert result.errors == []
+    assert parse_wav_file(output / "float.wav").format_tag == 0x0001
+
+    # Spawning the worker alone takes longer than this, so the conversion is stopped.
+    request.conversion_timeout = 0.001
+    (output / "float.wav").unlink()
+    result = process_request(request, max_workers=1)
+
+    assert result.converted == 0
+    assert result.error_count == 1
+    assert "timed out" in result.errors[0]
+    assert not (output / "float.wav").exists()
+
+
+def test_process_engine_workers_leave_ctrl_c_to_the_parent() -> None:
+    with TimeoutProcessPool(1, initializer=processing_module._init_conversion_worker) as pool:
+        assert pool.run(signal.getsignal, signal.SIGINT) == signal.SIG_IGN
+
+
+def test_process_engine_conversion_interrupted_by_cancelling_is_cancelled(
+    tmp_path: Path, monkeypatch
+) -> None:
+    source = tmp_path / "source"
+    output = tmp_path / "out"
+    source.mkdir()
+    float_wav = source / "float.wav"
+    write_bytes(float_wav, build_standard_wav(format_tag=0x0003, bits_per_sample=32))
+    token = CancellationToken()
+
+    def interrupted_run(self, fn, /, *args, **kwargs):
+        # What a worker hit by the terminal's Ctrl+C hands back mid-write.
+        kwargs["output_path"].write_bytes(b"RIFF partial")
+        token.cancel()
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(TimeoutProcessPool, "run", interrupted_run)
+    request = ProcessRequest(
+        input_paths=[float_wav],
+        output_dir=output,
+        overwrite_policy="yes",
+        allow_conversion=True,
+        conversion_engine="process",
+    )
+    result = process_request(request, max_workers=1, cancel_token=token)
+
+    assert result.cancelled
+    assert (result.converted, result.error_count) == (0, 0)
+    assert not (output / "float.wav").exists()
+
+
 def test_process_request_copies_non_wav_files(tmp_path: Path) -> None:
     source = tmp_path / "source"
     output = tmp_path / "out"
@@ -256,6 +498,118 @@ def test_process_request_mixed_files_and_folders(tmp_path: Path) -> None:
     assert (output / "cover.jpg").exists()
 
 
+def test_process_request_streams_inputs_from_scan(tmp_path: Path) -> None:
+    output = tmp_path / "out"
+    (output / "album").mkdir(parents=True)
+
+    source_folder = tmp_path / "album"
+    (source_folder / "disc1").mkdir(parents=True)
+    folder_wav = source_folder / "disc1" / "track.wav"
+    write_bytes(folder_wav, build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID, bits_per_sample=24))
+    direct_file = tmp_path / "cover.jpg"
+    direct_file.write_bytes(b"img")
+    (tmp_path / "notes.exe").write_bytes(b"")
+
+    prompts: list[bool] = []
+
+    def resolver() -> bool:
+        prompts.append(True)
+        return True
+
+    request = ProcessRequest(
+        output_dir=output,
+        input_paths=[source_folder, direct_file, tmp_path / "notes.exe"],
+        stream_inputs=True,
+    )
+    result = process_request(request, overwrite_resolver=resolver, max_workers=2)
+
+    assert prompts == [True]
+    assert result.total == 2
+    assert result.header_fixed == 1
+    assert (output / "album" / "disc1" / "track.wav").exists()
+    assert (output / "cover.jpg").exists()
+
+
+def test_process_request_bounds_in_flight_submissions(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    collected: list[Path] = []
+    max_outstanding = 0
+
+    def synthetic_specs(_input_paths):  # noqa: ANN001
+        nonlocal max_outstanding
+        for number in range(200):
+            max_outstanding = max(max_outstanding, number - len(collected))
+            yield InputFileSpec(path=source / f"track_{number}.wav", source_root=source)
+
+    def fake_worker(*, output_path_str: str, **_kwargs) -> processing_module.WorkerOutcome:
+        time.sleep(0.001)
+        return processing_module.WorkerOutcome(
+            output_path=Path(output_path_str),
+            action=RepairAction.PASS_THROUGH,
+            reason="synthetic",
+            warning_messages=[],
+        )
+
+    def callback(event) -> None:
+        if event.kind == "file":
+            collected.append(event.path)
+
+    monkeypatch.setattr(processing_module, "iter_input_specs", synthetic_specs)
+    monkeypatch.setattr(processing_module, "_process_single_file", fake_worker)
+    monkeypatch.setattr(processing_module, "_SUBMIT_WINDOW_PER_WORKER", 3)
+    request = ProcessRequest(
+        output_dir=tmp_path / "out",
+        input_paths=[source],
+        overwrite_policy="yes",
+        stream_inputs=True,
+    )
+    result = process_request(request, progress_callback=callback, max_workers=2)
+
+    assert result.total == 200
+    assert len(collected) == 200
+    assert max_outstanding <= 2 * 3
+
+
+def test_process_request_reuses_pre_parsed_metadata_while_signature_matches(
+    tmp_path: Path, monkeypatch
+) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    wav_file = source / "song.wav"
+    write_bytes(wav_file, build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID, bits_per_sample=24))
+    metadata = parse_wav_file(wav_file)
+    file_stat = scan_input_specs([wav_file])[0].stat
+
+    parsed_inputs: list[Path] = []
+
+    def counting_parse(path, *, include_chunks=True):  # noqa: ANN001
+        if Path(path) == wav_file:
+            parsed_inputs.append(Path(path))
+        return parse_wav_file(path, include_chunks=include_chunks)
+
+    monkeypatch.setattr(processing_module, "parse_wav_file", counting_parse)
+
+    def run(output_name: str) -> None:
+        spec = InputFileSpec(path=wav_file, stat=file_stat, metadata=metadata)
+        request = ProcessRequest(
+            input_paths=[wav_file],
+            output_dir=tmp_path / output_name,
+            overwrite_policy="yes",
+            input_specs=[spec],
+        )
+        result = process_request(request, max_workers=1)
+        assert result.header_fixed == 1
+
+    run("fresh")
+    assert parsed_inputs == []
+
+    stat_result = wav_file.stat()
+    os.utime(wav_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000))
+    run("stale")
+    assert parsed_inputs == [wav_file]
+
+
 def test_in_place_processing_uses_temp_file(tmp_path: Path) -> None:
     wav_file = tmp_path / "song.wav"
     write_bytes(wav_file, build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID, bits_per_sample=24))
@@ -273,6 +627,142 @@ def test_in_place_processing_uses_temp_file(tmp_path: Path) -> None:
     assert parse_wav_file(wav_file).format_tag == 0x0001
 
 
+def test_in_place_header_fix_patches_fmt_chunk_only(tmp_path: Path) -> None:
+    wav_file = tmp_path / "song.wav"
+    original = build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID, bits_per_sample=24, frames=64)
+    write_bytes(wav_file, original)
+    inode = wav_file.stat().st_ino
+    before = parse_wav_file(wav_file, include_chunks=True)
+
+    request = ProcessRequest(
+        input_paths=[wav_file],
+        output_dir=tmp_path,
+        batch_mode=False,
+        overwrite_policy="yes",
+    )
+    result = process_request(request, max_workers=1)
+
+    assert result.header_fixed == 1
+    patched = wav_file.read_bytes()
+    assert len(patched) == len(original)
+    assert wav_file.stat().st_ino == inode
+    assert patched[before.data_offset :] == original[before.data_offset :]
+    after = parse_wav_file(wav_file, include_chunks=True)
+    assert after.format_tag == 0x0001
+    assert after.data_offset == before.data_offset
+    assert [chunk.chunk_id for chunk in after.chunks] == ["fmt ", "JUNK", "data"]
+    assert not (tmp_path / ".song.wav.wavfix-journal").exists()
+
+
+def test_in_place_rewrite_swaps_temp_from_output_directory(tmp_path: Path, monkeypatch) -> None:
+    wav_file = tmp_path / "song.wav"
+    write_bytes(wav_file, build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID, bits_per_sample=24))
+    replaced: list[tuple[Path, Path]] = []
+    real_replace = os.replace
+
+    def recording_replace(source, destination) -> None:  # noqa: ANN001
+        replaced.append((Path(source), Path(destination)))
+        real_replace(source, destination)
+
+    monkeypatch.setattr(processing_module, "_fix_header_in_place", lambda *_: False)
+    monkeypatch.setattr(processing_module.os, "replace", recording_replace)
+
+    request = ProcessRequest(
+        input_paths=[wav_file],
+        output_dir=tmp_path,
+        overwrite_policy="yes",
+    )
+    result = process_request(request, max_workers=1)
+
+    assert result.header_fixed == 1
+    assert len(replaced) == 1
+    temp_path, destination = replaced[0]
+    assert destination == wav_file
+    assert temp_path.parent == tmp_path
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["song.wav"]
+
+
+def test_in_place_run_sweeps_temps_left_by_a_crashed_rewrite(tmp_path: Path) -> None:
+    wav_file = tmp_path / "song.wav"
+    write_bytes(wav_file, build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID, bits_per_sample=24))
+    finished = subprocess.Popen([sys.executable, "-c", ""])
+    finished.wait()
+    crashed = tmp_path / f".song.wav.{finished.pid}.k2j4h1.wavfix-tmp"
+    unnamed = tmp_path / ".other.wav.9fa0x.wavfix-tmp"
+    for temp in (crashed, unnamed):
+        temp.write_bytes(b"half written")
+        old = time.time() - 2 * processing_module._IN_PLACE_TEMP_STALE_S
+        os.utime(temp, (old, old))
+    # Another run rewriting this folder right now.
+    live = tmp_path / f".other.wav.{os.getpid()}.a81c0q.wavfix-tmp"
+    live.write_bytes(b"being written")
+    if os.name != "nt":
+        recent_crash = tmp_path / f".take.wav.{finished.pid}.0pq3z2.wavfix-tmp"
+        recent_crash.write_bytes(b"half written")
+
+    request = ProcessRequest(input_paths=[wav_file], output_dir=tmp_path, overwrite_policy="yes")
+    result = process_request(request, max_workers=1)
+
+    assert result.header_fixed == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(["song.wav", live.name])
+
+
+def test_fsync_batch_flushes_each_output_and_directory_once(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "source"
+    output = tmp_path / "out"
+    source.mkdir()
+    for index in range(5):
+        write_bytes(
+            source / f"take_{index}.wav", build_standard_wav(format_tag=0x0001, bits_per_sample=16)
+        )
+    synced_files: list[Path] = []
+    synced_dirs: list[Path] = []
+    monkeypatch.setattr(processing_module, "_FSYNC_BATCH_SIZE", 2)
+    monkeypatch.setattr(processing_module, "_fsync_file", synced_files.append)
+    monkeypatch.setattr(processing_module, "_fsync_directory", synced_dirs.append)
+
+    request = ProcessRequest(
+        input_paths=[source],
+        output_dir=output,
+        overwrite_policy="yes",
+        stream_inputs=True,
+        fsync_policy="batch",
+    )
+    result = process_request(request, max_workers=2)
+
+    assert sorted(synced_files) == sorted(result.outputs)
+    assert len(synced_files) == 5
+    # Two full batches and the remainder, one directory sync each.
+    assert synced_dirs == [output / "source"] * 3
+
+
+def test_recover_header_journal_restores_interrupted_patch(tmp_path: Path) -> None:
+    wav_file = tmp_path / "song.wav"
+    original = build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID, bits_per_sample=24)
+    write_bytes(wav_file, original)
+    metadata = parse_wav_file(wav_file, include_chunks=True)
+    patch = processing_module._in_place_fmt_patch(metadata)
+    assert patch is not None
+    offset, replacement = patch
+
+    journal = tmp_path / ".song.wav.wavfix-journal"
+    processing_module._write_header_journal(
+        journal, offset, original[offset : offset + len(replacement)]
+    )
+    with wav_file.open("r+b") as handle:
+        handle.seek(offset)
+        handle.write(replacement[:10])
+
+    assert processing_module.recover_header_journal(wav_file) is True
+    assert wav_file.read_bytes() == original
+    assert not journal.exists()
+
+    journal.write_bytes(b"WFXJRNL1torn")
+    assert processing_module.recover_header_journal(wav_file) is False
+    assert wav_file.read_bytes() == original
+    assert not journal.exists()
+
+
 def test_process_result_counts_and_progress_events(tmp_path: Path) -> None:
     source = tmp_path / "source"
     output = tmp_path / "out"
@@ -308,6 +798,139 @@ def test_process_result_counts_and_progress_events(tmp_path: Path) -> None:
     assert events[-1] == "done"
 
 
+def test_process_request_iter_yields_outcomes_and_summary_only_result(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    ext_pcm = source / "ext_pcm.wav"
+    float_wav = source / "float.wav"
+    write_bytes(ext_pcm, build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID, bits_per_sample=24))
+    write_bytes(float_wav, build_standard_wav(format_tag=0x0003, bits_per_sample=32))
+
+    request = ProcessRequest(
+        input_paths=[ext_pcm, float_wav],
+        output_dir=tmp_path / "out",
+        overwrite_policy="yes",
+        allow_conversion=False,
+    )
+    session = process_request_iter(request, max_workers=1)
+    assert session.result is None
+
+    outcomes = {outcome.input_path.name: outcome for outcome in session}
+
+    assert outcomes["ext_pcm.wav"].action == RepairAction.HEADER_FIX
+    assert outcomes["ext_pcm.wav"].output_path == tmp_path / "out" / "ext_pcm.wav"
+    assert outcomes["float.wav"].action == RepairAction.REJECT
+    assert outcome_warning_lines(outcomes["float.wav"])[-1].endswith(
+        f"rejected - {outcomes['float.wav'].reason}"
+    )
+    result = session.result
+    assert result is not None
+    assert (result.total, result.header_fixed, result.rejected) == (2, 1, 1)
+    assert result.warning_count == 1
+    assert result.outputs == []
+    assert result.warnings == []
+
+
+def test_cancel_between_files_returns_partial_result(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    output = tmp_path / "out"
+    source.mkdir()
+    inputs = []
+    for index in range(6):
+        wav_file = source / f"take_{index}.wav"
+        write_bytes(wav_file, build_standard_wav(format_tag=0x0001))
+        inputs.append(wav_file)
+
+    token = CancellationToken()
+    events: list[str] = []
+
+    def callback(event) -> None:
+        events.append(event.kind)
+        if event.kind == "file":
+            token.cancel()
+
+    request = ProcessRequest(input_paths=inputs, output_dir=output, overwrite_policy="yes")
+    result = process_request(request, progress_callback=callback, max_workers=1, cancel_token=token)
+
+    assert result.cancelled
+    assert 1 <= result.total < len(inputs)
+    assert result.unchanged == result.total
+    assert sorted(output.iterdir()) == sorted(result.outputs)
+    assert events[-1] == "cancelled"
+
+
+def test_progress_events_report_bytes_for_every_planned_file(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    inputs = []
+    for index in range(4):
+        wav_file = source / f"take_{index}.wav"
+        write_bytes(wav_file, build_standard_wav(format_tag=0x0001, frames=256 * (index + 1)))
+        inputs.append(wav_file)
+
+    snapshots = []
+    kinds: list[str] = []
+
+    def callback(event) -> None:
+        kinds.append(event.kind)
+        if event.kind == "progress":
+            assert event.snapshot is not None
+            assert event.message.startswith("Progress: ")
+            snapshots.append(event.snapshot)
+
+    request = ProcessRequest(
+        input_paths=inputs, output_dir=tmp_path / "out", overwrite_policy="yes"
+    )
+    result = process_request(request, progress_callback=callback, max_workers=2)
+
+    assert result.unchanged == 4
+    assert snapshots
+    reads = [snapshot.bytes_read for snapshot in snapshots]
+    assert reads == sorted(reads)
+    final = snapshots[-1]
+    assert (final.files_done, final.files_total) == (4, 4)
+    assert final.bytes_read == sum(path.stat().st_size for path in inputs)
+    assert final.bytes_written == final.bytes_read
+    assert kinds[-2:] == ["progress", "done"]
+
+
+@pytest.mark.skipif(
+    not _conversion_backend_available(),
+    reason="conversion backend (numpy/soundfile/soxr) not available",
+)
+def test_cancel_during_conversion_discards_partial_output(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "source"
+    output = tmp_path / "out"
+    source.mkdir()
+    float_wav = source / "float.wav"
+    write_bytes(float_wav, build_standard_wav(format_tag=0x0003, bits_per_sample=32, frames=64))
+
+    token = CancellationToken()
+    real_align = processing_module._to_aligned_channels
+    blocks: list[int] = []
+
+    def cancelling_align(*args, **kwargs):  # noqa: ANN002, ANN003
+        blocks.append(1)
+        token.cancel()
+        return real_align(*args, **kwargs)
+
+    monkeypatch.setattr(processing_module, "_CONVERSION_BLOCK_FRAMES", 8)
+    monkeypatch.setattr(processing_module, "_to_aligned_channels", cancelling_align)
+
+    request = ProcessRequest(
+        input_paths=[float_wav],
+        output_dir=output,
+        overwrite_policy="yes",
+        allow_conversion=True,
+    )
+    result = process_request(request, max_workers=1, cancel_token=token)
+
+    assert len(blocks) == 1
+    assert result.cancelled
+    assert (result.total, result.converted, result.errors) == (0, 0, [])
+    assert not (output / "float.wav").exists()
+
+
 def test_process_request_callback_can_capture_non_pickleable_state(tmp_path: Path) -> None:
     source = tmp_path / "source"
     output = tmp_path / "out"
@@ -503,3 +1126,28 @@ def test_strict_metadata_policy_rejects_unsupported_chunk_during_conversion(tmp_
     assert result.rejected == 1
     assert result.converted == 0
     assert not (output / "float_with_unknown_meta.wav").exists()
+
+
+def test_header_fix_digest_covers_data_payload_and_detects_mismatch(tmp_path: Path) -> None:
+    wav_file = tmp_path / "ext.wav"
+    write_bytes(
+        wav_file,
+        build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID, bits_per_sample=24, frames=2048),
+    )
+    metadata = parse_wav_file(wav_file)
+    output = tmp_path / "fixed.wav"
+
+    digest = processing_module._write_header_fixed_file(wav_file, output, metadata=metadata)
+
+    assert metadata.data_offset is not None and metadata.data_size is not None
+    payload = wav_file.read_bytes()[
+        metadata.data_offset : metadata.data_offset + metadata.data_size
+    ]
+    assert digest == hashlib.blake2b(payload, digest_size=16).digest()
+    processing_module._validate_header_fix_output(
+        output_file=output, input_meta=metadata, data_digest=digest
+    )
+    with pytest.raises(ValueError, match="audio data changed"):
+        processing_module._validate_header_fix_output(
+            output_file=output, input_meta=metadata, data_digest=bytes(16)
+        )
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from wavfix.core.devices import DeviceQueue, device_kind
+
+
+def _fake_sysfs(root: Path) -> Path:
+    devices = root / "devices"
+    (devices / "sda" / "sda1").mkdir(parents=True)
+    (devices / "sda" / "queue").mkdir()
+    (devices / "sda" / "queue" / "rotational").write_text("1\n", encoding="ascii")
+    (devices / "nvme0n1" / "queue").mkdir(parents=True)
+    (devices / "nvme0n1" / "queue" / "rotational").write_text("0\n", encoding="ascii")
+
+    block = root / "dev" / "block"
+    block.mkdir(parents=True)
+    (block / "8:1").symlink_to(devices / "sda" / "sda1")
+    (block / "259:0").symlink_to(devices / "nvme0n1")
+    return block
+
+
+@pytest.mark.skipif(not hasattr(os, "makedev"), reason="device numbers are POSIX-only")
+def test_device_kind_reads_rotational_flag_from_disk_or_parent(tmp_path: Path) -> None:
+    block = _fake_sysfs(tmp_path)
+
+    assert device_kind(os.makedev(8, 1), block) == "rotational"
+    assert device_kind(os.makedev(259, 0), block) == "solid_state"
+    assert device_kind(os.makedev(8, 32), block) == "unknown"
+    assert device_kind(os.makedev(0, 42), block) == "unknown"
+
+
+def test_device_queue_caps_each_device_and_rotates_between_pairs() -> None:
+    hdd, ssd, out = 1, 2, 3
+    queue: DeviceQueue[str] = DeviceQueue(lambda device: 1 if device == hdd else None)
+    for name in ("hdd-a", "hdd-b"):
+        queue.push(name, source_device=hdd, destination_device=out, inode=0)
+    for name in ("ssd-a", "ssd-b"):
+        queue.push(name, source_device=ssd, destination_device=out, inode=0)
+
+    first = queue.pop_ready()
+    assert first is not None and first[0] == "hdd-a"
+    # The disk is at its cap, so only the uncapped pair can run.
+    second, third = queue.pop_ready(), queue.pop_ready()
+    assert [second and second[0], third and third[0]] == ["ssd-a", "ssd-b"]
+    assert queue.pop_ready() is None
+    assert len(queue) == 1
+
+    queue.release(first[1])
+    last = queue.pop_ready()
+    assert last is not None and last[0] == "hdd-b"
+    assert len(queue) == 0
+
+
+def test_device_queue_orders_rotational_reads_by_inode() -> None:
+    queue: DeviceQueue[str] = DeviceQueue(lambda device: 2 if device == 1 else None)
+    for name, inode in (("c", 30), ("a", 10), ("b", 20)):
+        queue.push(name, source_device=1, destination_device=1, inode=inode)
+    for name, inode in (("y", 30), ("x", 10)):
+        queue.push(name, source_device=2, destination_device=2, inode=inode)
+
+    released: list[str] = []
+    while queue:
+        ready = queue.pop_ready()
+        assert ready is not None
+        released.append(ready[0])
+        queue.release(ready[1])
+
+    assert [name for name in released if name in "abc"] == ["a", "b", "c"]
+    # Solid-state pairs keep submission order.
+    assert [name for name in released if name in "xy"] == ["y", "x"]
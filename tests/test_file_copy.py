@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+import wavfix.core.file_copy as file_copy_module
+from wavfix.core import CancellationToken, ProcessingCancelledError
+from wavfix.core.file_copy import copy_file, materialize_file
+
+
+def _write_source(path: Path, size: int) -> bytes:
+    payload = bytes(range(256)) * (size // 256) + bytes(size % 256)
+    path.write_bytes(payload)
+    os.utime(path, ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+    return payload
+
+
+def test_copy_file_copies_bytes_and_preserves_mtime(tmp_path: Path) -> None:
+    source = tmp_path / "source.wav"
+    payload = _write_source(source, 3 * 1024 * 1024 + 17)
+    destination = tmp_path / "out.wav"
+
+    method = copy_file(source, destination)
+
+    assert method in {"reflink", "copy_file_range", "sendfile", "userspace"}
+    assert destination.read_bytes() == payload
+    assert destination.stat().st_mtime_ns == source.stat().st_mtime_ns
+
+
+def test_copy_file_resumes_with_fallbacks_after_partial_offload(
+    tmp_path: Path, monkeypatch
+) -> None:
+    source = tmp_path / "source.wav"
+    payload = _write_source(source, 5000)
+    calls: list[int] = []
+
+    def partial_copy_file_range(source_fd, destination_fd, count, offset_src, offset_dst):  # noqa: ANN001
+        if calls:
+            raise OSError(errno.EXDEV, "cross-device")
+        calls.append(count)
+        os.pwrite(destination_fd, os.pread(source_fd, 1000, offset_src), offset_dst)
+        return 1000
+
+    monkeypatch.setattr(file_copy_module, "_try_reflink", lambda *_: False)
+    monkeypatch.setattr(file_copy_module, "_copy_file_range", partial_copy_file_range)
+    monkeypatch.setattr(file_copy_module, "_sendfile", None)
+    monkeypatch.setattr(file_copy_module, "_CHUNK_SIZE", 1000)
+    monkeypatch.setattr(file_copy_module, "_BUFFER_SIZE", 700)
+
+    destination = tmp_path / "out.wav"
+    assert copy_file(source, destination) == "userspace"
+    assert destination.read_bytes() == payload
+
+
+@pytest.mark.skipif(not hasattr(os, "sendfile"), reason="sendfile unavailable")
+def test_copy_file_uses_sendfile_when_copy_file_range_is_unsupported(
+    tmp_path: Path, monkeypatch
+) -> None:
+    if not file_copy_module._IS_LINUX:
+        pytest.skip("sendfile between regular files requires Linux")
+    source = tmp_path / "source.wav"
+    payload = _write_source(source, 4096 + 3)
+
+    def unsupported(*_args):  # noqa: ANN002
+        raise OSError(errno.ENOSYS, "unsupported")
+
+    monkeypatch.setattr(file_copy_module, "_try_reflink", lambda *_: False)
+    monkeypatch.setattr(file_copy_module, "_copy_file_range", unsupported)
+
+    destination = tmp_path / "out.wav"
+    assert copy_file(source, destination) == "sendfile"
+    assert destination.read_bytes() == payload
+
+
+def test_materialize_file_links_and_falls_back_to_copy(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "source.wav"
+    payload = _write_source(source, 2048)
+
+    hardlinked = tmp_path / "hard.wav"
+    hardlinked.write_bytes(b"stale")
+    assert materialize_file(source, hardlinked, "hardlink") == "hardlink"
+    assert hardlinked.stat().st_ino == source.stat().st_ino
+
+    if hasattr(os, "symlink"):
+        symlinked = tmp_path / "sym.wav"
+        assert materialize_file(source, symlinked, "symlink") == "symlink"
+        assert symlinked.is_symlink()
+        assert symlinked.read_bytes() == payload
+
+    def cross_device_link(*_args):  # noqa: ANN002
+        raise OSError(errno.EXDEV, "cross-device link")
+
+    monkeypatch.setattr(os, "link", cross_device_link)
+    copied = tmp_path / "copied.wav"
+    assert materialize_file(source, copied, "hardlink") in {"copy", "reflink"}
+    assert copied.read_bytes() == payload
+    assert not copied.is_symlink()
+
+
+def test_copy_file_stops_between_chunks_when_cancelled(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "source.wav"
+    _write_source(source, 5000)
+    token = CancellationToken()
+    chunks: list[int] = []
+
+    def cancelling_copy_file_range(source_fd, destination_fd, count, offset_src, offset_dst):  # noqa: ANN001
+        chunks.append(count)
+        token.cancel()
+        os.pwrite(destination_fd, os.pread(source_fd, count, offset_src), offset_dst)
+        return count
+
+    monkeypatch.setattr(file_copy_module, "_try_reflink", lambda *_: False)
+    monkeypatch.setattr(file_copy_module, "_copy_file_range", cancelling_copy_file_range)
+    monkeypatch.setattr(file_copy_module, "_CHUNK_SIZE", 1000)
+
+    with pytest.raises(ProcessingCancelledError):
+        copy_file(source, tmp_path / "out.wav", cancel_token=token)
+    assert chunks == [1000]
+
+
+def test_copying_a_file_onto_itself_or_a_link_to_it_keeps_the_source(tmp_path: Path) -> None:
+    source = tmp_path / "source.wav"
+    payload = _write_source(source, 3000)
+    alias = tmp_path / "alias.wav"
+    os.link(source, alias)
+
+    for destination in (source, alias, tmp_path / "." / "source.wav"):
+        with pytest.raises(shutil.SameFileError):
+            copy_file(source, destination)
+        with pytest.raises(shutil.SameFileError):
+            materialize_file(source, destination, "reflink")
+    assert source.read_bytes() == payload
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from wavfix.core import (
+    CancellationToken,
+    ProcessRequest,
+    ProcessResult,
+    load_journal_request,
+    process_request,
+)
+from wavfix.core.journal import JOURNAL_FILE_NAME, ExportJournal
+
+from .wav_helpers import build_standard_wav, write_bytes
+
+
+def _sources(root: Path, count: int = 6) -> list[Path]:
+    root.mkdir()
+    inputs = []
+    for index in range(count):
+        wav_file = root / f"take_{index}.wav"
+        write_bytes(wav_file, build_standard_wav(format_tag=0x0001, frames=64 * (index + 1)))
+        inputs.append(wav_file)
+    return inputs
+
+
+def _interrupted_export(request: ProcessRequest, finished: int = 2) -> None:
+    token = CancellationToken()
+    done = 0
+
+    def callback(event) -> None:
+        nonlocal done
+        if event.kind == "file":
+            done += 1
+            if done >= finished:
+                token.cancel()
+
+    result = process_request(request, progress_callback=callback, max_workers=1, cancel_token=token)
+    assert result.cancelled
+
+
+def _completed_inputs(output: Path, inputs: list[Path]) -> list[Path]:
+    with ExportJournal(output / JOURNAL_FILE_NAME) as journal:
+        return [path for path in inputs if (entry := journal.entry(path)) and entry.action]
+
+
+def test_resume_skips_completed_files_and_finishes_the_rest(tmp_path: Path) -> None:
+    inputs = _sources(tmp_path / "source")
+    output = tmp_path / "out"
+    request = ProcessRequest(
+        input_paths=inputs, output_dir=output, overwrite_policy="yes", journal=True
+    )
+    _interrupted_export(request)
+    completed = _completed_inputs(output, inputs)
+    assert len(completed) >= 2
+
+    def refuse_overwrite() -> bool:
+        raise AssertionError("a resumed export must not ask about its own outputs")
+
+    resumed = process_request(
+        ProcessRequest(input_paths=inputs, output_dir=output, overwrite_policy="ask", resume=True),
+        overwrite_resolver=refuse_overwrite,
+    )
+
+    assert resumed.skipped == len(completed)
+    assert sorted(resumed.outputs) == sorted(
+        output / path.name for path in inputs if path not in completed
+    )
+    for source in inputs:
+        assert (output / source.name).read_bytes() == source.read_bytes()
+    # A finished export leaves nothing to resume.
+    assert not (output / JOURNAL_FILE_NAME).exists()
+
+
+def test_resume_redoes_outputs_that_no_longer_verify(tmp_path: Path) -> None:
+    inputs = _sources(tmp_path / "source")
+    output = tmp_path / "out"
+    _interrupted_export(
+        ProcessRequest(input_paths=inputs, output_dir=output, overwrite_policy="yes", journal=True)
+    )
+    completed = _completed_inputs(output, inputs)
+    damaged = output / completed[0].name
+    damaged.write_bytes(damaged.read_bytes()[:20])
+
+    resumed = process_request(
+        ProcessRequest(input_paths=inputs, output_dir=output, overwrite_policy="yes", resume=True)
+    )
+
+    assert damaged in resumed.outputs
+    assert resumed.skipped == len(completed) - 1
+    assert damaged.read_bytes() == completed[0].read_bytes()
+
+
+def test_resume_reuses_planned_names_when_not_overwriting(tmp_path: Path) -> None:
+    inputs = _sources(tmp_path / "source", count=4)
+    output = tmp_path / "out"
+    output.mkdir()
+    (output / "take_0.wav").write_bytes(b"someone else's file")
+    _interrupted_export(
+        ProcessRequest(input_paths=inputs, output_dir=output, overwrite_policy="no", journal=True),
+        finished=1,
+    )
+
+    process_request(
+        ProcessRequest(input_paths=inputs, output_dir=output, overwrite_policy="no", resume=True)
+    )
+
+    assert sorted(path.name for path in output.iterdir()) == [
+        "take_0.wav",
+        "take_0_clean.wav",
+        "take_1.wav",
+        "take_2.wav",
+        "take_3.wav",
+    ]
+    assert (output / "take_0.wav").read_bytes() == b"someone else's file"
+
+
+def test_resume_with_different_settings_starts_over(tmp_path: Path) -> None:
+    inputs = _sources(tmp_path / "source", count=3)
+    output = tmp_path / "out"
+    _interrupted_export(
+        ProcessRequest(input_paths=inputs, output_dir=output, overwrite_policy="yes", journal=True),
+        finished=1,
+    )
+    events: list[str] = []
+
+    resumed = process_request(
+        ProcessRequest(
+            input_paths=inputs,
+            output_dir=output,
+            overwrite_policy="yes",
+            profile="universal_pioneer_safe",
+            resume=True,
+        ),
+        progress_callback=lambda event: events.append(event.message),
+    )
+
+    assert resumed.skipped == 0
+    assert resumed.total == len(inputs)
+    assert any("different settings" in message for message in events)
+
+
+def test_load_journal_request_rebuilds_the_interrupted_export(tmp_path: Path) -> None:
+    inputs = _sources(tmp_path / "source", count=3)
+    output = tmp_path / "out"
+    assert load_journal_request(output) is None
+    _interrupted_export(
+        ProcessRequest(
+            input_paths=inputs,
+            output_dir=output,
+            overwrite_policy="yes",
+            profile="universal_pioneer_safe",
+            link_mode="hardlink",
+            journal=True,
+        ),
+        finished=1,
+    )
+
+    request = load_journal_request(output)
+
+    assert request is not None
+    assert request.resume
+    assert request.input_paths == inputs
+    assert (request.profile, request.link_mode, request.overwrite_policy) == (
+        "universal_pioneer_safe",
+        "hardlink",
+        "yes",
+    )
+    result = process_request(request)
+    assert result.total + result.skipped == len(inputs)
+    assert result.skipped >= 1
+
+
+def _sync(inputs: list[Path], output: Path, **kwargs) -> ProcessResult:
+    request = ProcessRequest(
+        input_paths=inputs,
+        output_dir=output,
+        overwrite_policy="yes",
+        stream_inputs=True,
+        sync=True,
+        **kwargs,
+    )
+    return process_request(request)
+
+
+def test_sync_reprocesses_only_changed_sources(tmp_path: Path) -> None:
+    source = tmp_path / "library"
+    inputs = _sources(source, count=4)
+    output = tmp_path / "mirror"
+    first = _sync([source], output)
+    assert (first.total, first.skipped) == (4, 0)
+    assert (output / JOURNAL_FILE_NAME).is_file()
+    mirrored = output / "library" / "take_1.wav"
+    written_at = mirrored.stat().st_mtime_ns
+
+    unchanged = _sync([source], output)
+    assert (unchanged.total, unchanged.skipped) == (0, 4)
+    assert mirrored.stat().st_mtime_ns == written_at
+
+    write_bytes(inputs[2], build_standard_wav(format_tag=0x0001, frames=999))
+    (output / "library" / "take_3.wav").unlink()
+    changed = _sync([source], output)
+    assert (changed.total, changed.skipped) == (2, 2)
+    assert (output / "library" / "take_2.wav").read_bytes() == inputs[2].read_bytes()
+    assert (output / "library" / "take_3.wav").is_file()
+
+    new_settings = _sync([source], output, profile="universal_pioneer_safe")
+    assert (new_settings.total, new_settings.skipped) == (4, 0)
+
+
+def test_sync_deletes_outputs_of_removed_sources_within_the_selection(tmp_path: Path) -> None:
+    library = tmp_path / "library"
+    inputs = _sources(library, count=3)
+    (library / "album").mkdir()
+    nested = library / "album" / "track.wav"
+    write_bytes(nested, build_standard_wav(format_tag=0x0001))
+    other = tmp_path / "other"
+    _sources(other, count=1)
+    output = tmp_path / "mirror"
+    _sync([library], output)
+    _sync([other], output)
+
+    inputs[0].unlink()
+    nested.unlink()
+    inputs[1].unlink()
+    edited = output / "library" / "take_1.wav"
+    edited.write_bytes(b"edited by hand")
+
+    result = _sync([library], output, delete_orphans=True)
+
+    assert result.deleted == 2
+    assert not (output / "library" / "take_0.wav").exists()
+    assert not (output / "library" / "album").exists()
+    # Changed by someone else since the sync wrote it, so not the sync's to delete.
+    assert edited.read_bytes() == b"edited by hand"
+    # Outside this run's selection: kept even though it was not seen.
+    assert (output / "other" / "take_0.wav").is_file()
+    assert _sync([library], output, delete_orphans=True).deleted == 0
+
+
+def test_sync_keeps_the_mirror_of_a_selected_root_that_is_missing(tmp_path: Path) -> None:
+    library = tmp_path / "library"
+    _sources(library, count=3)
+    other = tmp_path / "other"
+    _sources(other, count=1)
+    output = tmp_path / "mirror"
+    _sync([library, other], output)
+
+    # An unmounted share looks like a missing root; its files were not deleted.
+    unmounted = tmp_path / "unmounted"
+    library.rename(unmounted)
+    events = []
+    result = process_request(
+        ProcessRequest(
+            input_paths=[library, other],
+            output_dir=output,
+            overwrite_policy="yes",
+            stream_inputs=True,
+            sync=True,
+            delete_orphans=True,
+        ),
+        progress_callback=events.append,
+    )
+
+    assert result.deleted == 0
+    assert len(list((output / "library").iterdir())) == 3
+    assert any("no files were found" in event.message for event in events)
+
+    unmounted.rename(library)
+    remounted = _sync([library, other], output, delete_orphans=True)
+    assert (remounted.total, remounted.skipped, remounted.deleted) == (0, 4, 0)
+
+
+def test_sync_deletes_symlinked_outputs_of_removed_sources(tmp_path: Path) -> None:
+    library = tmp_path / "library"
+    inputs = _sources(library, count=2)
+    output = tmp_path / "mirror"
+    _sync([library], output, link_mode="symlink")
+    linked = output / "library" / "take_0.wav"
+    if not linked.is_symlink():
+        pytest.skip("symlinks are not available here")
+    assert _sync([library], output, link_mode="symlink").skipped == 2
+
+    inputs[0].unlink()
+    result = _sync([library], output, link_mode="symlink", delete_orphans=True)
+
+    assert result.deleted == 1
+    assert not linked.is_symlink()
+    assert (output / "library" / "take_1.wav").is_symlink()
+
+
+def test_resampler_quality_of_the_performance_mode_is_an_output_setting(tmp_path: Path) -> None:
+    library = tmp_path / "library"
+    inputs = _sources(library, count=2)
+    output = tmp_path / "mirror"
+    _sync([library], output, performance_mode="balanced")
+
+    # Auto resamples like balanced; fast trades quality for speed, so its outputs differ.
+    assert _sync([library], output, performance_mode="auto").skipped == 2
+    fast = _sync([library], output, performance_mode="fast")
+    assert (fast.total, fast.skipped) == (2, 0)
+
+    interrupted = tmp_path / "out"
+    _interrupted_export(
+        ProcessRequest(
+            input_paths=inputs, output_dir=interrupted, overwrite_policy="yes", journal=True
+        ),
+        finished=1,
+    )
+    resumed = process_request(
+        ProcessRequest(
+            input_paths=inputs,
+            output_dir=interrupted,
+            overwrite_policy="yes",
+            performance_mode="conservative",
+            resume=True,
+        )
+    )
+    assert (resumed.total, resumed.skipped) == (2, 0)
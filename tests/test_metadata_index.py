@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+import wavfix.core.metadata_index as metadata_index_module
+from wavfix.core import ProcessRequest, WavMetadataIndex, inspect_file, process_request
+from wavfix.core.metadata_index import file_identity
+from wavfix.core.models import RepairAction
+from wavfix.core.wav_parser import parse_wav_file
+
+from .wav_helpers import PCM_SUBTYPE_GUID, build_extensible_wav, build_standard_wav, write_bytes
+
+
+def _count_parses(monkeypatch) -> list[Path]:  # noqa: ANN001
+    parsed: list[Path] = []
+
+    def counting_parse(path, *, include_chunks=True):  # noqa: ANN001
+        parsed.append(Path(path))
+        return parse_wav_file(path, include_chunks=include_chunks)
+
+    monkeypatch.setattr(metadata_index_module, "parse_wav_file", counting_parse)
+    return parsed
+
+
+def test_index_round_trips_metadata_and_chunk_table(tmp_path: Path) -> None:
+    wav_file = tmp_path / "padded.wav"
+    write_bytes(wav_file, build_standard_wav(format_tag=0x0001, include_odd_junk_chunk=True))
+    ext_file = tmp_path / "ext.wav"
+    write_bytes(ext_file, build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID, channel_mask=3))
+
+    with WavMetadataIndex(tmp_path / "index.sqlite3") as index:
+        for path in (wav_file, ext_file):
+            index.parse(path)
+        index.flush()
+        for path in (wav_file, ext_file):
+            cached = index.lookup(path, file_identity(path.stat()))
+            assert cached == parse_wav_file(path)
+        assert index.hits == 2
+
+
+def test_index_invalidates_when_file_changes(tmp_path: Path, monkeypatch) -> None:
+    parsed = _count_parses(monkeypatch)
+    wav_file = tmp_path / "song.wav"
+    write_bytes(wav_file, build_standard_wav(format_tag=0x0001))
+
+    with WavMetadataIndex(tmp_path / "index.sqlite3") as index:
+        index.parse(wav_file)
+        index.flush()
+        index.parse(wav_file)
+        assert len(parsed) == 1
+
+        write_bytes(wav_file, build_standard_wav(format_tag=0x0003, bits_per_sample=32))
+        stat = wav_file.stat()
+        os.utime(wav_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        metadata = index.parse(wav_file)
+        assert len(parsed) == 2
+        assert metadata.format_tag == 0x0003
+
+
+def test_header_only_entry_does_not_satisfy_chunk_lookup(tmp_path: Path, monkeypatch) -> None:
+    parsed = _count_parses(monkeypatch)
+    wav_file = tmp_path / "song.wav"
+    write_bytes(wav_file, build_standard_wav(format_tag=0x0001))
+
+    with WavMetadataIndex(tmp_path / "index.sqlite3") as index:
+        index.parse(wav_file, include_chunks=False)
+        index.flush()
+        assert index.parse(wav_file, include_chunks=True).chunks
+        index.flush()
+        assert index.parse(wav_file, include_chunks=False).chunks == []
+        assert len(parsed) == 2
+
+
+def test_index_prune_evicts_least_recently_used(tmp_path: Path) -> None:
+    index = WavMetadataIndex(tmp_path / "index.sqlite3", max_entries=3)
+    paths = []
+    for number in range(5):
+        wav_file = tmp_path / f"track_{number}.wav"
+        write_bytes(wav_file, build_standard_wav(format_tag=0x0001))
+        paths.append(wav_file)
+        index.parse(wav_file)
+
+    assert index.prune() == 2
+    index.close()
+
+    with WavMetadataIndex(tmp_path / "index.sqlite3", max_entries=3) as reopened:
+        assert reopened.prune() == 0
+
+
+def test_warm_process_request_skips_parsing(tmp_path: Path, monkeypatch) -> None:
+    parsed = _count_parses(monkeypatch)
+    source = tmp_path / "source"
+    source.mkdir()
+    wav_file = source / "song.wav"
+    write_bytes(wav_file, build_extensible_wav(subtype_guid=PCM_SUBTYPE_GUID))
+    index_path = tmp_path / "index.sqlite3"
+
+    for run in range(2):
+        request = ProcessRequest(
+            input_paths=[wav_file],
+            output_dir=tmp_path / f"out_{run}",
+            overwrite_policy="yes",
+            metadata_index_path=index_path,
+        )
+        result = process_request(request, max_workers=1)
+        assert result.header_fixed == 1
+
+    assert len(parsed) == 1
+
+    with WavMetadataIndex(index_path) as index:
+        inspection = inspect_file(wav_file, metadata_index=index)
+    assert inspection.action == RepairAction.HEADER_FIX
+    assert len(parsed) == 1
+
+
+def test_index_is_best_effort_when_another_process_holds_it(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(metadata_index_module, "_FLUSH_BATCH", 2)
+    paths = []
+    for number in range(3):
+        wav_file = tmp_path / f"track_{number}.wav"
+        write_bytes(wav_file, build_standard_wav(format_tag=0x0001))
+        paths.append(wav_file)
+    index_path = tmp_path / "index.sqlite3"
+
+    with WavMetadataIndex(index_path) as index:
+        index._connection.execute("PRAGMA busy_timeout = 50")
+        holder = sqlite3.connect(index_path, isolation_level=None)
+        holder.execute("BEGIN EXCLUSIVE")
+        # The batch boundary falls on the second parse; its write fails, the parse does not.
+        for path in paths:
+            assert index.parse(path) == parse_wav_file(path)
+        index.flush()
+        assert index.prune() == 0
+        holder.execute("ROLLBACK")
+        assert index.lookup(paths[0], file_identity(paths[0].stat())) is None
+
+        holder.execute("DROP TABLE wav_metadata")
+        holder.close()
+        misses = index.misses
+        assert index.parse(paths[0]) == parse_wav_file(paths[0])
+        assert index.misses == misses + 1
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import heapq
+import os
+import sys
 import threading
 import time
+import types
 from pathlib import Path
 
 import numpy as np
 
+import wavfix.core.devices as devices_module
 import wavfix.core.processing as processing_module
-from wavfix.core import ProcessRequest, process_request
+from wavfix.core import ProcessRequest, process_request, process_request_iter
 from wavfix.core.processing import resolve_performance_config
 
 from .wav_helpers import build_standard_wav, write_bytes
@@ -30,6 +35,9 @@ def test_resolve_performance_config_profiles() -> None:
     assert fast.conversion_slots == 2
     assert fast.resample_quality == "HQ"
 
+    # Slots times native threads stays within each mode's CPU share.
+    assert (conservative.native_threads, balanced.native_threads, fast.native_threads) == (4, 3, 4)
+
 
 def test_resolve_performance_config_stays_bounded_on_low_core_machines() -> None:
     dual_core_balanced = resolve_performance_config("balanced", cpu_count=2)
@@ -46,6 +54,55 @@ def test_resolve_performance_config_stays_bounded_on_low_core_machines() -> None
     assert quad_core_fast.conversion_slots == 1
 
 
+def test_resolve_performance_config_auto_sets_tuning_bounds() -> None:
+    auto = resolve_performance_config("auto", cpu_count=8)
+
+    assert (auto.worker_count, auto.conversion_slots) == (6, 2)
+    assert auto.worker_bounds == (1, 32)
+    assert auto.slot_bounds == (1, 8)
+    assert auto.native_threads == 1
+    assert resolve_performance_config("balanced", cpu_count=8).worker_bounds is None
+
+    pinned = resolve_performance_config("auto", cpu_count=8, max_workers_override=3)
+    assert pinned.worker_bounds == (3, 3)
+
+
+def test_native_thread_limits_fall_back_to_environment(monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "threadpoolctl", None)
+    monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+    monkeypatch.setenv("OPENBLAS_NUM_THREADS", "7")
+
+    with processing_module._native_thread_limits(2) as control:
+        assert control == "environment"
+        assert os.environ["OMP_NUM_THREADS"] == "2"
+        assert os.environ["OPENBLAS_NUM_THREADS"] == "7"
+
+    assert "OMP_NUM_THREADS" not in os.environ
+    assert os.environ["OPENBLAS_NUM_THREADS"] == "7"
+
+
+def test_auto_mode_reports_concurrency_in_progress_events(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    wav_file = source / "take.wav"
+    write_bytes(wav_file, build_standard_wav(format_tag=0x0001, bits_per_sample=16))
+    events = []
+
+    request = ProcessRequest(
+        input_paths=[wav_file],
+        output_dir=tmp_path / "out",
+        overwrite_policy="yes",
+        performance_mode="auto",
+    )
+    result = process_request(request, progress_callback=events.append)
+
+    assert result.unchanged == 1
+    tuning = [event for event in events if event.kind == "tuning"]
+    assert tuning
+    assert tuning[0].worker_count is not None and tuning[0].worker_count >= 1
+    assert tuning[0].conversion_slots is not None and tuning[0].conversion_slots >= 1
+
+
 def test_conversion_throttling_respects_conservative_slots(
     tmp_path: Path,
     monkeypatch,
@@ -73,6 +130,9 @@ def test_conversion_throttling_respects_conservative_slots(
         input_metadata,
         metadata_policy,
         resample_quality,
+        cancel_token=None,
+        progress=None,
+        dither_seed=None,
     ):
         nonlocal active, max_active
         with lock:
@@ -102,6 +162,133 @@ def test_conversion_throttling_respects_conservative_slots(
     assert max_active <= 1
 
 
+def test_conversions_do_not_block_pass_through_copies(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    source = tmp_path / "source"
+    output = tmp_path / "out"
+    source.mkdir()
+
+    inputs = []
+    for index in range(2):
+        wav_file = source / f"a_convert_{index}.wav"
+        write_bytes(wav_file, build_standard_wav(format_tag=0x0003, bits_per_sample=32))
+        inputs.append(wav_file)
+    for index in range(4):
+        wav_file = source / f"b_copy_{index}.wav"
+        write_bytes(wav_file, build_standard_wav(format_tag=0x0001, bits_per_sample=16))
+        inputs.append(wav_file)
+
+    copies_done = threading.Semaphore(0)
+    copied_first: list[bool] = []
+    real_copy = processing_module._copy_unmodified
+
+    def counting_copy(*args, **kwargs):  # noqa: ANN002, ANN003
+        materialization = real_copy(*args, **kwargs)
+        copies_done.release()
+        return materialization
+
+    def waiting_conversion(  # noqa: ANN001
+        *,
+        input_file,
+        output_file,
+        target,
+        input_metadata,
+        metadata_policy,
+        resample_quality,
+        cancel_token=None,
+        progress=None,
+        dither_seed=None,
+    ):
+        # Only finishes promptly if the copies can run while conversions are pending.
+        copied_first.append(all(copies_done.acquire(timeout=2) for _ in range(2)))
+        output_file.write_bytes(input_file.read_bytes())
+        return []
+
+    monkeypatch.setattr(processing_module, "_copy_unmodified", counting_copy)
+    monkeypatch.setattr(processing_module, "_run_conversion", waiting_conversion)
+    monkeypatch.setattr(processing_module, "_validate_conversion_output", lambda **_kwargs: None)
+
+    request = ProcessRequest(
+        input_paths=inputs,
+        output_dir=output,
+        overwrite_policy="yes",
+        allow_conversion=True,
+        performance_mode="conservative",
+    )
+    result = process_request(request, max_workers=2)
+
+    assert result.converted == 2
+    assert result.unchanged == 4
+    assert copied_first == [True, True]
+
+
+def test_cpu_lane_runs_longest_predicted_conversion_first(
+    tmp_path: Path,
+    monkeypatch,
+) -> None:
+    source = tmp_path / "source"
+    output = tmp_path / "out"
+    source.mkdir()
+    # Scan order is smallest first, the opposite of the order the CPU lane should pick.
+    for index, frames in enumerate((64, 128, 256, 512, 1024)):
+        wav_file = source / f"take_{index}.wav"
+        write_bytes(
+            wav_file, build_standard_wav(format_tag=0x0003, bits_per_sample=32, frames=frames)
+        )
+
+    order: list[str] = []
+    routed = threading.Semaphore(0)
+
+    def counting_heappush(queue, entry) -> None:  # noqa: ANN001
+        heapq.heappush(queue, entry)
+        routed.release()
+
+    def recording_conversion(  # noqa: ANN001
+        *,
+        input_file,
+        output_file,
+        target,
+        input_metadata,
+        metadata_policy,
+        resample_quality,
+        cancel_token=None,
+        progress=None,
+        dither_seed=None,
+    ):
+        if not order:
+            # Hold the only CPU slot until every conversion has been routed to the lane.
+            for _ in range(5):
+                assert routed.acquire(timeout=10)
+        order.append(input_file.name)
+        output_file.write_bytes(input_file.read_bytes())
+        return []
+
+    monkeypatch.setattr(processing_module, "_run_conversion", recording_conversion)
+    monkeypatch.setattr(processing_module, "_validate_conversion_output", lambda **_kwargs: None)
+    monkeypatch.setattr(
+        processing_module,
+        "heapq",
+        types.SimpleNamespace(heappush=counting_heappush, heappop=heapq.heappop),
+    )
+
+    request = ProcessRequest(
+        input_paths=[source],
+        output_dir=output,
+        overwrite_policy="yes",
+        stream_inputs=True,
+        allow_conversion=True,
+        performance_mode="conservative",
+    )
+    outcomes = list(process_request_iter(request, max_workers=4))
+
+    assert len(order) == 5
+    sizes = {path.name: path.stat().st_size for path in source.iterdir()}
+    assert order[1:] == sorted(order[1:], key=sizes.__getitem__, reverse=True)
+    assert all(outcome.predicted_cost and outcome.elapsed_s > 0 for outcome in outcomes)
+
+
 def test_perceptual_downmix_uses_channel_mask() -> None:
     # FL, FR, FC channel mask for 3-channel input.
     channel_mask = (1 << 0) | (1 << 1) | (1 << 2)
@@ -128,6 +315,66 @@ def test_quantize_reports_clipped_samples() -> None:
     assert clipped == 4
 
 
+def _pcm_samples(wav_file: Path, bit_depth: int) -> np.ndarray:
+    metadata = processing_module.parse_wav_file(wav_file)
+    assert metadata.data_offset is not None and metadata.data_size is not None
+    with wav_file.open("rb") as handle:
+        handle.seek(metadata.data_offset)
+        raw = np.frombuffer(handle.read(metadata.data_size), dtype=np.uint8)
+    if bit_depth == 16:
+        return raw.view("<i2").astype(np.int32)
+    triples = raw.reshape(-1, 3).astype(np.int32)
+    values = triples[:, 0] | (triples[:, 1] << 8) | (triples[:, 2] << 16)
+    return np.where(values >= 1 << 23, values - (1 << 24), values)
+
+
+def test_pcm_writes_store_quantized_integers_exactly(tmp_path: Path) -> None:
+    import soundfile
+
+    rng = np.random.default_rng(7)
+    for bit_depth, subtype in ((16, "PCM_16"), (24, "PCM_24")):
+        low, high = -(1 << (bit_depth - 1)), (1 << (bit_depth - 1)) - 1
+        edges = np.r_[low : low + 300, -300:300, high - 300 : high + 1]
+        samples = np.r_[edges, rng.integers(low, high + 1, 20001)].astype(np.int32)
+        output = tmp_path / f"{subtype}.wav"
+        with soundfile.SoundFile(
+            str(output), mode="w", samplerate=44100, channels=2, format="WAV", subtype=subtype
+        ) as handle:
+            frames = samples.reshape(-1, 2).copy()
+            handle.write(processing_module._pcm_write_buffer(np, frames, bit_depth))
+
+        assert np.array_equal(_pcm_samples(output, bit_depth), samples)
+
+
+def test_run_conversion_writes_the_quantizer_output_bit_exactly(monkeypatch, tmp_path) -> None:
+    import soundfile
+
+    source = tmp_path / "float.wav"
+    signal = np.random.default_rng(3).uniform(-1.2, 1.2, size=(5000, 2))
+    soundfile.write(str(source), signal, 44100, subtype="FLOAT")
+    metadata = processing_module.parse_wav_file(source)
+    target = processing_module.ConversionTarget(sample_rate=44100, channels=2, bit_depth=24)
+    monkeypatch.setattr(processing_module, "_CONVERSION_BLOCK_FRAMES", 777)
+
+    processing_module._run_conversion(
+        input_file=source,
+        output_file=tmp_path / "out.wav",
+        target=target,
+        input_metadata=metadata,
+        metadata_policy="best_effort",
+        resample_quality="HQ",
+        dither_seed=11,
+    )
+
+    expected, _ = processing_module._quantize_pcm_float(
+        np,
+        signal.astype(np.float32).astype(np.float64),
+        24,
+        rng=np.random.default_rng(11),
+    )
+    assert np.array_equal(_pcm_samples(tmp_path / "out.wav", 24), expected.reshape(-1))
+
+
 def test_downmix_without_mask_is_deterministic() -> None:
     samples = np.array(
         [[0.1, 0.2, 0.3, 0.4], [-0.2, 0.1, 0.0, -0.1]],
@@ -218,3 +465,48 @@ def test_run_conversion_streams_with_blocks(monkeypatch, tmp_path: Path) -> None
 
     assert warnings == []
     assert len(fake_output.writes) == 2
+
+
+def test_device_cap_limits_concurrent_files_per_device(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "source"
+    output = tmp_path / "out"
+    source.mkdir()
+
+    inputs = []
+    for index in range(6):
+        wav_file = source / f"track_{index}.wav"
+        write_bytes(wav_file, build_standard_wav(format_tag=0x0001, bits_per_sample=16))
+        inputs.append(wav_file)
+
+    lock = threading.Lock()
+    active = 0
+    max_active = 0
+    real_copy = processing_module._copy_unmodified
+
+    def counting_copy(*args, **kwargs):  # noqa: ANN002, ANN003
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(max_active, active)
+        time.sleep(0.02)
+        try:
+            return real_copy(*args, **kwargs)
+        finally:
+            with lock:
+                active -= 1
+
+    # Treat the test filesystem like a spinning disk that takes one file at a time.
+    monkeypatch.setattr(devices_module, "device_concurrency_cap", lambda _device: 1)
+    monkeypatch.setattr(processing_module, "_copy_unmodified", counting_copy)
+
+    request = ProcessRequest(
+        input_paths=inputs,
+        output_dir=output,
+        overwrite_policy="yes",
+        performance_mode="fast",
+    )
+    result = process_request(request, max_workers=4)
+
+    assert result.unchanged == 6
+    assert result.errors == []
+    assert max_active == 1
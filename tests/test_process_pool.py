@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from wavfix.core.process_pool import TaskTimeoutError, TimeoutProcessPool
+
+
+def test_timeout_process_pool_runs_tasks() -> None:
+    with TimeoutProcessPool(2) as pool:
+        assert pool.run(pow, 2, 10) == 1024
+        assert pool.run(divmod, 17, 5) == (3, 2)
+
+
+def test_timeout_process_pool_kills_overrunning_task_and_recovers() -> None:
+    with TimeoutProcessPool(1, timeout=2.0) as pool:
+        assert pool.run(pow, 3, 3) == 27
+
+        start = time.perf_counter()
+        with pytest.raises(TaskTimeoutError):
+            pool.run(time.sleep, 60)
+        assert time.perf_counter() - start < 30
+
+        assert pool.run(pow, 2, 5) == 32
+
+
+def test_timeout_process_pool_propagates_task_errors() -> None:
+    with TimeoutProcessPool(1) as pool, pytest.raises(ZeroDivisionError):
+        pool.run(divmod, 1, 0)
+
+
+def test_timeout_process_pool_fails_only_the_task_that_crashes_its_worker() -> None:
+    results: dict[str, object] = {}
+
+    def run(name: str, fn, *args) -> None:  # noqa: ANN001
+        try:
+            results[name] = pool.run(fn, *args)
+        except BrokenProcessPool as exc:
+            results[name] = exc
+
+    with TimeoutProcessPool(4) as pool:
+        threads = [
+            threading.Thread(target=run, args=(f"healthy_{index}", time.sleep, 1.0))
+            for index in range(3)
+        ]
+        threads.append(threading.Thread(target=run, args=("crashing", os._exit, 1)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+
+        assert isinstance(results.pop("crashing"), BrokenProcessPool)
+        assert results == {f"healthy_{index}": None for index in range(3)}
+        assert pool.run(pow, 2, 3) == 8
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+
+from wavfix.core.models import ProgressSnapshot
+from wavfix.core.progress import FileProgress, ProgressTracker, format_progress
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_tracker_reports_lane_rates_and_cost_based_eta() -> None:
+    clock = _Clock()
+    tracker = ProgressTracker(interval_s=1.0, window_s=10.0, clock=clock)
+    copy = FileProgress(4_000_000, cost=4_000_000.0)
+    convert = FileProgress(2_000_000, cost=40_000_000.0, lane="cpu")
+    for progress in (copy, convert):
+        tracker.start(progress)
+
+    assert tracker.due()
+    tracker.snapshot()
+    assert not tracker.due()
+
+    clock.now = 2.0
+    copy.copied(4_000_000)
+    tracker.finish(copy, 4_000_000.0)
+    convert.add(read=1_000_000, written=500_000, frames=1000)
+    assert tracker.due()
+    snapshot = tracker.snapshot()
+
+    assert (snapshot.files_done, snapshot.files_total) == (1, 2)
+    assert snapshot.bytes_read == 5_000_000
+    assert snapshot.bytes_written == 4_500_000
+    assert snapshot.frames == 1000
+    assert snapshot.lane_mb_per_s == pytest.approx({"io": 2.0, "cpu": 0.5})
+    # 24M of 44M cost done in 2s leaves 20M at 12M/s.
+    assert snapshot.eta_s == pytest.approx(20 / 12)
+
+
+def test_dropped_files_leave_the_totals() -> None:
+    tracker = ProgressTracker(clock=_Clock())
+    kept, dropped = FileProgress(10, cost=10.0), FileProgress(10, cost=10.0)
+    tracker.start(kept)
+    tracker.start(dropped)
+    tracker.drop(dropped)
+
+    snapshot = tracker.snapshot()
+
+    assert snapshot.files_total == 1
+    assert snapshot.eta_s is None
+
+
+def test_format_progress_omits_idle_lanes() -> None:
+    snapshot = ProgressSnapshot(
+        bytes_read=12_500_000,
+        bytes_written=0,
+        frames=0,
+        files_done=3,
+        files_total=10,
+        lane_mb_per_s={"io": 40.0, "cpu": 0.0},
+        eta_s=75.4,
+    )
+
+    assert format_progress(snapshot) == (
+        "Progress: 3/10 files, 12.5 MB read (io 40.0 MB/s), ETA 1:15"
+    )
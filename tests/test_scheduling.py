@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from wavfix.core.decisions import ConversionTarget
+from wavfix.core.models import RepairAction, WavMetadata
+from wavfix.core.scheduling import predict_cost
+
+
+def _metadata(*, sample_rate: int, channels: int) -> WavMetadata:
+    return WavMetadata(
+        path=Path("take.wav"),
+        riff_valid=True,
+        wave_valid=True,
+        sample_rate=sample_rate,
+        channels=channels,
+    )
+
+
+def test_predict_cost_ranks_actions_by_work() -> None:
+    size = 10_000_000
+    target = ConversionTarget(sample_rate=48000, channels=2, bit_depth=24)
+    metadata = _metadata(sample_rate=48000, channels=2)
+
+    copy = predict_cost(size, RepairAction.PASS_THROUGH)
+    header_fix = predict_cost(size, RepairAction.HEADER_FIX)
+    convert = predict_cost(size, RepairAction.CONVERT, metadata=metadata, target=target)
+    reject = predict_cost(size, RepairAction.REJECT)
+
+    assert reject < copy < header_fix < convert
+    assert predict_cost(2 * size, RepairAction.PASS_THROUGH) > copy
+
+
+def test_predict_cost_charges_resampling_and_channel_changes() -> None:
+    size = 10_000_000
+    target = ConversionTarget(sample_rate=48000, channels=2, bit_depth=24)
+
+    plain = predict_cost(
+        size, RepairAction.CONVERT, metadata=_metadata(sample_rate=48000, channels=2), target=target
+    )
+    resampled = predict_cost(
+        size, RepairAction.CONVERT, metadata=_metadata(sample_rate=96000, channels=2), target=target
+    )
+    downmixed = predict_cost(
+        size, RepairAction.CONVERT, metadata=_metadata(sample_rate=48000, channels=6), target=target
+    )
+
+    assert resampled > plain
+    assert downmixed > plain
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from wavfix.core.tuning import ConcurrencyTuner, IowaitSampler, usable_cpu_count
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_usable_cpu_count_honours_cgroup_quota(tmp_path: Path) -> None:
+    affinity = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+
+    (tmp_path / "cpu.max").write_text("150000 100000\n", encoding="ascii")
+    limited = usable_cpu_count(tmp_path)
+    assert limited == min(2, affinity or limited)
+
+    (tmp_path / "cpu.max").write_text("max 100000\n", encoding="ascii")
+    assert usable_cpu_count(tmp_path) == (affinity or os.cpu_count() or 4)
+
+
+def test_iowait_sampler_reports_share_since_last_sample(tmp_path: Path) -> None:
+    stat = tmp_path / "stat"
+    stat.write_text("cpu  100 0 100 700 100 0 0 0 0 0\n", encoding="ascii")
+    sampler = IowaitSampler(stat)
+    stat.write_text("cpu  150 0 150 750 150 0 0 0 0 0\n", encoding="ascii")
+
+    assert sampler.sample() == 0.25
+
+
+def test_tuner_climbs_while_throughput_improves_and_backs_off() -> None:
+    clock = _FakeClock()
+    tuner = ConcurrencyTuner(
+        io_start=4,
+        io_bounds=(1, 8),
+        cpu_start=1,
+        cpu_bounds=(1, 4),
+        interval_s=1.0,
+        clock=clock,
+        iowait=lambda: 0.0,
+    )
+
+    def window(io_rate: float, cpu_rate: float) -> bool:
+        tuner.record("cpu", cpu_rate)
+        clock.now += 1.0
+        return tuner.record("io", io_rate)
+
+    assert window(100.0, 10.0)
+    assert (tuner.io_limit, tuner.cpu_limit) == (5, 2)
+    window(150.0, 20.0)
+    assert (tuner.io_limit, tuner.cpu_limit) == (6, 3)
+    # Throughput fell: the last step is undone.
+    window(90.0, 20.0)
+    assert tuner.io_limit == 5
+    # Within the noise band: hold.
+    assert not window(91.0, 20.5)
+    assert (tuner.io_limit, tuner.cpu_limit) == (5, 3)
+
+
+def test_tuner_does_not_add_conversion_slots_while_io_bound() -> None:
+    clock = _FakeClock()
+    tuner = ConcurrencyTuner(
+        io_start=4,
+        io_bounds=(4, 4),
+        cpu_start=2,
+        cpu_bounds=(1, 8),
+        interval_s=1.0,
+        clock=clock,
+        iowait=lambda: 0.8,
+    )
+    for rate in (10.0, 20.0, 40.0):
+        clock.now += 1.0
+        tuner.record("cpu", rate)
+
+    assert tuner.cpu_limit == 2
+    assert tuner.io_limit == 4
@@ -105,3 +105,24 @@ def test_parse_streaming_path_does_not_use_read_bytes(tmp_path: Path, monkeypatc
     monkeypatch.setattr(Path, "read_bytes", fail_read_bytes)
     metadata = parse_wav_file(wav_file)
     assert metadata.format_kind == WavFormatKind.PCM
+
+
+def test_windowed_and_streamed_parsers_agree_on_fixture_suite() -> None:
+    fixtures = sorted((Path(__file__).parent / "wav_test_suite" / "wavs").rglob("*.wav"))
+    assert fixtures
+    for fixture in fixtures:
+        for include_chunks in (True, False):
+            windowed = parse_wav_file(fixture, include_chunks=include_chunks, windowed=True)
+            streamed = parse_wav_file(fixture, include_chunks=include_chunks, windowed=False)
+            assert windowed == streamed, fixture
+
+
+def test_windowed_parser_reports_truncation_like_streamed(tmp_path: Path) -> None:
+    full = build_standard_wav(format_tag=0x0001, include_odd_junk_chunk=True)
+    for length in (0, 4, 11, 12, 20, 36, 39, 47, len(full) - 1):
+        wav_file = tmp_path / f"truncated_{length}.wav"
+        wav_file.write_bytes(full[:length])
+        windowed = parse_wav_file(wav_file, windowed=True)
+        streamed = parse_wav_file(wav_file, windowed=False)
+        assert windowed == streamed
+        assert windowed.format_kind == WavFormatKind.MALFORMED
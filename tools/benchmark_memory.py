@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Peak-memory benchmark for the streaming processing pipeline.
+
+Each case runs in a fresh interpreter so peak RSS is not shared between cases. Tasks are
+synthetic: the scan yields generated specs and the worker only sleeps for ``--task-ms``, which
+isolates the memory held by the scheduler from the cost of real file I/O.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = REPO_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+import wavfix.core.processing as processing
+from wavfix.core.models import InputFileSpec, ProcessRequest, RepairAction
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+DEFAULT_TASK_COUNTS = (10_000, 100_000, 1_000_000)
+_FILES_PER_FOLDER = 1000
+_UNBOUNDED_WINDOW = 1 << 40
+
+
+def _peak_rss_mib() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_case(
+    task_count: int,
+    *,
+    workers: int,
+    task_ms: float,
+    unbounded: bool,
+    trace: bool,
+) -> dict:
+    source_root = Path("/synthetic/source")
+
+    def synthetic_specs(_input_paths: object) -> Iterator[InputFileSpec]:
+        for number in range(task_count):
+            folder = source_root / f"folder_{number // _FILES_PER_FOLDER:04d}"
+            yield InputFileSpec(path=folder / f"track_{number:07d}.wav", source_root=source_root)
+
+    def synthetic_worker(*, output_path_str: str, **_kwargs: object) -> processing.WorkerOutcome:
+        if task_ms > 0:
+            time.sleep(task_ms / 1000)
+        return processing.WorkerOutcome(
+            output_path=Path(output_path_str),
+            action=RepairAction.PASS_THROUGH,
+            reason="synthetic",
+            warning_messages=[],
+        )
+
+    processing.iter_input_specs = synthetic_specs
+    processing._process_single_file = synthetic_worker
+    if unbounded:
+        processing._SUBMIT_WINDOW_PER_WORKER = _UNBOUNDED_WINDOW
+
+    with tempfile.TemporaryDirectory(prefix="wavfix_bench_mem_") as output_tmp:
+        request = ProcessRequest(
+            output_dir=Path(output_tmp),
+            input_paths=[source_root],
+            overwrite_policy="yes",
+            stream_inputs=True,
+        )
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        session = processing.process_request_iter(request, max_workers=workers)
+        for _outcome in session:
+            pass
+        result = session.result
+        elapsed = time.perf_counter() - start
+        traced_peak = tracemalloc.get_traced_memory()[1] if trace else None
+        if trace:
+            tracemalloc.stop()
+
+    return {
+        "tasks": result.total if result is not None else 0,
+        "elapsed_s": elapsed,
+        "peak_rss_mib": _peak_rss_mib(),
+        "tracemalloc_peak_mib": traced_peak / (1024 * 1024) if traced_peak is not None else None,
+    }
+
+
+def _spawn_case(
+    task_count: int,
+    *,
+    workers: int,
+    task_ms: float,
+    unbounded: bool,
+    trace: bool,
+) -> dict:
+    command = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--child",
+        str(task_count),
+        "--workers",
+        str(workers),
+        "--task-ms",
+        str(task_ms),
+    ]
+    if unbounded:
+        command.append("--unbounded")
+    if not trace:
+        command.append("--no-tracemalloc")
+    completed = subprocess.run(command, check=True, capture_output=True, text=True)
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def _format_mib(value: float | None) -> str:
+    return f"{value:8.1f} MiB" if value is not None else "     n/a    "
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Measure process_request peak memory.")
+    parser.add_argument(
+        "--tasks",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_TASK_COUNTS),
+        help="Synthetic task counts to benchmark.",
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Worker count override.")
+    parser.add_argument(
+        "--task-ms",
+        type=float,
+        default=2.0,
+        help="Simulated per-file work so the scan can outpace the workers.",
+    )
+    parser.add_argument(
+        "--compare-unbounded",
+        action="store_true",
+        help="Also run each case with the submission window disabled.",
+    )
+    parser.add_argument(
+        "--no-tracemalloc",
+        action="store_true",
+        help="Skip tracemalloc (it slows large cases considerably).",
+    )
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--unbounded", action="store_true", help=argparse.SUPPRESS)
+    return parser
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+    trace = not args.no_tracemalloc
+
+    if args.child is not None:
+        stats = _run_case(
+            args.child,
+            workers=args.workers,
+            task_ms=args.task_ms,
+            unbounded=args.unbounded,
+            trace=trace,
+        )
+        print(json.dumps(stats))
+        return 0
+
+    modes = [False, True] if args.compare_unbounded else [False]
+    print("WavFix submission memory benchmark")
+    for task_count in args.tasks:
+        for unbounded in modes:
+            stats = _spawn_case(
+                task_count,
+                workers=args.workers,
+                task_ms=args.task_ms,
+                unbounded=unbounded,
+                trace=trace,
+            )
+            label = "unbounded" if unbounded else "windowed"
+            print(
+                f"{task_count:>9} tasks {label:<9}: "
+                f"{stats['elapsed_s']:7.2f}s  "
+                f"rss={_format_mib(stats['peak_rss_mib'])}  "
+                f"tracemalloc={_format_mib(stats['tracemalloc_peak_mib'])}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,6 +4,8 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import os
 import shutil
 import sys
 import tempfile
@@ -16,13 +18,17 @@ SRC_DIR = REPO_ROOT / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
+from wavfix.core import processing
+from wavfix.core.file_copy import copy_file
 from wavfix.core.inspection import inspect_file
-from wavfix.core.models import ProcessRequest
+from wavfix.core.models import ConversionEngine, PerformanceMode, ProcessRequest
 from wavfix.core.processing import process_request
 from wavfix.core.scanner import scan_input_specs
+from wavfix.core.wav_parser import parse_wav_file
 
 PASS_FIXTURE = REPO_ROOT / "tests/wav_test_suite/wavs/pcm/pcm_stereo_44100_24.wav"
 CONVERT_FIXTURE = REPO_ROOT / "tests/wav_test_suite/wavs/f32/float32_stereo_44100.wav"
+METADATA_FIXTURE = REPO_ROOT / "tests/wav_test_suite/wavs/pcm/pcm_with_list_and_bext.wav"
 
 
 def _clone_fixture(source: Path, target_dir: Path, count: int) -> list[Path]:
@@ -57,7 +63,13 @@ def _bench_pass_through(*, file_count: int, workers: int) -> tuple[float, float]
             return elapsed, file_count / elapsed if elapsed > 0 else 0.0
 
 
-def _bench_conversion(*, file_count: int, workers: int) -> tuple[float, float]:
+def _bench_conversion(
+    *,
+    file_count: int,
+    workers: int,
+    engine: ConversionEngine = "thread",
+    performance_mode: PerformanceMode = "balanced",
+) -> tuple[float, float]:
     with tempfile.TemporaryDirectory(prefix="wavfix_bench_conv_") as input_tmp:
         with tempfile.TemporaryDirectory(prefix="wavfix_bench_conv_out_") as output_tmp:
             input_paths = _clone_fixture(CONVERT_FIXTURE, Path(input_tmp), file_count)
@@ -71,7 +83,8 @@ def _bench_conversion(*, file_count: int, workers: int) -> tuple[float, float]:
                 metadata_policy="best_effort",
                 sample_rate_policy="convert_nearest",
                 bit_depth_policy="convert",
-                performance_mode="balanced",
+                performance_mode=performance_mode,
+                conversion_engine=engine,
             )
             start = time.perf_counter()
             process_request(request, max_workers=workers)
@@ -124,6 +137,193 @@ def _bench_load_and_reinspect(*, file_count: int) -> tuple[float, float, float]:
         return scan_elapsed, serial_elapsed, parallel_elapsed
 
 
+def _bench_parser_modes(*, file_count: int, rounds: int = 3) -> tuple[float, float]:
+    with tempfile.TemporaryDirectory(prefix="wavfix_bench_parse_") as root_tmp:
+        paths = _clone_fixture(METADATA_FIXTURE, Path(root_tmp), file_count)
+
+        def _timed(windowed: bool) -> float:
+            best = float("inf")
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for path in paths:
+                    parse_wav_file(path, include_chunks=True, windowed=windowed)
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        return _timed(False), _timed(True)
+
+
+def _bench_copy_engine(*, file_count: int, size_mib: int) -> tuple[float, float, str]:
+    with tempfile.TemporaryDirectory(prefix="wavfix_bench_copy_") as root_tmp:
+        root = Path(root_tmp)
+        source = root / "large.wav"
+        with source.open("wb") as handle:
+            block = bytes(range(256)) * 4096
+            for _ in range(size_mib):
+                handle.write(block)
+
+        def _timed(copier) -> float:  # noqa: ANN001
+            start = time.perf_counter()
+            for index in range(file_count):
+                copier(source, root / f"copy_{index}.wav")
+            elapsed = time.perf_counter() - start
+            for index in range(file_count):
+                (root / f"copy_{index}.wav").unlink()
+            return elapsed
+
+        copy2_elapsed = _timed(shutil.copy2)
+        methods: set[str] = set()
+        offload_elapsed = _timed(lambda src, dst: methods.add(copy_file(src, dst)))
+        return copy2_elapsed, offload_elapsed, ",".join(sorted(methods))
+
+
+def _bench_in_place_swap(
+    *, file_count: int, size_mib: int, library_dir: Path | None
+) -> tuple[float, float, bool]:
+    """Time rewriting files in place via the system temp dir vs. a temp beside the file.
+
+    Pass ``--in-place-dir`` on another mount than the system temp dir to see the cross-device
+    cost of the old ``shutil.move`` swap.
+    """
+    base_dir = library_dir if library_dir is not None else Path(tempfile.gettempdir())
+    with tempfile.TemporaryDirectory(prefix="wavfix_bench_inplace_", dir=base_dir) as root_tmp:
+        root = Path(root_tmp)
+        payload = bytes(range(256)) * 4096 * size_mib
+        paths = [root / f"take_{index:03d}.wav" for index in range(file_count)]
+        for path in paths:
+            path.write_bytes(payload)
+        cross_device = os.stat(root).st_dev != os.stat(tempfile.gettempdir()).st_dev
+
+        def _system_temp_move(path: Path) -> None:
+            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+                temp_file.write(payload)
+            shutil.move(temp_file.name, path)
+
+        def _sibling_replace(path: Path) -> None:
+            descriptor, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+            with os.fdopen(descriptor, "wb") as temp_file:
+                temp_file.write(payload)
+            os.replace(temp_name, path)
+
+        def _timed(rewrite) -> float:  # noqa: ANN001
+            start = time.perf_counter()
+            for path in paths:
+                rewrite(path)
+            return time.perf_counter() - start
+
+        move_elapsed = _timed(_system_temp_move)
+        replace_elapsed = _timed(_sibling_replace)
+        return move_elapsed, replace_elapsed, cross_device
+
+
+def _context_switches() -> int | None:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_nvcsw + usage.ru_nivcsw
+
+
+def _bench_thread_budget(
+    *, file_count: int, workers: int, performance_mode: PerformanceMode
+) -> dict[str, tuple[float, int | None]]:
+    """Time conversions and count context switches with and without the native thread budget."""
+
+    @contextlib.contextmanager
+    def _unlimited(_threads: int):  # noqa: ANN202
+        yield "none"
+
+    budgeted_limits = processing._native_thread_limits
+    results: dict[str, tuple[float, int | None]] = {}
+    for label, limits in (("unbudgeted", _unlimited), ("budgeted", budgeted_limits)):
+        processing._native_thread_limits = limits
+        try:
+            before = _context_switches()
+            elapsed, _ = _bench_conversion(
+                file_count=file_count,
+                workers=workers,
+                performance_mode=performance_mode,
+            )
+            after = _context_switches()
+        finally:
+            processing._native_thread_limits = budgeted_limits
+        switches = after - before if after is not None and before is not None else None
+        results[label] = (elapsed, switches)
+    return results
+
+
+def _bench_sync(*, file_count: int, workers: int) -> tuple[float, float, float]:
+    """Time a full sync, a no-change re-sync and a bare scan of the same library."""
+    with tempfile.TemporaryDirectory(prefix="wavfix_bench_sync_") as root_tmp:
+        root_path = Path(root_tmp)
+        library = root_path / "library"
+        _clone_fixture(PASS_FIXTURE, library, file_count)
+        request = ProcessRequest(
+            output_dir=root_path / "mirror",
+            input_paths=[library],
+            overwrite_policy="yes",
+            stream_inputs=True,
+            sync=True,
+        )
+
+        full_start = time.perf_counter()
+        process_request(request, max_workers=workers)
+        full_elapsed = time.perf_counter() - full_start
+
+        resync_start = time.perf_counter()
+        result = process_request(request, max_workers=workers)
+        resync_elapsed = time.perf_counter() - resync_start
+        assert result.skipped == file_count, result
+
+        scan_start = time.perf_counter()
+        _ = scan_input_specs([library])
+        scan_elapsed = time.perf_counter() - scan_start
+        return full_elapsed, resync_elapsed, scan_elapsed
+
+
+def _bench_pcm_write(*, blocks: int) -> dict[str, tuple[float, float]]:
+    """Per-block ms for writing quantized blocks via a float32 round trip vs. directly.
+
+    The float path is how conversions wrote blocks before integers went straight to
+    soundfile; both write the same quantized stereo blocks to a PCM WAV.
+    """
+    np_module, soundfile_module, _ = processing._load_conversion_backends()
+    rng = np_module.random.default_rng(0)
+    signal = rng.uniform(-1.0, 1.0, size=(processing._CONVERSION_BLOCK_FRAMES, 2))
+    results: dict[str, tuple[float, float]] = {}
+    with tempfile.TemporaryDirectory(prefix="wavfix_bench_pcm_") as root_tmp:
+        output = Path(root_tmp) / "out.wav"
+        for bit_depth in (16, 24):
+            quantized, _ = processing._quantize_pcm_float(np_module, signal, bit_depth, rng=rng)
+            max_int = float((1 << (bit_depth - 1)) - 1)
+
+            def float_grid(samples, max_int=max_int):  # noqa: ANN001, ANN202
+                return samples.astype(np_module.float32) / max_int
+
+            def direct(samples, bit_depth=bit_depth):  # noqa: ANN001, ANN202
+                return processing._pcm_write_buffer(np_module, samples, bit_depth)
+
+            timings = []
+            for prepare in (float_grid, direct):
+                # Fresh blocks, like the conversion loop gets; the direct path shifts in place.
+                pending = [quantized.copy() for _ in range(blocks)]
+                with soundfile_module.SoundFile(
+                    str(output),
+                    mode="w",
+                    samplerate=44100,
+                    channels=2,
+                    format="WAV",
+                    subtype=f"PCM_{bit_depth}",
+                ) as handle:
+                    start = time.perf_counter()
+                    for block in pending:
+                        handle.write(prepare(block))
+                    timings.append((time.perf_counter() - start) * 1000 / blocks)
+            results[f"pcm{bit_depth}"] = (timings[0], timings[1])
+    return results
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Run local WavFix performance benchmarks.")
     parser.add_argument(
@@ -138,12 +338,66 @@ def _build_parser() -> argparse.ArgumentParser:
         default=120,
         help="Number of conversion fixture files to benchmark.",
     )
+    parser.add_argument(
+        "--engine-mode",
+        choices=["conservative", "balanced", "fast"],
+        default="fast",
+        help="Performance mode for the thread vs process conversion engine comparison.",
+    )
     parser.add_argument(
         "--inspect-files",
         type=int,
         default=1000,
         help="Number of files for scan/reinspect benchmark.",
     )
+    parser.add_argument(
+        "--parse-files",
+        type=int,
+        default=2000,
+        help="Number of files for streamed vs windowed parser benchmark.",
+    )
+    parser.add_argument(
+        "--copy-files",
+        type=int,
+        default=20,
+        help="Number of large-file copies for the copy engine benchmark.",
+    )
+    parser.add_argument(
+        "--copy-size-mib",
+        type=int,
+        default=64,
+        help="Size of the file copied by the copy engine benchmark.",
+    )
+    parser.add_argument(
+        "--in-place-files",
+        type=int,
+        default=20,
+        help="Number of files rewritten by the in-place swap benchmark.",
+    )
+    parser.add_argument(
+        "--in-place-size-mib",
+        type=int,
+        default=32,
+        help="Size of each file rewritten by the in-place swap benchmark.",
+    )
+    parser.add_argument(
+        "--in-place-dir",
+        type=Path,
+        default=None,
+        help="Library directory for the in-place swap benchmark, ideally on a separate mount.",
+    )
+    parser.add_argument(
+        "--sync-files",
+        type=int,
+        default=2000,
+        help="Number of files mirrored by the incremental sync benchmark.",
+    )
+    parser.add_argument(
+        "--write-blocks",
+        type=int,
+        default=100,
+        help="Conversion-sized blocks written per variant by the PCM write benchmark.",
+    )
     parser.add_argument(
         "--workers",
         type=int,
@@ -161,16 +415,65 @@ def main() -> int:
         file_count=args.convert_files,
         workers=args.workers,
     )
+    engine_results = {
+        engine: _bench_conversion(
+            file_count=args.convert_files,
+            workers=args.workers,
+            engine=engine,
+            performance_mode=args.engine_mode,
+        )
+        for engine in ("thread", "process")
+    }
     scan_elapsed, serial_elapsed, parallel_elapsed = _bench_load_and_reinspect(
         file_count=args.inspect_files
     )
+    streamed_elapsed, windowed_elapsed = _bench_parser_modes(file_count=args.parse_files)
+    copy2_elapsed, offload_elapsed, copy_methods = _bench_copy_engine(
+        file_count=args.copy_files,
+        size_mib=args.copy_size_mib,
+    )
+    move_elapsed, replace_elapsed, cross_device = _bench_in_place_swap(
+        file_count=args.in_place_files,
+        size_mib=args.in_place_size_mib,
+        library_dir=args.in_place_dir,
+    )
+    budget_results = _bench_thread_budget(
+        file_count=args.convert_files,
+        workers=args.workers,
+        performance_mode=args.engine_mode,
+    )
+    sync_elapsed, resync_elapsed, sync_scan_elapsed = _bench_sync(
+        file_count=args.sync_files,
+        workers=args.workers,
+    )
+    pcm_write_results = _bench_pcm_write(blocks=args.write_blocks)
 
     print("WavFix benchmark summary")
     print(f"pass_through: {pass_elapsed:.3f}s ({pass_tput:.1f} files/s)")
     print(f"conversion:   {convert_elapsed:.3f}s ({convert_tput:.1f} files/s)")
+    for engine, (engine_elapsed, engine_tput) in engine_results.items():
+        label = f"convert_{engine}_{args.engine_mode}:"
+        print(f"{label:<20}{engine_elapsed:.3f}s ({engine_tput:.1f} files/s)")
     print(f"scan:         {scan_elapsed:.3f}s")
     print(f"reinspect_serial:   {serial_elapsed:.3f}s")
     print(f"reinspect_parallel: {parallel_elapsed:.3f}s")
+    print(f"parse_streamed:     {streamed_elapsed:.3f}s")
+    print(f"parse_windowed:     {windowed_elapsed:.3f}s")
+    print(f"copy_shutil_copy2:  {copy2_elapsed:.3f}s")
+    print(f"copy_offload:       {offload_elapsed:.3f}s ({copy_methods})")
+    mount_note = "separate mount" if cross_device else "same mount as temp dir"
+    print(f"in_place_tmp_move:  {move_elapsed:.3f}s ({mount_note})")
+    print(f"in_place_replace:   {replace_elapsed:.3f}s")
+    for label, (budget_elapsed, switches) in budget_results.items():
+        switch_note = f"{switches} context switches" if switches is not None else "n/a"
+        print(f"{'threads_' + label + ':':<20}{budget_elapsed:.3f}s ({switch_note})")
+    print(f"sync_full:          {sync_elapsed:.3f}s")
+    print(f"sync_no_change:     {resync_elapsed:.3f}s (scan alone {sync_scan_elapsed:.3f}s)")
+    for label, (float_ms, direct_ms) in pcm_write_results.items():
+        print(
+            f"{label + '_write:':<20}float round trip {float_ms:.3f} ms/block, "
+            f"direct {direct_ms:.3f} ms/block"
+        )
     return 0
 
 